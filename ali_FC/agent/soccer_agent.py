@@ -24,6 +24,10 @@ class SoccerAgent:
                 "You are an AI agent designed to solve tasks by using tools. "
                 "You don't know any team information, don't guess by yourself. "
                 "When a league is needed, you MUST call detect_league. "
+                "To filter a team's matches, call query_matches with league and team "
+                "instead of passing the matches from load_team_matches. "
+                "For standings, positions or points, call league_table. "
+                "For the record between two teams, call head_to_head. "
                 "Do not answer using your own knowledge if a tool can be used."
             )
         )
@@ -14,17 +14,50 @@ FC_ACCESS_KEY_SECRET = os.getenv("FC_ACCESS_KEY_SECRET")
 FC_ACCOUNT_ID = os.getenv("FC_ACCOUNT_ID")
 FC_REGION = os.getenv("FC_REGION")
 
+# 离线运行：FC 调用直接在本进程执行 server/ 下的 handler，不需要 FC 账号
+# FC_LOCAL_LATENCY_MS 给每次调用加上模拟的网络往返
+FC_LOCAL = os.getenv("FC_LOCAL", "").lower() in ("1", "true", "yes")
+FC_LOCAL_LATENCY_MS = float(os.getenv("FC_LOCAL_LATENCY_MS", "0"))
+
+# 打开后每次 FC 调用都带上 _timing，记录服务端分段耗时和客户端往返时间
+FC_TIMING = os.getenv("FC_TIMING", "").lower() in ("1", "true", "yes")
+
+# 同一窗口内并发的工具调用合并成一次 FC batch 调用，0（默认）表示不合并
+# 打开后每次调用都要先等一个窗口，适合一步里经常并发多个 tool call 的场景
+FC_BATCH_WINDOW_MS = float(os.getenv("FC_BATCH_WINDOW_MS", "0"))
+
+# 异步 FC 客户端的连接池大小（同一进程内所有 agent 会话共享）
+FC_POOL_SIZE = int(os.getenv("FC_POOL_SIZE", "32"))
+
+# 工具执行策略：local / remote / auto，例如 "detect_league=local,query_matches=auto"
+# 没写的工具用 tools/local_exec.DEFAULT_POLICY
+TOOL_EXEC_POLICY = dict(
+    item.split("=", 1)
+    for item in os.getenv("TOOL_EXEC_POLICY", "").replace(" ", "").split(",")
+    if "=" in item
+)
+
+# 工具 schema 的本地缓存，启动时直接用，后台再向 FC 校验
+TOOL_SCHEMA_CACHE = os.getenv(
+    "TOOL_SCHEMA_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "soccer-mcp", "tool_schema.json"),
+)
+
+# 工具结果缓存：最多缓存多少条、每条保留多少秒，任一为 0 表示关闭
+TOOL_MEMO_SIZE = int(os.getenv("TOOL_MEMO_SIZE", "256"))
+TOOL_MEMO_TTL = float(os.getenv("TOOL_MEMO_TTL", "300"))
+
 def check_required():
     missing = []
-    for k in [
-        "OPENAI_API_KEY",
-        "MODEL",
-        "BASE_URL",
-        "FC_ACCESS_KEY_ID",
-        "FC_ACCESS_KEY_SECRET",
-        "FC_ACCOUNT_ID",
-        "FC_REGION"
-    ]:
+    required = ["OPENAI_API_KEY", "MODEL", "BASE_URL"]
+    if not FC_LOCAL:
+        required += [
+            "FC_ACCESS_KEY_ID",
+            "FC_ACCESS_KEY_SECRET",
+            "FC_ACCOUNT_ID",
+            "FC_REGION"
+        ]
+    for k in required:
         if not os.getenv(k):
             missing.append(k)
     if missing:
@@ -0,0 +1,141 @@
+import asyncio
+import hashlib
+import json
+import time
+import weakref
+from urllib.parse import quote
+
+import aiohttp
+from alibabacloud_tea_openapi.utils import Utils
+from darabonba.request import DaraRequest
+
+from config.settings import (
+    FC_ACCESS_KEY_ID,
+    FC_ACCESS_KEY_SECRET,
+    FC_ACCOUNT_ID,
+    FC_REGION,
+    FC_BATCH_WINDOW_MS,
+    FC_POOL_SIZE,
+    FC_LOCAL,
+)
+from .batcher import AsyncFCBatcher
+from .invoke import _unwrap, parse_fc_response
+from .timing import record, with_timing
+
+FC_API_VERSION = "2023-03-30"
+SIGN_TYPE = "ACS3-HMAC-SHA256"
+
+
+class AsyncFCClient:
+    """
+    asyncio 版 FC 调用
+    SDK 自带的 *_async 方法每次调用都会新建 aiohttp session（重新握手），
+    这里每个事件循环共享一个 session：连接池 + keep-alive
+    签名沿用 SDK 的 ACS3-HMAC-SHA256 实现
+    """
+
+    def __init__(self, endpoint: str, access_key_id: str, access_key_secret: str, pool_size: int):
+        self.endpoint = endpoint
+        self.access_key_id = access_key_id
+        self.access_key_secret = access_key_secret
+        self.pool_size = pool_size
+        self._sessions = weakref.WeakKeyDictionary()
+
+    def _session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.pool_size,
+                    limit_per_host=self.pool_size,
+                    keepalive_timeout=60,
+                )
+            )
+            self._sessions[loop] = session
+        return session
+
+    def _sign(self, function_name: str, body: bytes) -> DaraRequest:
+        payload_hash = hashlib.sha256(body).hexdigest()
+
+        request = DaraRequest()
+        request.protocol = "https"
+        request.method = "POST"
+        request.pathname = f"/{FC_API_VERSION}/functions/{quote(function_name, safe='')}/invocations"
+        request.query = {"qualifier": "LATEST"}
+        request.headers = {
+            "host": self.endpoint,
+            "x-acs-version": FC_API_VERSION,
+            "x-acs-action": "InvokeFunction",
+            "x-acs-date": Utils.get_timestamp(),
+            "x-acs-signature-nonce": Utils.get_nonce(),
+            "accept": "application/json",
+            "content-type": "application/octet-stream",
+            "x-fc-invocation-type": "Sync",
+            "x-fc-log-type": "None",
+            "x-acs-content-sha256": payload_hash,
+        }
+        request.headers["Authorization"] = Utils.get_authorization(
+            request, SIGN_TYPE, payload_hash, self.access_key_id, self.access_key_secret
+        )
+        return request
+
+    async def call_fc_function(self, function_name: str, args: dict):
+        body = json.dumps(with_timing(args), ensure_ascii=False).encode("utf-8")
+        request = self._sign(function_name, body)
+
+        start = time.perf_counter()
+        async with self._session().post(
+            f"https://{self.endpoint}{request.pathname}",
+            params=request.query,
+            data=body,
+            headers=request.headers,
+        ) as resp:
+            raw = await resp.text(encoding="utf-8")
+            if resp.status >= 400:
+                raise RuntimeError(f"FC invoke {function_name} failed: {resp.status} {raw}")
+
+        record(function_name, (time.perf_counter() - start) * 1000, raw)
+        return parse_fc_response(raw)
+
+    async def call_fc_batch(self, calls: list[dict]) -> list[dict]:
+        raw = await self.call_fc_function("batch", {"calls": calls})
+        if isinstance(raw, dict) and "results" in raw:
+            return raw["results"]
+
+        error = raw.get("error", raw) if isinstance(raw, dict) else raw
+        return [{"error": str(error)} for _ in calls]
+
+    async def close(self) -> None:
+        for session in list(self._sessions.values()):
+            await session.close()
+        self._sessions.clear()
+
+
+if FC_LOCAL:
+    from .client import get_fc_client
+    from .local import LocalAsyncFCClient
+    _client = LocalAsyncFCClient(get_fc_client())
+else:
+    _client = AsyncFCClient(
+        endpoint=f"{FC_ACCOUNT_ID}.{FC_REGION}.fc.aliyuncs.com",
+        access_key_id=FC_ACCESS_KEY_ID,
+        access_key_secret=FC_ACCESS_KEY_SECRET,
+        pool_size=FC_POOL_SIZE,
+    )
+
+
+async def _call_one(tool_name: str, args: dict) -> dict:
+    return {"result": await _client.call_fc_function(tool_name, args)}
+
+
+_batcher = AsyncFCBatcher(_call_one, _client.call_fc_batch, FC_BATCH_WINDOW_MS, unwrap=_unwrap)
+
+
+def get_async_fc_client() -> AsyncFCClient:
+    return _client
+
+
+async def acall_fc_tool(tool_name: str, args: dict):
+    """call_fc_tool 的协程版本"""
+    return await _batcher.call(tool_name, args)
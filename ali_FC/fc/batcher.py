@@ -0,0 +1,122 @@
+import asyncio
+import threading
+import time
+import weakref
+from concurrent.futures import Future
+
+# 只依赖标准库：auto/FC_client.py 按路径加载这份实现，两边的批处理逻辑只维护一份
+
+
+def _same(r):
+    return r
+
+
+class FCBatcher:
+    """
+    把同一时间窗口内并发到达的工具调用合并成一次 batch 调用
+    agent 一步里发出多个 tool call 时，ToolNode 会在线程池里并发执行它们
+    - call_one(tool, args)：单次调用，返回与 batch 结果同形的 {"result": ...} | {"error": ...}
+    - call_batch(calls)：一次调用执行多个工具，返回与 calls 等长的结果
+    - unwrap(r)：把一条结果转成调用方拿到的返回值，默认原样返回
+    """
+
+    def __init__(self, call_one, call_batch, window_ms: float, unwrap=_same):
+        self.call_one = call_one
+        self.call_batch = call_batch
+        self.unwrap = unwrap
+        self.window = window_ms / 1000
+        self._lock = threading.Lock()
+        self._pending = None
+
+    def call(self, tool_name: str, args: dict):
+        if self.window <= 0:
+            return self.unwrap(self.call_one(tool_name, args))
+
+        item = {"tool": tool_name, "args": args, "future": Future()}
+        with self._lock:
+            leader = self._pending is None
+            if leader:
+                self._pending = []
+            self._pending.append(item)
+
+        # 第一个到达的调用负责等窗口结束后统一发送
+        if leader:
+            time.sleep(self.window)
+            with self._lock:
+                batch, self._pending = self._pending, None
+            self._flush(batch)
+
+        return item["future"].result()
+
+    def _flush(self, batch: list[dict]) -> None:
+        try:
+            if len(batch) == 1:
+                results = [self.call_one(batch[0]["tool"], batch[0]["args"])]
+            else:
+                results = self.call_batch(
+                    [{"tool": item["tool"], "args": item["args"]} for item in batch]
+                )
+        except Exception as e:
+            for item in batch:
+                item["future"].set_exception(e)
+            return
+
+        for item, r in zip(batch, results):
+            item["future"].set_result(self.unwrap(r))
+
+
+class AsyncFCBatcher:
+    """FCBatcher 的协程版本：同一窗口内并发的 tool call 合并成一次 batch 调用，call_one / call_batch 是协程函数"""
+
+    def __init__(self, call_one, call_batch, window_ms: float, unwrap=_same):
+        self.call_one = call_one
+        self.call_batch = call_batch
+        self.unwrap = unwrap
+        self.window = window_ms / 1000
+        # 按事件循环分别攒批
+        self._pending = weakref.WeakKeyDictionary()
+        # 正在发送的批次，保持引用避免 task 被回收
+        self._flushing = set()
+
+    async def call(self, tool_name: str, args: dict):
+        if self.window <= 0:
+            return self.unwrap(await self.call_one(tool_name, args))
+
+        loop = asyncio.get_running_loop()
+        item = {"tool": tool_name, "args": args, "future": loop.create_future()}
+        leader = loop not in self._pending
+        if leader:
+            self._pending[loop] = []
+        self._pending[loop].append(item)
+
+        # 第一个到达的调用负责等窗口结束后统一发送
+        if leader:
+            try:
+                await asyncio.sleep(self.window)
+            finally:
+                # leader 在窗口内被取消也要把攒下的调用发出去，否则其余调用会一直等下去
+                flush = loop.create_task(self._flush(self._pending.pop(loop)))
+                self._flushing.add(flush)
+                flush.add_done_callback(self._flushing.discard)
+            # 在独立 task 里发送，leader 之后被取消也不会中断其余调用
+            await asyncio.shield(flush)
+
+        return await item["future"]
+
+    async def _flush(self, batch: list[dict]) -> None:
+        try:
+            if len(batch) == 1:
+                results = [await self.call_one(batch[0]["tool"], batch[0]["args"])]
+            else:
+                results = await self.call_batch(
+                    [{"tool": item["tool"], "args": item["args"]} for item in batch]
+                )
+        except Exception as e:
+            for item in batch:
+                if not item["future"].done():
+                    item["future"].set_exception(e)
+            return
+
+        for item, r in zip(batch, results):
+            if not item["future"].done():
+                item["future"].set_result(self.unwrap(r))
@@ -8,12 +8,17 @@ from config.settings import (
     FC_ACCESS_KEY_SECRET,
     FC_ACCOUNT_ID,
     FC_REGION,
+    FC_LOCAL,
+    FC_LOCAL_LATENCY_MS,
 )
 
 _client = None
 
 def get_fc_client() -> Client:
     global _client
+    if _client is None and FC_LOCAL:
+        from .local import LocalFCClient
+        _client = LocalFCClient(FC_LOCAL_LATENCY_MS)
     if _client is None:
         credential = CredentialClient(
             Config(
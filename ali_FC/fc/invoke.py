@@ -1,12 +1,16 @@
 import json
+import time
 from alibabacloud_darabonba_stream.client import Client as StreamClient
 from alibabacloud_fc20230330 import models as fc_models
 from alibabacloud_tea_util import models as util_models
+from config.settings import FC_BATCH_WINDOW_MS
+from .batcher import FCBatcher
 from .client import get_fc_client
+from .timing import record, with_timing
 
 def call_fc_function(function_name: str, args: dict) -> dict:
         client = get_fc_client()
-        body_json_str = json.dumps(args, ensure_ascii=False)
+        body_json_str = json.dumps(with_timing(args), ensure_ascii=False)
         body_stream = StreamClient.read_from_string(body_json_str)
         headers = fc_models.InvokeFunctionHeaders(
             x_fc_invocation_type='Sync',
@@ -18,32 +22,80 @@ def call_fc_function(function_name: str, args: dict) -> dict:
         )
         runtime = util_models.RuntimeOptions()
 
+        start = time.perf_counter()
         resp = client.invoke_function_with_options(function_name, request, headers, runtime)
         raw = resp.body.read().decode("utf-8")
-        try:
-            data = json.loads(raw)
-
-            # FC 标准返回
-            if isinstance(data, dict) and "body" in data:
-                body = data["body"]
-
-                # body 本身是 JSON 字符串
-                if isinstance(body, str):
-                    try:
-                        return json.loads(body)
-                    except json.JSONDecodeError:
-                        # body 就是普通字符串，比如“比分更新成功”
-                        return body
-
-                # body 已经是 dict
-                return body
-
-            return data
-
-        except json.JSONDecodeError:
-            # FC 直接返回了纯文本
-            return raw
-        
+        record(function_name, (time.perf_counter() - start) * 1000, raw)
+        return parse_fc_response(raw)
+
+
+def parse_fc_response(raw: str):
+    try:
+        data = json.loads(raw)
+
+        # FC 标准返回
+        if isinstance(data, dict) and "body" in data:
+            body = data["body"]
+
+            # body 本身是 JSON 字符串
+            if isinstance(body, str):
+                try:
+                    return json.loads(body)
+                except json.JSONDecodeError:
+                    # body 就是普通字符串，比如“比分更新成功”
+                    return body
+
+            # body 已经是 dict
+            return body
+
+        return data
+
+    except json.JSONDecodeError:
+        # FC 直接返回了纯文本
+        return raw
+
 def list_tools():
     raw = call_fc_function("list_tools", {})
-    return raw.get("tools", [])
\ No newline at end of file
+    return raw.get("tools", [])
+
+
+def fetch_tool_schemas(version: str = None) -> dict:
+    """
+    带上已缓存的 version 调 list_tools
+    返回 {"tools": [...], "version": ...}，未变化时为 {"version": ..., "not_modified": True}
+    """
+    return call_fc_function("list_tools", {"version": version} if version else {})
+
+
+def call_fc_batch(calls: list[dict]) -> list[dict]:
+    """
+    一次 FC 调用执行多个工具
+    calls: [{"tool": "...", "args": {...}}, ...]
+    返回与 calls 等长的 [{"result": ...} | {"error": ...}]
+    """
+    raw = call_fc_function("batch", {"calls": calls})
+    if isinstance(raw, dict) and "results" in raw:
+        return raw["results"]
+
+    error = raw.get("error", raw) if isinstance(raw, dict) else raw
+    return [{"error": str(error)} for _ in calls]
+
+
+def _unwrap(r: dict):
+    """{"result": ...} 拆成工具的返回值，出错时为 {"error": ...}"""
+    if "result" in r:
+        return r["result"]
+    return {"error": r.get("error")}
+
+
+_batcher = FCBatcher(
+    lambda tool_name, args: {"result": call_fc_function(tool_name, args)},
+    call_fc_batch,
+    FC_BATCH_WINDOW_MS,
+    unwrap=_unwrap,
+)
+
+
+def call_fc_tool(tool_name: str, args: dict):
+    """工具调用入口：并发的调用会被合并成一次 batch"""
+    return _batcher.call(tool_name, args)
@@ -0,0 +1,97 @@
+import io
+import os
+import sys
+import json
+import time
+import uuid
+import asyncio
+import importlib
+import threading
+from types import SimpleNamespace
+
+from .invoke import parse_fc_response
+from .timing import record, with_timing
+
+# FC 部署的就是这个目录，函数名即模块名
+SERVER_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "server"
+)
+
+
+def _context(function_name: str) -> SimpleNamespace:
+    """handler 的 context 参数，只带常用字段"""
+    return SimpleNamespace(
+        request_id=str(uuid.uuid4()),
+        function=SimpleNamespace(name=function_name),
+        credentials=None,
+    )
+
+
+def _encode(result) -> bytes:
+    """与 FC 一致：str / bytes 原样返回，其它序列化成 JSON"""
+    if isinstance(result, bytes):
+        return result
+    if isinstance(result, str):
+        return result.encode("utf-8")
+    return json.dumps(result, ensure_ascii=False).encode("utf-8")
+
+
+class LocalFCClient:
+    """
+    进程内的 FC 替身：invoke_function_with_options 直接调 server/{function_name}.handler
+    latency_ms 模拟一次网络往返，便于与线上对比；handler 需要的 DATA_DIR 等环境变量照常设置
+    """
+
+    def __init__(self, latency_ms: float = 0):
+        self.latency = latency_ms / 1000
+        self._handlers = {}
+        self._lock = threading.Lock()
+
+    def handler(self, function_name: str):
+        with self._lock:
+            if function_name not in self._handlers:
+                if SERVER_DIR not in sys.path:
+                    sys.path.insert(0, SERVER_DIR)
+                self._handlers[function_name] = importlib.import_module(function_name).handler
+            return self._handlers[function_name]
+
+    def invoke(self, function_name: str, body: bytes) -> bytes:
+        if self.latency:
+            time.sleep(self.latency)
+        return _encode(self.handler(function_name)(body, _context(function_name)))
+
+    def invoke_function_with_options(self, function_name, request, headers, runtime):
+        body = request.body.read() if hasattr(request.body, "read") else request.body
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        raw = self.invoke(function_name, body or b"")
+        return SimpleNamespace(status_code=200, headers={}, body=io.BytesIO(raw))
+
+
+class LocalAsyncFCClient:
+    """AsyncFCClient 的进程内替身：handler 在线程里执行，不阻塞事件循环"""
+
+    def __init__(self, client: LocalFCClient):
+        self.client = client
+
+    async def call_fc_function(self, function_name: str, args: dict):
+        body = json.dumps(with_timing(args), ensure_ascii=False).encode("utf-8")
+        start = time.perf_counter()
+        if self.client.latency:
+            await asyncio.sleep(self.client.latency)
+        handler = self.client.handler(function_name)
+        result = await asyncio.to_thread(handler, body, _context(function_name))
+        raw = _encode(result).decode("utf-8")
+        record(function_name, (time.perf_counter() - start) * 1000, raw)
+        return parse_fc_response(raw)
+
+    async def call_fc_batch(self, calls: list[dict]) -> list[dict]:
+        raw = await self.call_fc_function("batch", {"calls": calls})
+        if isinstance(raw, dict) and "results" in raw:
+            return raw["results"]
+
+        error = raw.get("error", raw) if isinstance(raw, dict) else raw
+        return [{"error": str(error)} for _ in calls]
+
+    async def close(self) -> None:
+        pass
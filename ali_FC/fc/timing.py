@@ -0,0 +1,36 @@
+import json
+from collections import deque
+
+from config.settings import FC_TIMING
+
+# 最近的调用耗时，便于在进程内查看；同时每条打一行结构化日志
+TIMINGS = deque(maxlen=256)
+
+
+def with_timing(args: dict) -> dict:
+    """打开 FC_TIMING 时让服务端返回分段耗时"""
+    return {**args, "_timing": True} if FC_TIMING else args
+
+
+def record(function_name: str, rtt_ms: float, raw: str):
+    """
+    记录一次调用：客户端往返 rtt_ms，服务端 total_ms 与各阶段耗时
+    network_ms = rtt_ms - total_ms，即网络、排队和冷启动的时间
+    """
+    if not FC_TIMING:
+        return None
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        data = None
+    server = data.get("timing") if isinstance(data, dict) else None
+
+    entry = {"function": function_name, "rtt_ms": round(rtt_ms, 3)}
+    if isinstance(server, dict):
+        entry["server_ms"] = server.get("total_ms")
+        entry["network_ms"] = round(rtt_ms - (server.get("total_ms") or 0), 3)
+        entry["spans"] = server.get("spans", {})
+        entry["request_id"] = server.get("request_id")
+    TIMINGS.append(entry)
+    print(json.dumps({"fc_timing": entry}, ensure_ascii=False))
+    return entry
@@ -1,9 +1,9 @@
 from pydantic import BaseModel, Field
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Union
 
 class ChangeScoreInput(BaseModel):
-    match: list[dict] = Field(
-        description="List of match records"
+    match: Union[List[Dict[str, Any]], Dict[str, Any]] = Field(
+        description="List of match records, or a compact {fields, rows} table"
     )
     home_score: int = Field(
         description="The goal number of home team"
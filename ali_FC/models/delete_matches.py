@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field
+from typing import List, Dict, Any, Union
 
 class DeleteMatchesInput(BaseModel):
-    matches: list[dict] = Field(
-        description="List of match records"
+    matches: Union[List[Dict[str, Any]], Dict[str, Any]] = Field(
+        description="List of match records, or a compact {fields, rows} table"
     )
\ No newline at end of file
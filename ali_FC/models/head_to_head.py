@@ -0,0 +1,14 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+class HeadToHeadInput(BaseModel):
+    team_a: str = Field(
+        description="The name of the first football team"
+    )
+    team_b: str = Field(
+        description="The name of the second football team"
+    )
+    league: Optional[str] = Field(
+        default=None,
+        description="League code, e.g. E0; defaults to every league"
+    )
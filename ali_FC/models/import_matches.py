@@ -0,0 +1,16 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+class ImportMatchesInput(BaseModel):
+    csv_text: Optional[str] = Field(
+        default=None,
+        description="Content of a football-data.co.uk season CSV"
+    )
+    url: Optional[str] = Field(
+        default=None,
+        description="URL of a football-data.co.uk season CSV (other hosts are rejected), e.g. https://www.football-data.co.uk/mmz4281/2324/E0.csv"
+    )
+    league: Optional[str] = Field(
+        default=None,
+        description="League code, e.g. E0; overrides the Div column of the CSV"
+    )
@@ -0,0 +1,15 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+class LeagueTableInput(BaseModel):
+    league: str = Field(
+        description="League code, e.g. E0"
+    )
+    season: Optional[str] = Field(
+        default=None,
+        description="Season such as 2024-2025 (seasons start in July); defaults to the latest season"
+    )
+    team: Optional[str] = Field(
+        default=None,
+        description="Only return this team's row, with its position in the table"
+    )
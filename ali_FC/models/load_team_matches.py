@@ -1,4 +1,5 @@
 from pydantic import BaseModel, Field
+from typing import List, Optional
 
 class LoadTeamMatchesInput(BaseModel):
     league: str = Field(
@@ -6,4 +7,27 @@ class LoadTeamMatchesInput(BaseModel):
     )
     team: str = Field(
         description="Team name"
+    )
+    fields: Optional[List[str]] = Field(
+        default=None,
+        description=(
+            "Only return these columns, e.g. ['Date', 'HomeTeam', 'AwayTeam', 'FTHG', 'FTAG']; "
+            "include 'Div' and 'match_id' (plus 'HomeTeam' and 'Date' for a faster lookup) if the matches will be changed or deleted later. Default: all columns"
+        )
+    )
+    compact: bool = Field(
+        default=False,
+        description="Return {fields, rows} with the column names listed once instead of one object per match"
+    )
+    limit: Optional[int] = Field(
+        default=None,
+        description="Page size (1-1000). When given, matches are sorted by date and a next_cursor is returned"
+    )
+    cursor: Optional[str] = Field(
+        default=None,
+        description="The next_cursor from the previous page"
+    )
+    order: Optional[str] = Field(
+        default=None,
+        description="Date order of paged results: asc (default) or desc"
     )
\ No newline at end of file
@@ -1,9 +1,14 @@
 from pydantic import BaseModel, Field
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 
 class QueryMatchesInput(BaseModel):
-    matches: List[Dict[str, Any]] = Field(
-        description="List of match records"
+    league: Optional[str] = Field(
+        default=None,
+        description="League code, e.g. E0; when given, the team's stored matches are queried on the server"
+    )
+    matches: Optional[Union[List[Dict[str, Any]], Dict[str, Any]]] = Field(
+        default=None,
+        description="Match records or a compact {fields, rows} table, only needed when league is not given"
     )
     team: str = Field(
         description="Team name to query"
@@ -1,10 +1,9 @@
-import os
 import json
 import uuid
 
-from common.utils.Ch2En import TEAM_NAME_MAP
-
-DATA_DIR = os.environ.get("DATA_DIR", "./test_data")
+from league_store import append_log, team_matches
+from team_alias import canonical_team
+from timing import enable_timing, span, timed
 
 def add_match(
     league: str,
@@ -28,10 +27,9 @@ def add_match(
     if missing:
         return f"缺少必要字段：{', '.join(missing)}。请补全后重试。"
 
-    home_norm = TEAM_NAME_MAP.get(home, home)
-    away_norm = TEAM_NAME_MAP.get(away, away)
-
-    json_path = os.path.join(DATA_DIR, f"{league}.json")
+    with span("resolve"):
+        home_norm = canonical_team(home) or home
+        away_norm = canonical_team(away) or away
 
     fthg = int(home_score or 0)
     ftag = int(away_score or 0)
@@ -70,24 +68,22 @@ def add_match(
         "match_id": str(uuid.uuid4()),
     }
 
-    with open(json_path, "r", encoding="utf-8") as f:
-        league_data = json.load(f)
-
-    exists = any(
-        m["Date"] == date and m["Time"] == time
-        and m["HomeTeam"] == home_norm and m["AwayTeam"] == away_norm
-        for m in league_data
-    )
+    # 只需查主队的比赛即可判重
+    with span("load"):
+        exists = any(
+            m["Date"] == date and m["Time"] == time
+            and m["HomeTeam"] == home_norm and m["AwayTeam"] == away_norm
+            for m in team_matches(league, home_norm, date)
+        )
     if exists:
         return "比赛已存在，未重复添加"
 
-    league_data.append(new_match)
-
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(league_data, f, ensure_ascii=False, indent=2)
+    with span("write"):
+        append_log(league, "add", new_match["match_id"], new_match)
 
     return "添加比赛成功"
 
+@timed("add_match")
 def handler(event, context):
     """
     FC Event Function Entry
@@ -106,6 +102,7 @@ def handler(event, context):
                 "statusCode": 400,
                 "body": "Invalid JSON event"
             }
+    enable_timing(event)
 
     # 2. 读取参数
     try:
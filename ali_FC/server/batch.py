@@ -0,0 +1,78 @@
+import json
+
+from detect_league import detect_league
+from load_team_matches import load_team_matches
+from query_matches import query_matches
+from add_match import add_match
+from change_score import change_score
+from delete_matches import delete_matches
+from league_table import league_table
+from head_to_head import head_to_head
+from import_matches import import_matches
+from timing import enable_timing, span, timed
+
+TOOLS = {
+    "detect_league": detect_league,
+    "load_team_matches": load_team_matches,
+    "query_matches": query_matches,
+    "add_match": add_match,
+    "change_score": change_score,
+    "delete_matches": delete_matches,
+    "league_table": league_table,
+    "head_to_head": head_to_head,
+    "import_matches": import_matches,
+}
+
+
+def run_batch(calls: list[dict]) -> list[dict]:
+    """
+    按顺序执行一批工具调用
+    每一项返回 {"result": ...} 或 {"error": ...}，单项失败不影响其它项
+    """
+    results = []
+    for call in calls:
+        try:
+            tool_name = call.get("tool")
+            if tool_name not in TOOLS:
+                raise ValueError(f"unknown tool: {tool_name}")
+            # 各工具内部的阶段照常累加，这里再记每个工具的总耗时
+            with span(f"call.{tool_name}"):
+                results.append({"result": TOOLS[tool_name](**call.get("args", {}))})
+        except Exception as e:
+            results.append({"error": str(e)})
+    return results
+
+
+@timed("batch")
+def handler(event, context):
+    """
+    FC Event Function Entry
+    event: {"calls": [{"tool": "...", "args": {...}}, ...]}
+    """
+    try:
+        if isinstance(event, (bytes, bytearray)):
+            event = event.decode("utf-8")
+        if isinstance(event, str):
+            event = json.loads(event)
+        enable_timing(event)
+
+        calls = event.get("calls")
+        if not isinstance(calls, list):
+            return {
+                "statusCode": 400,
+                "body": json.dumps({"error": "missing required param: calls"}, ensure_ascii=False)
+            }
+
+        results = run_batch(calls)
+        with span("serialize"):
+            payload = json.dumps({"results": results}, ensure_ascii=False)
+        return {
+            "statusCode": 200,
+            "body": payload
+        }
+
+    except Exception as e:
+        return {
+            "statusCode": 500,
+            "body": json.dumps({"error": str(e)}, ensure_ascii=False)
+        }
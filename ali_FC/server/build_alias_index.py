@@ -0,0 +1,14 @@
+from team_alias import INDEX_PATH, write_index
+
+
+def main():
+    """
+    把 Ch2En / En2Le 编译成冻结的别名索引，映射表更新后重新运行
+    用法：python build_alias_index.py
+    """
+    index = write_index(INDEX_PATH)
+    print(f"{INDEX_PATH}: {len(index['aliases'])} aliases, {len(index['deletes'])} fuzzy keys")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,19 @@
-import os
 import json
 
-DATA_DIR = os.environ.get("DATA_DIR", "./test_data")
+from league_store import append_log, league_exists, load_league, normalize_team, team_matches
+from timing import enable_timing, span, timed
+
+def _stored_match(league: str, m: dict):
+    """按 match_id 找到库里的完整记录；传入的可能是只带部分列的投影"""
+    home = m.get("HomeTeam")
+    if home:
+        rows = team_matches(league, normalize_team(home), m.get("Date"))
+    else:
+        rows = load_league(league)
+    for row in rows:
+        if str(row.get("match_id")) == str(m.get("match_id")):
+            return row
+    return None
 
 def change_score(
     match: list[dict],
@@ -14,47 +26,38 @@ def change_score(
     # 你原来的逻辑：只改第一场
     m = match[0]
 
-    fthg = int(home_score)
-    ftag = int(away_score)
-
-    m["FTHG"] = fthg
-    m["FTAG"] = ftag
-    m["FTR"] = (
-        "H" if fthg > ftag else
-        "A" if fthg < ftag else
-        "D"
-    )
-
     league = m.get("Div")
     match_id = m.get("match_id")
 
     if not league or not match_id:
         return "比赛数据不完整，缺少 Div 或 match_id"
 
-    path = os.path.join(DATA_DIR, f"{league}.json")
-
-    if not os.path.exists(path):
+    if not league_exists(league):
         return "联赛数据文件不存在"
 
-    with open(path, "r", encoding="utf-8") as f:
-        all_data = json.load(f)
+    with span("load"):
+        stored = _stored_match(league, m)
 
-    updated = False
-    for i, mm in enumerate(all_data):
-        if str(mm.get("match_id")) == str(match_id):
-            all_data[i] = m
-            updated = True
-            break
-
-    if not updated:
+    if stored is None:
         return "更改失败，未在文件中找到对应比赛"
 
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(all_data, f, ensure_ascii=False, indent=2)
+    # 只改比分，其余列保持库里的值
+    fthg = int(home_score)
+    ftag = int(away_score)
+    updated = dict(
+        stored,
+        FTHG=fthg,
+        FTAG=ftag,
+        FTR="H" if fthg > ftag else "A" if fthg < ftag else "D",
+    )
+
+    with span("write"):
+        append_log(league, "update", match_id, updated)
 
     return "比分更新成功"
 
 
+@timed("change_score")
 def handler(event, context):
     """
     FC Event Function Entry
@@ -72,6 +75,7 @@ def handler(event, context):
                 "statusCode": 400,
                 "body": "Invalid JSON event"
             }
+    enable_timing(event)
 
     # 2️⃣ 读取参数（严格按你的接口）
     try:
@@ -1,7 +1,7 @@
-import os
 import json
 
-DATA_DIR = os.environ.get("DATA_DIR", "./test_data")
+from league_store import append_log, league_exists, load_league
+from timing import enable_timing, span, timed
 
 def delete_matches(
     matches: list[dict],
@@ -13,12 +13,11 @@ def delete_matches(
     if not league:
         return "删除失败，比赛数据中缺少 Div"
 
-    json_path = os.path.join(DATA_DIR, f"{league}.json")
-    if not os.path.exists(json_path):
+    if not league_exists(league):
         return "删除失败，联赛数据文件不存在"
 
-    with open(json_path, "r", encoding="utf-8") as f:
-        all_data = json.load(f)
+    with span("load"):
+        all_data = load_league(league)
 
     match_ids_to_delete = {
         str(m.get("match_id"))
@@ -31,21 +30,25 @@ def delete_matches(
 
     original_count = len(all_data)
 
-    filtered_data = [
-        m for m in all_data
-        if str(m.get("match_id")) not in match_ids_to_delete
-    ]
+    # 带上原记录，分区联赛据此定位赛季
+    with span("filter"):
+        found = [
+            m for m in all_data
+            if str(m.get("match_id")) in match_ids_to_delete
+        ]
 
-    deleted_count = original_count - len(filtered_data)
+    deleted_count = len(found)
 
     if deleted_count == 0:
         return "删除失败，未在数据中找到指定比赛"
 
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(filtered_data, f, ensure_ascii=False, indent=2)
+    with span("write"):
+        for m in found:
+            append_log(league, "delete", m.get("match_id"), m)
 
     return f"删除成功！删除了 {deleted_count}/{original_count} 场比赛。"
 
+@timed("delete_matches")
 def handler(event, context):
     """
     FC Event Function Entry
@@ -63,6 +66,7 @@ def handler(event, context):
                 "statusCode": 400,
                 "body": "Invalid JSON event"
             }
+    enable_timing(event)
 
     # 2️⃣ 读取参数（严格按你的 MCP 接口）
     try:
@@ -1,18 +1,17 @@
 import json
-from common.utils.En2Le import TEAM_NAME_MAP1
-from common.utils.Ch2En import TEAM_NAME_MAP, LEAGUE_NAME_MAP
+from team_alias import team_league
+from timing import enable_timing, span, timed
 
 def detect_league(
     team: str
 ) -> str:
-    if team in TEAM_NAME_MAP:
-        team_en = TEAM_NAME_MAP[team]
-    else:
-        team_en = team
-
-    league = TEAM_NAME_MAP1[team_en]
+    with span("resolve"):
+        league = team_league(team)
+    if league is None:
+        return f"未找到球队：{team}，请确认球队名称"
     return league
 
+@timed("detect_league")
 def handler(event, context):
     try:
         if isinstance(event, bytes):
@@ -39,6 +38,7 @@ def handler(event, context):
                 "statusCode": 400,
                 "body": json.dumps({"error": "invalid input format"})
             }
+        enable_timing(body)
 
         team = body.get("team")
         if not team:
@@ -49,9 +49,11 @@ def handler(event, context):
 
         league = detect_league(team)
 
+        with span("serialize"):
+            payload = json.dumps({"league": league}, ensure_ascii=False)
         return {
             "statusCode": 200,
-            "body": json.dumps({"league": league}, ensure_ascii=False)
+            "body": payload
         }
 
     except Exception as e:
@@ -0,0 +1,101 @@
+import json
+from typing import Optional
+
+from league_store import league_exists, list_leagues, pair_matches
+from team_alias import resolve_team
+from timing import enable_timing, span, timed
+
+
+def summarize(matches: list[dict], team_a: str, team_b: str) -> dict:
+    """以 team_a 的视角统计胜平负和进球，没有比分的比赛不计入"""
+    summary = {
+        "played": 0,
+        "wins": {team_a: 0, team_b: 0},
+        "draws": 0,
+        "goals": {team_a: 0, team_b: 0},
+    }
+    for m in matches:
+        try:
+            home_goals, away_goals = int(m.get("FTHG")), int(m.get("FTAG"))
+        except (TypeError, ValueError):
+            continue
+        a_goals, b_goals = (
+            (home_goals, away_goals) if m.get("HomeTeam") == team_a else (away_goals, home_goals)
+        )
+        summary["played"] += 1
+        summary["goals"][team_a] += a_goals
+        summary["goals"][team_b] += b_goals
+        if a_goals > b_goals:
+            summary["wins"][team_a] += 1
+        elif a_goals < b_goals:
+            summary["wins"][team_b] += 1
+        else:
+            summary["draws"] += 1
+    return summary
+
+
+def head_to_head(
+    team_a: str,
+    team_b: str,
+    league: Optional[str] = None,
+):
+    """
+    两队的历史交锋：比赛按日期排序，附带胜平负与进球汇总
+    不传 league 时在所有联赛里找，分区联赛只读两队都出场过的赛季
+    """
+    with span("resolve"):
+        a_en = resolve_team(team_a) or team_a
+        b_en = resolve_team(team_b) or team_b
+    if a_en == b_en:
+        return {"error": f"两支球队相同：{team_a}"}
+
+    if league and not league_exists(league):
+        return {"error": f"联赛数据文件不存在：{league}"}
+
+    with span("load"):
+        matches = []
+        for lg in [league] if league else list_leagues():
+            matches.extend(pair_matches(lg, a_en, b_en))
+
+    with span("summarize"):
+        summary = summarize(matches, a_en, b_en)
+
+    return {
+        "team_a": a_en,
+        "team_b": b_en,
+        "summary": summary,
+        "matches": matches,
+    }
+
+
+@timed("head_to_head")
+def handler(event, context):
+    """FC 事件函数入口"""
+    try:
+        body_bytes = event if isinstance(event, bytes) else event.get("body", b"")
+        body_str = body_bytes.decode("utf-8") if isinstance(body_bytes, bytes) else body_bytes
+        body = json.loads(body_str)
+        enable_timing(body)
+
+        team_a = body.get("team_a")
+        team_b = body.get("team_b")
+        if not team_a or not team_b:
+            return {
+                "statusCode": 400,
+                "body": json.dumps({"error": "missing required params: team_a, team_b"}, ensure_ascii=False)
+            }
+
+        result = head_to_head(team_a, team_b, league=body.get("league"))
+
+        with span("serialize"):
+            payload = json.dumps(result, ensure_ascii=False)
+        return {
+            "statusCode": 200,
+            "body": payload
+        }
+
+    except Exception as e:
+        return {
+            "statusCode": 500,
+            "body": json.dumps({"error": str(e)}, ensure_ascii=False)
+        }
@@ -0,0 +1,269 @@
+import io
+import os
+import csv
+import json
+import uuid
+import argparse
+import urllib.parse
+import urllib.request
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
+
+from league_store import (
+    LEAGUE_CODECS, MATCH_FIELDS,
+    add_matches, date_key, league_exists, load_league, normalize_team, partition_name,
+    read_partitions, save_league, save_season, season_of,
+)
+from timing import enable_timing, span, timed
+
+# football-data 部分联赛的 CSV（new/ 目录下）列名不同
+CSV_ALIASES = {"Home": "HomeTeam", "Away": "AwayTeam", "HG": "FTHG", "AG": "FTAG", "Res": "FTR"}
+
+# 工具只能从这些主机下载 CSV，不能借它访问内网地址
+CSV_URL_HOSTS = ("football-data.co.uk", "www.football-data.co.uk")
+
+_TEXT_FIELDS = {"Div", "Date", "Time", "HomeTeam", "AwayTeam", "FTR", "HTR", "match_id"}
+
+
+def _int(value):
+    """CSV 里的数字可能写成 1.0；空值（未开赛、缺数据）记为 None"""
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_rows(lines, league: str = None):
+    """
+    逐行解析 football-data CSV，产出与库内格式一致的比赛记录（还没有 match_id）
+    队名经 TEAM_NAME_MAP 归一化，日期保持 CSV 原样（query_matches / add_match 按原字符串比较），
+    缺少日期或主客队的行跳过
+    league 不为空时覆盖 CSV 里的 Div
+    """
+    for raw in csv.DictReader(lines):
+        row = {CSV_ALIASES.get(k, k): (v or "").strip() for k, v in raw.items() if isinstance(k, str)}
+        if not (row.get("Date") and row.get("HomeTeam") and row.get("AwayTeam")):
+            continue
+        div = league or row.get("Div")
+        if not div:
+            raise ValueError("CSV has no Div column, pass league")
+
+        m = {
+            f: row.get(f, "") if f in _TEXT_FIELDS else _int(row.get(f))
+            for f in MATCH_FIELDS if f != "match_id"
+        }
+        m["Div"] = div
+        m["HomeTeam"] = normalize_team(row["HomeTeam"])
+        m["AwayTeam"] = normalize_team(row["AwayTeam"])
+        yield m
+
+
+def match_key(m: dict) -> tuple:
+    """
+    判重键：同一天同一组主客队只算一场；老赛季的 CSV 没有 Time 列，不参与判重
+    日期只在这里统一成 YYYY-MM-DD，dd/mm/yy 与 dd/mm/yyyy 视为同一天
+    """
+    return date_key(m.get("Date")), normalize_team(m.get("HomeTeam")), normalize_team(m.get("AwayTeam"))
+
+
+def group_by_league(matches) -> dict:
+    by_league = {}
+    for m in matches:
+        by_league.setdefault(m["Div"], []).append(m)
+    return by_league
+
+
+def _by_season(matches) -> dict:
+    by_season = {}
+    for m in matches:
+        by_season.setdefault(season_of(m["Date"]), []).append(m)
+    return by_season
+
+
+def parse_file(path: str, league: str = None) -> dict:
+    """{联赛: [比赛...]}，进程池里按文件并行调用"""
+    with open(path, "r", encoding="utf-8-sig", errors="replace", newline="") as f:
+        return group_by_league(parse_rows(f, league))
+
+
+def _new_matches(existing: list[dict], rows: list[dict]) -> list[dict]:
+    """已有记录的判重键放进集合，新比赛逐条判重并分配 match_id"""
+    seen = {match_key(m) for m in existing}
+    new = []
+    for m in rows:
+        key = match_key(m)
+        if key in seen:
+            continue
+        seen.add(key)
+        new.append({**m, "match_id": str(uuid.uuid4())})
+    return new
+
+
+def ingest_league(league: str, matches: list[dict], codec: str = None, partition: bool = False) -> dict:
+    """
+    把一个联赛的新比赛合并进库，已有的比赛（含变更日志）不动
+    新联赛整表写一次（partition=True 时每个赛季一个分区），codec 只对新联赛生效；
+    已有联赛的新比赛经变更日志写入（add_matches），导入期间别处的增删改不会被整表写回覆盖
+    """
+    if not league_exists(league):
+        new = _new_matches([], matches)
+        if new and partition:
+            for season, rows in sorted(_by_season(new).items()):
+                save_season(league, season, rows, codec)
+        elif new:
+            save_league(league, new, codec)
+    else:
+        partitions = read_partitions(league)
+        if partitions is None:
+            new = _new_matches(load_league(league), matches)
+        else:
+            # 分区联赛只读涉及的赛季
+            new = []
+            for season, rows in sorted(_by_season(matches).items()):
+                existing = load_league(partition_name(league, season)) if season in partitions else []
+                new.extend(_new_matches(existing, rows))
+        if new:
+            add_matches(league, new)
+
+    return {"league": league, "added": len(new), "skipped": len(matches) - len(new)}
+
+
+def import_files(
+    paths: list[str],
+    league: str = None,
+    codec: str = None,
+    partition: bool = False,
+    workers: int = None,
+) -> list[dict]:
+    """
+    批量导入：先在进程池里按文件并行解析，再按联赛分组，每个联赛交给一个进程合并写入
+    不同联赛写不同的文件，互不影响
+    """
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        by_league = {}
+        for parsed in pool.map(parse_file, paths, repeat(league)):
+            for lg, rows in parsed.items():
+                by_league.setdefault(lg, []).extend(rows)
+
+        futures = [
+            pool.submit(ingest_league, lg, rows, codec, partition)
+            for lg, rows in sorted(by_league.items())
+        ]
+        return [f.result() for f in futures]
+
+
+def _check_url(url: str) -> None:
+    parts = urllib.parse.urlsplit(url)
+    if parts.scheme not in ("http", "https") or parts.hostname not in CSV_URL_HOSTS or parts.port is not None:
+        raise ValueError(f"url must be on {', '.join(CSV_URL_HOSTS)}")
+
+
+class _CheckedRedirect(urllib.request.HTTPRedirectHandler):
+    """重定向到的地址同样要在白名单里"""
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        _check_url(newurl)
+        return super().redirect_request(req, fp, code, msg, headers, newurl)
+
+
+def _open_url(url: str):
+    _check_url(url)
+    resp = urllib.request.build_opener(_CheckedRedirect).open(url, timeout=30)
+    return io.TextIOWrapper(resp, encoding="utf-8-sig", errors="replace", newline="")
+
+
+def import_matches(csv_text: str = None, url: str = None, league: str = None) -> dict:
+    """
+    工具入口：导入一份 football-data CSV（直接传内容，或给出下载地址，边下载边解析）
+    新联赛写成单文件，需要分区时再用 migrate_leagues.py --partition
+    """
+    if not csv_text and not url:
+        return {"error": "需要 csv_text 或 url"}
+    if url:
+        try:
+            _check_url(url)
+        except ValueError as e:
+            return {"error": str(e)}
+
+    with span("parse"):
+        if url:
+            with _open_url(url) as f:
+                by_league = group_by_league(parse_rows(f, league))
+        else:
+            by_league = group_by_league(parse_rows(io.StringIO(csv_text), league))
+
+    with span("write"):
+        results = [ingest_league(lg, rows) for lg, rows in sorted(by_league.items())]
+    return {"leagues": results}
+
+
+@timed("import_matches")
+def handler(event, context):
+    """FC 事件函数入口"""
+    try:
+        body_bytes = event if isinstance(event, bytes) else event.get("body", b"")
+        body_str = body_bytes.decode("utf-8") if isinstance(body_bytes, bytes) else body_bytes
+        body = json.loads(body_str)
+        enable_timing(body)
+
+        csv_text = body.get("csv_text")
+        url = body.get("url")
+        if not csv_text and not url:
+            return {
+                "statusCode": 400,
+                "body": json.dumps({"error": "missing required params: csv_text or url"}, ensure_ascii=False)
+            }
+
+        result = import_matches(csv_text=csv_text, url=url, league=body.get("league"))
+
+        with span("serialize"):
+            payload = json.dumps(result, ensure_ascii=False)
+        return {
+            "statusCode": 200,
+            "body": payload
+        }
+
+    except Exception as e:
+        return {
+            "statusCode": 500,
+            "body": json.dumps({"error": str(e)}, ensure_ascii=False)
+        }
+
+
+def _csv_paths(paths: list[str]) -> list[str]:
+    """目录下递归找 .csv，按路径排序，保证同一联赛按赛季顺序合并"""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for dirpath, _, filenames in os.walk(path):
+                found.extend(os.path.join(dirpath, n) for n in filenames if n.lower().endswith(".csv"))
+        else:
+            found.append(path)
+    return sorted(found)
+
+
+def main():
+    """
+    把 football-data.co.uk 的赛季 CSV 批量导入 DATA_DIR
+    用法：python import_matches.py [--league E0] [--partition] [--workers 8] data/*.csv 或目录
+    已有的比赛按 (日期, 主队, 客队) 判重跳过，每个联赛只写一次
+    """
+    parser = argparse.ArgumentParser(description="bulk import football-data CSV files")
+    parser.add_argument("paths", nargs="+", help="CSV files or directories")
+    parser.add_argument("--league", default=None, help="override the Div column")
+    parser.add_argument(
+        "--codec", choices=LEAGUE_CODECS, default=None,
+        help="snapshot codec, default: keep the existing one (LEAGUE_CODEC for new leagues)"
+    )
+    parser.add_argument("--partition", action="store_true", help="write new leagues one partition per season")
+    parser.add_argument("--workers", type=int, default=None, help="process pool size, default: CPU count")
+    args = parser.parse_args()
+
+    paths = _csv_paths(args.paths)
+    for r in import_files(paths, args.league, args.codec, args.partition, args.workers):
+        print(f"{r['league']}: {r['added']} added, {r['skipped']} skipped")
+    print(f"{len(paths)} files")
+
+
+if __name__ == "__main__":
+    main()
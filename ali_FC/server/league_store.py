@@ -0,0 +1,1231 @@
+import os
+import gzip
+import json
+import fcntl
+import bisect
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+try:
+    import zstandard as zstd
+except ImportError:
+    zstd = None
+
+from common.utils.Ch2En import TEAM_NAME_MAP
+
+DATA_DIR = os.environ.get("DATA_DIR", "./test_data")
+
+MATCH_FIELDS = [
+    "Div", "Date", "Time", "HomeTeam", "AwayTeam",
+    "FTHG", "FTAG", "FTR", "HTHG", "HTAG", "HTR",
+    "HS", "AS", "HST", "AST", "HF", "AF", "HC", "AC",
+    "HY", "AY", "HR", "AR", "match_id",
+]
+
+INDEX_VERSION = 1
+
+# 快照写入编码：json / gzip / zstd，读取时按文件头自动识别
+# 默认 json：只有 json 快照有 sidecar 索引的字节区间，冷实例单队查询不用解析整份快照
+LEAGUE_CODEC = os.environ.get("LEAGUE_CODEC", "json")
+LEAGUE_CODECS = ("json", "gzip", "zstd")
+# 各编码的快照后缀，压缩快照不用 .json
+LEAGUE_SUFFIXES = {"json": ".json", "gzip": ".json.gz", "zstd": ".json.zst"}
+
+# 变更日志超过这个大小就合并回基础快照
+LOG_COMPACT_BYTES = int(os.environ.get("LOG_COMPACT_BYTES", 1024 * 1024))
+
+# 分区联赛的元数据文件名
+PARTITION_MANIFEST = "_partitions.json"
+
+# 热实例缓存：{json_path: (mtime_ns, size, frame)}
+_FRAME_CACHE = {}
+
+# 物化视图：积分榜、对阵索引，见文件末尾
+VIEW_NAMES = ("standings", "pairs")
+VIEW_VERSION = 1
+
+# 热实例里的视图：{(league, view): state}，按数据戳判断是否可用
+_VIEW_CACHE = {}
+
+
+def _base_path(league: str, codec: str) -> str:
+    return os.path.join(DATA_DIR, f"{league}{LEAGUE_SUFFIXES[codec]}")
+
+
+def league_path(league: str) -> str:
+    """快照文件：按后缀找已有的那个（LEAGUE_CODEC 优先），都没有时为 LEAGUE_CODEC 的后缀"""
+    for codec in (LEAGUE_CODEC, *LEAGUE_CODECS):
+        path = _base_path(league, codec)
+        if os.path.exists(path):
+            return path
+    return _base_path(league, LEAGUE_CODEC)
+
+
+def index_path(league: str) -> str:
+    return os.path.join(DATA_DIR, f"{league}.index.json")
+
+
+def log_path(league: str) -> str:
+    return os.path.join(DATA_DIR, f"{league}.log.jsonl")
+
+
+def _compacting_path(league: str) -> str:
+    return log_path(league) + ".compacting"
+
+
+def _lock_path(league: str) -> str:
+    return log_path(league) + ".lock"
+
+
+def manifest_path(league: str) -> str:
+    return os.path.join(DATA_DIR, league, PARTITION_MANIFEST)
+
+
+def view_path(league: str, view: str) -> str:
+    return os.path.join(DATA_DIR, f"{league}.{view}.json")
+
+
+def normalize_team(team):
+    return TEAM_NAME_MAP.get(team, team)
+
+
+def project_match(m: dict) -> dict:
+    """按 MATCH_FIELDS 输出一场比赛，队名归一化"""
+    row = {k: m.get(k) for k in MATCH_FIELDS}
+    row["HomeTeam"] = normalize_team(row["HomeTeam"])
+    row["AwayTeam"] = normalize_team(row["AwayTeam"])
+    return row
+
+
+# ---------- 序列化：与 json.dump(indent=2) 输出一致，同时记录每条记录的字节区间 ----------
+
+def _dump_records(matches: list[dict]) -> tuple[bytes, list[list[int]]]:
+    if not matches:
+        return b"[]", []
+
+    chunks = [b"[\n"]
+    offsets = []
+    pos = 2
+    for i, m in enumerate(matches):
+        text = json.dumps(m, ensure_ascii=False, indent=2)
+        chunk = "\n".join("  " + line for line in text.split("\n")).encode("utf-8")
+        if i:
+            chunks.append(b",\n")
+            pos += 2
+        # 跳过行首缩进，区间正好是一个 JSON 对象
+        offsets.append([pos + 2, pos + len(chunk)])
+        chunks.append(chunk)
+        pos += len(chunk)
+    chunks.append(b"\n]")
+    return b"".join(chunks), offsets
+
+
+def _scan_records(text: str) -> tuple[list[dict], list[list[int]]]:
+    """逐条解析 JSON 数组，顺带算出每条记录在 UTF-8 文件里的字节区间"""
+    decoder = json.JSONDecoder()
+    matches = []
+    offsets = []
+
+    i = text.index("[") + 1
+    char_pos = 0
+    byte_pos = 0
+    n = len(text)
+    while True:
+        while i < n and text[i] in " \t\r\n,":
+            i += 1
+        if i >= n or text[i] == "]":
+            break
+        m, end = decoder.raw_decode(text, i)
+
+        byte_pos += len(text[char_pos:i].encode("utf-8"))
+        start_byte = byte_pos
+        byte_pos += len(text[i:end].encode("utf-8"))
+        char_pos = end
+
+        matches.append(m)
+        offsets.append([start_byte, byte_pos])
+        i = end
+    return matches, offsets
+
+
+# ---------- 快照编码 ----------
+# json：indent=2 的记录数组（旧格式），可以按 sidecar 索引只读单条记录
+# gzip / zstd：{"fields": [...], "rows": [[...], ...]} 紧凑列式 JSON 再压缩
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def _league_codec(raw: bytes) -> str:
+    if raw[:2] == _GZIP_MAGIC:
+        return "gzip"
+    if raw[:4] == _ZSTD_MAGIC:
+        return "zstd"
+    return "json"
+
+
+def _require_zstd():
+    if zstd is None:
+        raise RuntimeError("zstd codec requires the zstandard package")
+    return zstd
+
+
+def _encode_league(matches: list[dict], codec: str) -> tuple[bytes, list[list[int]] | None]:
+    """返回 (字节, 每条记录的字节区间)；压缩格式没有区间"""
+    if codec == "json":
+        return _dump_records(matches)
+    if codec not in LEAGUE_CODECS:
+        raise ValueError(f"unknown league codec: {codec}")
+
+    fields = []
+    for m in matches:
+        for k in m:
+            if k not in fields:
+                fields.append(k)
+    doc = {"fields": fields, "rows": [[m.get(k) for k in fields] for m in matches]}
+    raw = json.dumps(doc, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    if codec == "gzip":
+        return gzip.compress(raw), None
+    return _require_zstd().ZstdCompressor().compress(raw), None
+
+
+def _decode_columns(raw: bytes) -> tuple[list[str], list[list]]:
+    """压缩快照 -> (fields, rows)"""
+    if _league_codec(raw) == "gzip":
+        raw = gzip.decompress(raw)
+    else:
+        raw = _require_zstd().ZstdDecompressor().decompress(raw)
+    doc = json.loads(raw.decode("utf-8"))
+    return doc["fields"], doc["rows"]
+
+
+def _decode_league(raw: bytes) -> list[dict]:
+    if _league_codec(raw) == "json":
+        return json.loads(raw.decode("utf-8"))
+    fields, rows = _decode_columns(raw)
+    return [dict(zip(fields, row)) for row in rows]
+
+
+# ---------- team -> 字节区间 sidecar 索引 ----------
+
+def _build_index(matches: list[dict], offsets: list[list[int]]) -> dict:
+    teams = {}
+    for m, span in zip(matches, offsets):
+        home = normalize_team(m.get("HomeTeam"))
+        away = normalize_team(m.get("AwayTeam"))
+        teams.setdefault(home, []).append(span)
+        if away != home:
+            teams.setdefault(away, []).append(span)
+    return teams
+
+
+def _write_index(league: str, teams: dict) -> None:
+    st = os.stat(league_path(league))
+    index = {
+        "version": INDEX_VERSION,
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "teams": teams,
+    }
+    tmp = index_path(league) + ".tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False)
+        os.replace(tmp, index_path(league))
+    except OSError:
+        # 只读目录下索引只是加速手段，写不了就算了
+        pass
+
+
+def _read_index(league: str, st: os.stat_result):
+    """索引不存在或与数据文件不一致时返回 None"""
+    try:
+        with open(index_path(league), "r", encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if (
+        index.get("version") != INDEX_VERSION
+        or index.get("size") != st.st_size
+        or index.get("mtime_ns") != st.st_mtime_ns
+    ):
+        return None
+    return index
+
+
+def _read_spans(league: str, spans: list[list[int]]) -> list[dict]:
+    rows = []
+    with open(league_path(league), "rb") as f:
+        for start, end in spans:
+            f.seek(start)
+            rows.append(json.loads(f.read(end - start)))
+    return rows
+
+
+def _iter_spans(league: str, spans: list[list[int]]):
+    """_read_spans 的逐条版本"""
+    with open(league_path(league), "rb") as f:
+        for start, end in spans:
+            f.seek(start)
+            yield json.loads(f.read(end - start))
+
+
+# ---------- 追加式变更日志 ----------
+# 每行一条：{"op": "add" | "update" | "delete", "match_id": ..., "match": {...}}
+# 重放是幂等的：add 遇到已存在的 match_id 视为覆盖，update / delete 找不到就跳过
+
+def _read_log_file(path: str) -> list[dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return []
+
+    entries = []
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            entries.append(json.loads(line))
+        except ValueError:
+            # 写了一半的尾行，忽略
+            break
+    return entries
+
+
+def read_log(league: str) -> list[dict]:
+    """正在合并的旧日志在前，新日志在后"""
+    return _read_log_file(_compacting_path(league)) + _read_log_file(log_path(league))
+
+
+def apply_log(matches: list[dict], entries: list[dict], team: str = None) -> list[dict]:
+    """
+    把变更日志重放到记录列表上
+    team 不为空时 matches 只是该队的记录，日志也只取与该队相关的部分
+    """
+    if not entries:
+        return matches
+
+    matches = list(matches)
+    pos = {str(m.get("match_id")): i for i, m in enumerate(matches)}
+
+    for e in entries:
+        op = e.get("op")
+        match_id = str(e.get("match_id"))
+        m = e.get("match")
+        i = pos.get(match_id)
+
+        if op != "delete" and team is not None and team not in (
+            normalize_team(m.get("HomeTeam")),
+            normalize_team(m.get("AwayTeam")),
+        ):
+            op = "delete"
+
+        if op == "delete":
+            if i is not None:
+                matches[i] = None
+                del pos[match_id]
+        elif i is not None:
+            matches[i] = m
+        elif op == "add":
+            pos[match_id] = len(matches)
+            matches.append(m)
+
+    return [m for m in matches if m is not None]
+
+
+def overlay_log(rows, entries: list[dict], team: str = None):
+    """
+    apply_log 的流式版本：日志按 match_id 分组，逐行叠加，不持有整个列表
+    基础记录保持原顺序，日志新增的记录排在最后
+    """
+    by_id = {}
+    for e in entries:
+        by_id.setdefault(str(e.get("match_id")), []).append(e)
+
+    for m in rows:
+        pending = by_id.pop(str(m.get("match_id")), None)
+        if pending is None:
+            yield m
+        else:
+            yield from apply_log([m], pending, team)
+
+    for pending in by_id.values():
+        yield from apply_log([], pending, team)
+
+
+def _append_part(league: str, op: str, match_id, match: dict = None) -> None:
+    """O(1) 写入一条变更，超过阈值时触发合并"""
+    entry = {"op": op, "match_id": str(match_id)}
+    if match is not None and op != "delete":
+        entry["match"] = match
+    _append_entries(league, [entry])
+
+
+@contextmanager
+def _log_lock(league: str):
+    """
+    同一联赛（分区）的追加、合并、整表写回和视图更新互斥
+    文件锁：进程内的线程之间、共用 DATA_DIR 的实例之间都生效
+    """
+    with open(_lock_path(league), "a+") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _append_entries(league: str, entries: list[dict]) -> None:
+    """一次 write 追加若干条变更，超过阈值时触发合并"""
+    path = log_path(league)
+    with _log_lock(league):
+        before = _data_stamp(league) if os.path.exists(league_path(league)) else None
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(e, ensure_ascii=False) + "\n" for e in entries))
+        if before is not None:
+            _advance_views(league, before, entries)
+        size = os.path.getsize(path)
+
+    if size >= LOG_COMPACT_BYTES:
+        compact(league)
+
+
+def compact(league: str) -> None:
+    """
+    把变更日志合并回基础快照
+    先把日志改名再合并，中途退出时下次从改了名的日志接着合并；合并期间的追加等锁释放后写入新日志
+    """
+    with _log_lock(league):
+        # 合并不改变内容，合并前一致的视图换上新的数据戳即可
+        views = _current_views(league)
+
+        pending = _compacting_path(league)
+        if not os.path.exists(pending):
+            try:
+                os.replace(log_path(league), pending)
+            except FileNotFoundError:
+                return
+
+        matches = apply_log(_load_base(league), _read_log_file(pending))
+        _write_base(league, matches)
+        os.remove(pending)
+
+        for view, state in views.items():
+            _save_view(league, view, state)
+
+
+# ---------- 读写 ----------
+
+def _load_base(league: str) -> list[dict]:
+    json_path = league_path(league)
+
+    if not os.path.exists(json_path):
+        raise FileNotFoundError(f"league data not found: {league}")
+
+    with open(json_path, "rb") as f:
+        return _decode_league(f.read())
+
+
+def _write_base(league: str, matches: list[dict], codec: str = None) -> None:
+    old_path = league_path(league)
+    if codec is None:
+        # 不指定时沿用现有快照的编码，只有迁移会换编码
+        codec = next(
+            (c for c in LEAGUE_CODECS if old_path == _base_path(league, c) and os.path.exists(old_path)),
+            LEAGUE_CODEC
+        )
+    raw, offsets = _encode_league(matches, codec)
+    json_path = _base_path(league, codec)
+
+    tmp = json_path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(raw)
+    os.replace(tmp, json_path)
+
+    _FRAME_CACHE.pop(json_path, None)
+    if old_path != json_path:
+        # 换了编码：删掉旧后缀的快照
+        _FRAME_CACHE.pop(old_path, None)
+        try:
+            os.remove(old_path)
+        except FileNotFoundError:
+            pass
+    if offsets is not None:
+        _write_index(league, _build_index(matches, offsets))
+        return
+    # 压缩快照不能按区间读，删掉旧索引
+    try:
+        os.remove(index_path(league))
+    except OSError:
+        pass
+
+
+def _save_part(league: str, matches: list[dict], codec: str = None) -> None:
+    """整表写回，重建 sidecar 索引并清空变更日志；物化视图下次读取时重建"""
+    with _log_lock(league):
+        _write_base(league, matches, codec)
+        for path in (_compacting_path(league), log_path(league)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        _drop_views(league)
+
+
+def _remove_part(league: str) -> None:
+    with _log_lock(league):
+        for path in (
+            *(_base_path(league, codec) for codec in LEAGUE_CODECS), index_path(league),
+            _compacting_path(league), log_path(league),
+        ):
+            _FRAME_CACHE.pop(path, None)
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        _drop_views(league)
+
+
+# ---------- 按赛季分区 ----------
+# 分区联赛：DATA_DIR/{league}/{season}.json，每个分区有自己的索引和变更日志
+# DATA_DIR/{league}/_partitions.json 记录每个赛季出场的球队，查询时据此剪枝
+# 未分区的联赛仍是单个 DATA_DIR/{league}.json，两种布局对外接口一致
+
+def season_of(date) -> str:
+    """
+    赛季从 7 月开始：2024-08-10 -> "2024-2025"，2025-03-01 -> "2024-2025"
+    支持 YYYY-MM-DD 与 dd/mm/yy(yy)，无法识别的归到 "unknown"
+    """
+    try:
+        date = str(date)
+        if "/" in date:
+            _, month, year = date.split("/")
+            year = int(year)
+            if year < 100:
+                year += 2000
+        else:
+            year, month = date.split("-")[:2]
+            year = int(year)
+        month = int(month)
+    except ValueError:
+        return "unknown"
+
+    start = year if month >= 7 else year - 1
+    return f"{start}-{start + 1}"
+
+
+def date_key(date) -> str:
+    """dd/mm/yy(yy) 转成 YYYY-MM-DD，保证按字符串排序就是按日期排序"""
+    date = "" if date is None else str(date)
+    if "/" in date:
+        try:
+            day, month, year = date.split("/")
+            year = int(year)
+            if year < 100:
+                year += 2000
+            return f"{year:04d}-{int(month):02d}-{int(day):02d}"
+        except ValueError:
+            pass
+    return date
+
+
+def partition_name(league: str, season: str) -> str:
+    """分区可以直接当作联赛名传给上面的读写函数"""
+    return f"{league}/{season}"
+
+
+def read_partitions(league: str):
+    """{season: [球队...]}，未分区的联赛返回 None"""
+    try:
+        with open(manifest_path(league), "r", encoding="utf-8") as f:
+            return json.load(f)["partitions"]
+    except FileNotFoundError:
+        return None
+
+
+def _write_partitions(league: str, partitions: dict) -> None:
+    path = manifest_path(league)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"version": 1, "partitions": partitions}, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def _team_set(matches: list[dict]) -> list[str]:
+    teams = set()
+    for m in matches:
+        teams.add(normalize_team(m.get("HomeTeam")))
+        teams.add(normalize_team(m.get("AwayTeam")))
+    teams.discard(None)
+    return sorted(teams)
+
+
+def league_exists(league: str) -> bool:
+    return os.path.exists(league_path(league)) or read_partitions(league) is not None
+
+
+def _parts(league: str, team: str = None, date: str = None) -> list[str]:
+    """需要读取的分区；传入 team / date 时跳过不可能包含结果的赛季"""
+    partitions = read_partitions(league)
+    if partitions is None:
+        return [league]
+
+    seasons = sorted(partitions)
+    if date:
+        seasons = [s for s in seasons if s == season_of(date)]
+    if team is not None:
+        seasons = [s for s in seasons if team in partitions[s]]
+    return [partition_name(league, s) for s in seasons]
+
+
+def _save_partitioned(league: str, matches: list[dict], codec: str = None) -> None:
+    by_season = {}
+    for m in matches:
+        by_season.setdefault(season_of(m.get("Date")), []).append(m)
+
+    os.makedirs(os.path.join(DATA_DIR, league), exist_ok=True)
+    for season in read_partitions(league) or {}:
+        if season not in by_season:
+            _remove_part(partition_name(league, season))
+    for season, rows in by_season.items():
+        _save_part(partition_name(league, season), rows, codec)
+
+    _write_partitions(league, {s: _team_set(rows) for s, rows in by_season.items()})
+
+
+def partition_league(league: str, codec: str = None) -> bool:
+    """把单文件联赛按赛季拆分，变更日志一并合并；已经分区时返回 False"""
+    if read_partitions(league) is not None:
+        return False
+    _save_partitioned(league, load_league(league), codec)
+    _remove_part(league)
+    return True
+
+
+def save_season(league: str, season: str, matches: list[dict], codec: str = None) -> None:
+    """
+    整季写入一个分区并登记到分区元数据，批量生成 / 导入时逐季写，不用把整个联赛放在内存里
+    单文件联赛请先 partition_league
+    """
+    if os.path.exists(league_path(league)):
+        raise ValueError(f"league {league} is not partitioned")
+
+    os.makedirs(os.path.join(DATA_DIR, league), exist_ok=True)
+    _save_part(partition_name(league, season), matches, codec)
+
+    partitions = read_partitions(league) or {}
+    partitions[season] = _team_set(matches)
+    _write_partitions(league, partitions)
+
+
+def _route(league: str, partitions: dict, match: dict) -> str:
+    """
+    单场比赛写入所属赛季的分区
+    新赛季或新球队先登记到分区元数据，保证剪枝时不会漏掉
+    """
+    season = season_of(match.get("Date"))
+    part = partition_name(league, season)
+
+    teams = set(partitions.get(season, []))
+    new_teams = {normalize_team(match.get("HomeTeam")), normalize_team(match.get("AwayTeam"))} - teams
+    if season not in partitions:
+        _write_base(part, [])
+    if new_teams:
+        partitions[season] = sorted(teams | new_teams)
+        _write_partitions(league, partitions)
+    return part
+
+
+# ---------- 对外接口：两种布局通用 ----------
+
+def load_league(league: str) -> list[dict]:
+    """完整的联赛记录：基础快照 + 变更日志，分区联赛按赛季顺序拼接"""
+    matches = []
+    for part in _parts(league):
+        matches.extend(apply_log(_load_base(part), read_log(part)))
+    return matches
+
+
+def save_league(league: str, matches: list[dict], codec: str = None) -> None:
+    """整表写回，分区联赛按赛季重新分区"""
+    if read_partitions(league) is None:
+        _save_part(league, matches, codec)
+    else:
+        _save_partitioned(league, matches, codec)
+
+
+def append_log(league: str, op: str, match_id, match: dict = None) -> None:
+    """
+    写入一条单场变更
+    分区联赛按 match 的日期路由；删除时不带 match 就写到每个分区（删除是幂等的）
+    """
+    partitions = read_partitions(league)
+    if partitions is None:
+        _append_part(league, op, match_id, match)
+    elif match is not None:
+        _append_part(_route(league, partitions, match), op, match_id, match)
+    else:
+        for part in _parts(league):
+            _append_part(part, op, match_id)
+
+
+def add_matches(league: str, matches: list[dict]) -> None:
+    """
+    批量新增比赛（已带 match_id）：按日期路由后每个分区一次追加到变更日志，再合并回快照
+    不整表写回，期间别处追加的变更不会被覆盖
+    """
+    partitions = read_partitions(league)
+    by_part = {}
+    for m in matches:
+        part = league if partitions is None else _route(league, partitions, m)
+        by_part.setdefault(part, []).append({"op": "add", "match_id": str(m["match_id"]), "match": m})
+    for part, entries in by_part.items():
+        _append_entries(part, entries)
+        compact(part)
+
+
+def migrate(league: str, codec: str = None) -> None:
+    """把快照改写成 codec（默认 LEAGUE_CODEC）编码，变更日志一并合并"""
+    save_league(league, load_league(league), codec or LEAGUE_CODEC)
+
+
+def list_leagues() -> list[str]:
+    leagues = set()
+    for name in os.listdir(DATA_DIR):
+        if name.endswith(tuple(LEAGUE_SUFFIXES.values())) and not name.endswith(
+            (".index.json",) + tuple(f".{view}.json" for view in VIEW_NAMES)
+        ):
+            leagues.add(name[:name.rindex(".json")])
+        elif os.path.exists(manifest_path(name)):
+            leagues.add(name)
+    return sorted(leagues)
+
+
+def _build_frame(matches: list[dict], fields: list[str] = None) -> pd.DataFrame:
+    """
+    把联赛记录转成列式 DataFrame
+    - matches 可以是记录字典，也可以是与 fields 对应的行数组（列式快照）
+    - 队名只在这里归一化一次
+    - HomeTeam / AwayTeam 共用一套 category，查询时比较整数编码
+    """
+    if fields is None:
+        frame = pd.DataFrame.from_records(matches, columns=MATCH_FIELDS)
+    else:
+        frame = pd.DataFrame(matches, columns=fields).reindex(columns=MATCH_FIELDS)
+    frame["HomeTeam"] = frame["HomeTeam"].map(normalize_team)
+    frame["AwayTeam"] = frame["AwayTeam"].map(normalize_team)
+
+    # object 列保证 to_dict 返回原生 int / str，缺失值统一成 None
+    frame = frame.astype(object).where(frame.notna(), None)
+
+    teams = pd.unique(
+        pd.concat([frame["HomeTeam"], frame["AwayTeam"]]).dropna()
+    )
+    team_dtype = pd.CategoricalDtype(categories=teams)
+    frame["HomeTeam"] = frame["HomeTeam"].astype(team_dtype)
+    frame["AwayTeam"] = frame["AwayTeam"].astype(team_dtype)
+    return frame
+
+
+def _cached_frame(json_path: str, st: os.stat_result):
+    cached = _FRAME_CACHE.get(json_path)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+    return None
+
+
+def load_league_frame(league: str) -> pd.DataFrame:
+    """
+    读取基础快照的列式数据，按 (path, mtime, size) 失效
+    不含变更日志；全量解析时顺带把 sidecar 索引补上
+    """
+    json_path = league_path(league)
+
+    if not os.path.exists(json_path):
+        raise FileNotFoundError(f"league data not found: {league}")
+
+    st = os.stat(json_path)
+    frame = _cached_frame(json_path, st)
+    if frame is not None:
+        return frame
+
+    with open(json_path, "rb") as f:
+        raw = f.read()
+
+    if _league_codec(raw) != "json":
+        # 列式快照直接按行数组建表，不经过字典
+        fields, rows = _decode_columns(raw)
+        frame = _build_frame(rows, fields)
+        _FRAME_CACHE[json_path] = (st.st_mtime_ns, st.st_size, frame)
+        return frame
+
+    matches, offsets = _scan_records(raw.decode("utf-8"))
+    frame = _build_frame(matches)
+    _FRAME_CACHE[json_path] = (st.st_mtime_ns, st.st_size, frame)
+
+    if _read_index(league, st) is None:
+        _write_index(league, _build_index(matches, offsets))
+    return frame
+
+
+def team_mask(frame: pd.DataFrame, team_en: str) -> np.ndarray:
+    """主队或客队为 team_en 的布尔掩码"""
+    categories = frame["HomeTeam"].cat.categories
+    if team_en not in categories:
+        return np.zeros(len(frame), dtype=bool)
+
+    code = categories.get_loc(team_en)
+    return (
+        (frame["HomeTeam"].cat.codes.to_numpy() == code)
+        | (frame["AwayTeam"].cat.codes.to_numpy() == code)
+    )
+
+
+def team_matches(league: str, team_en: str, date: str = None) -> list[dict]:
+    """
+    单队查询，分区联赛只读该队出场过的赛季（传 date 时只读该日期所在赛季）
+    """
+    if not league_exists(league):
+        raise FileNotFoundError(f"league data not found: {league}")
+
+    rows = []
+    for part in _parts(league, team_en, date):
+        rows.extend(_team_matches_part(part, team_en))
+    return rows
+
+
+def _team_matches_part(league: str, team_en: str) -> list[dict]:
+    """
+    单个快照内的单队查询
+    1. 热实例：列式缓存 + 掩码
+    2. 冷实例：sidecar 索引，只读该队的记录
+    3. 都没有：全量解析，建缓存和索引
+    最后叠加变更日志中与该队相关的记录
+    """
+    json_path = league_path(league)
+
+    if not os.path.exists(json_path):
+        raise FileNotFoundError(f"league data not found: {league}")
+
+    st = os.stat(json_path)
+    frame = _cached_frame(json_path, st)
+
+    if frame is None:
+        index = _read_index(league, st)
+        if index is not None:
+            rows = _read_spans(league, index["teams"].get(team_en, []))
+            rows = apply_log(rows, read_log(league), team_en)
+            return [project_match(m) for m in rows]
+        frame = load_league_frame(league)
+
+    rows = frame[team_mask(frame, team_en)].to_dict("records")
+    entries = read_log(league)
+    if entries:
+        rows = [project_match(m) for m in apply_log(rows, entries, team_en)]
+    return rows
+
+
+def _iter_team_part(league: str, team_en: str):
+    """单个快照内逐行产出单队记录；冷实例按 sidecar 索引逐条读，不解析整份快照"""
+    json_path = league_path(league)
+
+    if not os.path.exists(json_path):
+        raise FileNotFoundError(f"league data not found: {league}")
+
+    st = os.stat(json_path)
+    if _cached_frame(json_path, st) is None:
+        index = _read_index(league, st)
+        if index is not None:
+            rows = _iter_spans(league, index["teams"].get(team_en, []))
+            for m in overlay_log(rows, read_log(league), team_en):
+                yield project_match(m)
+            return
+
+    yield from _team_matches_part(league, team_en)
+
+
+def iter_team_matches(league: str, team_en: str, date: str = None, descending: bool = False):
+    """
+    team_matches 的生成器版本：分区按赛季顺序逐个读取（descending 时倒序）
+    "unknown" 分区的日期归不进赛季，与各赛季没有先后关系，总是最先读取
+    消费方提前停止时，后面的赛季不会被读取
+    """
+    if not league_exists(league):
+        raise FileNotFoundError(f"league data not found: {league}")
+
+    parts = _parts(league, team_en, date)
+    if descending:
+        parts = parts[::-1]
+    unknown = partition_name(league, "unknown")
+    if unknown in parts:
+        parts.remove(unknown)
+        parts.insert(0, unknown)
+    for part in parts:
+        yield from _iter_team_part(part, team_en)
+
+
+def is_partitioned(league: str) -> bool:
+    return read_partitions(league) is not None
+
+
+# ---------- 物化视图 ----------
+# DATA_DIR/{league}.{view}.json，与快照（分区联赛为每个赛季分区）一一对应，
+# stamp 为对应的数据戳 [快照大小, 快照 mtime_ns, 合并中日志大小, 日志大小]
+# 每写一条变更就按日志语义重放到视图上；stamp 之后又追加的日志读取时补上，
+# 快照被整表改写（save_league、迁移等）后才全量重建
+
+
+def _file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def _data_stamp(league: str) -> list:
+    st = os.stat(league_path(league))
+    return [
+        st.st_size, st.st_mtime_ns,
+        _file_size(_compacting_path(league)), _file_size(log_path(league)),
+    ]
+
+
+def _read_view(league: str, view: str):
+    try:
+        with open(view_path(league, view), "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return state if state.get("version") == VIEW_VERSION else None
+
+
+def _save_view(league: str, view: str, state: dict) -> None:
+    state["version"] = VIEW_VERSION
+    state["stamp"] = _data_stamp(league)
+    _VIEW_CACHE[(league, view)] = state
+
+    tmp = view_path(league, view) + ".tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, view_path(league, view))
+    except OSError:
+        # 与 sidecar 索引一样，写不了只是下次要重新计算
+        pass
+
+
+def _drop_views(league: str) -> None:
+    for view in VIEW_NAMES:
+        _VIEW_CACHE.pop((league, view), None)
+        try:
+            os.remove(view_path(league, view))
+        except FileNotFoundError:
+            pass
+
+
+def _stamped_view(league: str, view: str, stamp: list):
+    """进程内缓存或文件里数据戳为 stamp 的视图"""
+    state = _VIEW_CACHE.get((league, view))
+    if state is None or state.get("stamp") != stamp:
+        state = _read_view(league, view)
+        if state is None or state.get("stamp") != stamp:
+            return None
+        _VIEW_CACHE[(league, view)] = state
+    return state
+
+
+def _current_views(league: str) -> dict:
+    """{视图名: 与当前数据一致的状态}"""
+    if not os.path.exists(league_path(league)):
+        return {}
+    stamp = _data_stamp(league)
+    views = {view: _stamped_view(league, view, stamp) for view in VIEW_NAMES}
+    return {view: state for view, state in views.items() if state is not None}
+
+
+def _advance_views(league: str, before: list, entries: list[dict]) -> None:
+    """写入变更后增量更新；写入前就已过期的视图留给读取时处理"""
+    for view in VIEW_NAMES:
+        state = _stamped_view(league, view, before)
+        if state is not None:
+            for entry in entries:
+                VIEWS[view][1](state, entry)
+            _save_view(league, view, state)
+
+
+def _catch_up(league: str, view: str, state: dict, stamp: list) -> bool:
+    """快照未变、日志只是变长时，把 stamp 之后的日志补到视图上"""
+    old = state.get("stamp") or []
+    if len(old) != 4 or old[:3] != stamp[:3] or old[3] > stamp[3]:
+        return False
+
+    with open(log_path(league), "rb") as f:
+        f.seek(old[3])
+        tail = f.read(stamp[3] - old[3]).decode("utf-8")
+    if tail and not tail.endswith("\n"):
+        # 尾行还没写完
+        return False
+
+    for line in tail.splitlines():
+        if line.strip():
+            VIEWS[view][1](state, json.loads(line))
+    return True
+
+
+def load_view(league: str, view: str) -> dict:
+    """
+    与当前数据一致的视图状态（单个快照 / 分区）
+    数据戳一致直接返回；只是日志变长就补上新日志；否则全量重建
+    """
+    stamp = _data_stamp(league)
+    state = _stamped_view(league, view, stamp)
+    if state is not None:
+        return state
+
+    # 补日志 / 重建期间不能有写入，否则存下的数据戳会盖住没算进去的变更
+    with _log_lock(league):
+        stamp = _data_stamp(league)
+        state = _stamped_view(league, view, stamp)
+        if state is not None:
+            return state
+
+        state = _VIEW_CACHE.get((league, view)) or _read_view(league, view)
+        if state is None or not _catch_up(league, view, state, stamp):
+            state = VIEWS[view][0](_league_frame_with_log(league))
+        _save_view(league, view, state)
+    return state
+
+
+def _league_frame_with_log(league: str) -> pd.DataFrame:
+    entries = read_log(league)
+    if entries:
+        return _build_frame(apply_log(_load_base(league), entries))
+    return load_league_frame(league)
+
+
+# ---------- 积分榜 ----------
+#   matches：{match_id: [赛季, 日期, 主队, 客队, 主队进球, 客队进球]}，没有比分的比赛为 null
+#   tables：{赛季: {球队: [场次, 胜, 平, 负, 进球, 失球, 积分]}}
+#   form：{赛季: {球队: [[日期, match_id, "W" / "D" / "L"], ...]}}，按日期排序
+
+STANDING_FIELDS = ["played", "won", "drawn", "lost", "goals_for", "goals_against", "points"]
+
+_POINTS = {"W": 3, "D": 1, "L": 0}
+
+
+def _standing_row(m: dict):
+    """一场比赛对积分榜的贡献；没有比分（未开赛）时返回 None"""
+    try:
+        home_goals, away_goals = int(m.get("FTHG")), int(m.get("FTAG"))
+    except (TypeError, ValueError):
+        return None
+    return [
+        season_of(m.get("Date")), date_key(m.get("Date")),
+        normalize_team(m.get("HomeTeam")), normalize_team(m.get("AwayTeam")),
+        home_goals, away_goals,
+    ]
+
+
+def _outcome(goals_for: int, goals_against: int) -> str:
+    if goals_for > goals_against:
+        return "W"
+    return "D" if goals_for == goals_against else "L"
+
+
+def _count_row(state: dict, match_id: str, row: list, sign: int) -> None:
+    """sign 为 1 时计入一场比赛，为 -1 时撤销"""
+    season, date, home, away, home_goals, away_goals = row
+    table = state["tables"].setdefault(season, {})
+    form = state["form"].setdefault(season, {})
+
+    for team, goals_for, goals_against in ((home, home_goals, away_goals), (away, away_goals, home_goals)):
+        outcome = _outcome(goals_for, goals_against)
+        delta = [1, outcome == "W", outcome == "D", outcome == "L", goals_for, goals_against, _POINTS[outcome]]
+        stats = [a + sign * int(b) for a, b in zip(table.get(team, [0] * 7), delta)]
+
+        results = form.setdefault(team, [])
+        if sign > 0:
+            bisect.insort(results, [date, match_id, outcome])
+        else:
+            results.remove([date, match_id, outcome])
+
+        if stats[0]:
+            table[team] = stats
+        else:
+            table.pop(team, None)
+            form.pop(team, None)
+
+    if not table:
+        del state["tables"][season]
+        del state["form"][season]
+
+
+def _apply_standings(state: dict, entry: dict) -> None:
+    """按 apply_log 的语义重放一条变更：add 新增或覆盖，update 只改已有的比赛，delete 幂等"""
+    op = entry.get("op")
+    match_id = str(entry.get("match_id"))
+    if op == "update" and match_id not in state["matches"]:
+        return
+
+    old = state["matches"].pop(match_id, None)
+    if old is not None:
+        _count_row(state, match_id, old, -1)
+    if op == "delete":
+        return
+
+    row = _standing_row(entry.get("match") or {})
+    state["matches"][match_id] = row
+    if row is not None:
+        _count_row(state, match_id, row, 1)
+
+
+def _build_standings(frame: pd.DataFrame) -> dict:
+    """用 pandas 从快照 + 变更日志全量计算积分榜"""
+    home_goals = pd.to_numeric(frame["FTHG"], errors="coerce")
+    away_goals = pd.to_numeric(frame["FTAG"], errors="coerce")
+    scored = (home_goals.notna() & away_goals.notna()).to_numpy()
+
+    match_ids = frame["match_id"].astype(str)
+    seasons = frame["Date"].map(season_of)
+    dates = frame["Date"].map(date_key)
+    home = frame["HomeTeam"].astype(object)
+    away = frame["AwayTeam"].astype(object)
+
+    # 每场比赛拆成主客两行，按 (赛季, 球队) 聚合
+    sides = pd.DataFrame({
+        "season": pd.concat([seasons[scored], seasons[scored]], ignore_index=True),
+        "date": pd.concat([dates[scored], dates[scored]], ignore_index=True),
+        "match_id": pd.concat([match_ids[scored], match_ids[scored]], ignore_index=True),
+        "team": pd.concat([home[scored], away[scored]], ignore_index=True),
+        "goals_for": pd.concat([home_goals[scored], away_goals[scored]], ignore_index=True).astype(int),
+        "goals_against": pd.concat([away_goals[scored], home_goals[scored]], ignore_index=True).astype(int),
+    })
+    diff = sides["goals_for"] - sides["goals_against"]
+    sides["played"] = 1
+    sides["won"] = (diff > 0).astype(int)
+    sides["drawn"] = (diff == 0).astype(int)
+    sides["lost"] = (diff < 0).astype(int)
+    sides["points"] = sides["won"] * 3 + sides["drawn"]
+    sides["outcome"] = np.select([diff > 0, diff == 0], ["W", "D"], "L")
+
+    totals = sides.groupby(["season", "team"], sort=False)[STANDING_FIELDS].sum()
+    tables = {}
+    for (season, team), stats in zip(totals.index, totals.to_numpy().tolist()):
+        tables.setdefault(season, {})[team] = stats
+
+    form = {}
+    ordered = sides.sort_values(["date", "match_id"], kind="stable")
+    for season, team, date, match_id, outcome in zip(
+        ordered["season"], ordered["team"], ordered["date"], ordered["match_id"], ordered["outcome"]
+    ):
+        form.setdefault(season, {}).setdefault(team, []).append([date, match_id, outcome])
+
+    matches = dict.fromkeys(match_ids)
+    for match_id, season, date, h, a, hg, ag in zip(
+        match_ids[scored], seasons[scored], dates[scored], home[scored], away[scored],
+        home_goals[scored].astype(int), away_goals[scored].astype(int),
+    ):
+        matches[match_id] = [season, date, h, a, int(hg), int(ag)]
+
+    return {"matches": matches, "tables": tables, "form": form}
+
+
+def league_standings(league: str, season: str = None) -> tuple:
+    """
+    返回 (赛季, {球队: [场次, 胜, 平, 负, 进球, 失球, 积分]}, {球队: 按日期排序的结果})
+    season 为空时取有比分的最近一个赛季；分区联赛只读该赛季的分区
+    """
+    if not league_exists(league):
+        raise FileNotFoundError(f"league data not found: {league}")
+
+    partitions = read_partitions(league)
+    if partitions is None:
+        state = load_view(league, "standings")
+        if season is None:
+            known = sorted(s for s in state["tables"] if s != "unknown")
+            season = known[-1] if known else None
+        return season, state["tables"].get(season, {}), state["form"].get(season, {})
+
+    # 只有未来赛程的赛季（分区里还没有比分）不算最近的赛季
+    seasons = [season] if season else sorted((s for s in partitions if s != "unknown"), reverse=True)
+    for s in seasons:
+        if s not in partitions:
+            break
+        state = load_view(partition_name(league, s), "standings")
+        if season or state["tables"].get(s):
+            return s, state["tables"].get(s, {}), state["form"].get(s, {})
+    return season, {}, {}
+
+
+# ---------- 对阵索引 ----------
+#   pairs：{"队A|队B": [match_id, ...]}，两队按名字排序，不分主客
+#   matches：{match_id: 对阵键}，删除 / 修改时据此找到原来的对阵
+
+def pair_key(team_a: str, team_b: str) -> str:
+    return "|".join(sorted((str(team_a), str(team_b))))
+
+
+def _apply_pairs(state: dict, entry: dict) -> None:
+    """按 apply_log 的语义重放一条变更"""
+    op = entry.get("op")
+    match_id = str(entry.get("match_id"))
+    if op == "update" and match_id not in state["matches"]:
+        return
+
+    old = state["matches"].pop(match_id, None)
+    if old is not None:
+        ids = state["pairs"][old]
+        ids.remove(match_id)
+        if not ids:
+            del state["pairs"][old]
+    if op == "delete":
+        return
+
+    m = entry.get("match") or {}
+    key = pair_key(normalize_team(m.get("HomeTeam")), normalize_team(m.get("AwayTeam")))
+    state["matches"][match_id] = key
+    state["pairs"].setdefault(key, []).append(match_id)
+
+
+def _build_pairs(frame: pd.DataFrame) -> dict:
+    home = frame["HomeTeam"].astype(object).astype(str).to_numpy()
+    away = frame["AwayTeam"].astype(object).astype(str).to_numpy()
+    keys = np.where(home <= away, home + "|" + away, away + "|" + home)
+    match_ids = frame["match_id"].astype(str)
+
+    pairs = match_ids.groupby(keys, sort=False).agg(list).to_dict()
+    return {"pairs": pairs, "matches": dict(zip(match_ids, keys.tolist()))}
+
+
+# 视图名 -> (从 DataFrame 全量构建, 重放一条变更)
+VIEWS = {
+    "standings": (_build_standings, _apply_standings),
+    "pairs": (_build_pairs, _apply_pairs),
+}
+
+
+def pair_matches(league: str, team_a: str, team_b: str) -> list[dict]:
+    """
+    两队之间的全部比赛（规范队名，不分主客），按日期排序
+    分区联赛只读两队都出场过、且对阵索引里有这组对阵的赛季，再按 match_id 取记录
+    """
+    if not league_exists(league):
+        raise FileNotFoundError(f"league data not found: {league}")
+
+    key = pair_key(team_a, team_b)
+    parts = set(_parts(league, team_b))
+    rows = []
+    for part in _parts(league, team_a):
+        if part not in parts:
+            continue
+        ids = set(load_view(part, "pairs")["pairs"].get(key, []))
+        if ids:
+            rows.extend(m for m in _team_matches_part(part, team_a) if str(m.get("match_id")) in ids)
+
+    rows.sort(key=lambda m: (date_key(m.get("Date")), str(m.get("match_id"))))
+    return rows
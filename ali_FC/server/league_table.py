@@ -0,0 +1,79 @@
+import json
+from typing import Optional
+
+from league_store import STANDING_FIELDS, league_standings
+from team_alias import resolve_team
+from timing import enable_timing, span, timed
+
+# 近况显示最近几场
+FORM_LENGTH = 5
+
+
+def rank_table(table: dict, form: dict, form_length: int = FORM_LENGTH) -> list[dict]:
+    """按 积分 > 净胜球 > 进球 > 队名 排名；form 为最近几场的 W/D/L，时间从早到晚"""
+    rows = []
+    for team, stats in table.items():
+        row = {"team": team, **dict(zip(STANDING_FIELDS, stats))}
+        row["goal_difference"] = row["goals_for"] - row["goals_against"]
+        row["form"] = "".join(r[2] for r in form.get(team, [])[-form_length:])
+        rows.append(row)
+
+    rows.sort(key=lambda r: (-r["points"], -r["goal_difference"], -r["goals_for"], r["team"]))
+    return [{"position": i, **row} for i, row in enumerate(rows, 1)]
+
+
+def league_table(
+    league: str,
+    season: Optional[str] = None,
+    team: Optional[str] = None,
+):
+    """
+    联赛积分榜，读取物化好的结果，不重新扫描比赛
+    season 形如 2024-2025，默认最近的赛季；传 team 时只返回该队所在的一行
+    """
+    with span("load"):
+        season, table, form = league_standings(league, season)
+
+    with span("rank"):
+        rows = rank_table(table, form)
+
+    if team:
+        with span("resolve"):
+            team_en = resolve_team(team) or team
+        rows = [r for r in rows if r["team"] == team_en]
+        if not rows:
+            return {"error": f"{season} 赛季 {league} 积分榜中没有球队：{team}"}
+
+    return {"league": league, "season": season, "table": rows}
+
+
+@timed("league_table")
+def handler(event, context):
+    """FC 事件函数入口"""
+    try:
+        body_bytes = event if isinstance(event, bytes) else event.get("body", b"")
+        body_str = body_bytes.decode("utf-8") if isinstance(body_bytes, bytes) else body_bytes
+        body = json.loads(body_str)
+        enable_timing(body)
+
+        league = body.get("league")
+        if not league:
+            return {
+                "statusCode": 400,
+                "body": json.dumps({"error": "missing required params: league"}, ensure_ascii=False)
+            }
+
+        result = league_table(league, season=body.get("season"), team=body.get("team"))
+
+        with span("serialize"):
+            payload = json.dumps(result, ensure_ascii=False)
+        return {
+            "statusCode": 200,
+            "body": payload
+        }
+
+    except Exception as e:
+        return {
+            "statusCode": 500,
+            "body": json.dumps({"error": str(e)}, ensure_ascii=False)
+        }
@@ -1,8 +1,25 @@
 import json
+import hashlib
 
+from timing import enable_timing, span, timed
+
+# 与 league_store.MATCH_FIELDS 一致，list_tools 单独部署不依赖 league_store
+MATCH_FIELDS = [
+    "Div", "Date", "Time", "HomeTeam", "AwayTeam",
+    "FTHG", "FTAG", "FTR", "HTHG", "HTAG", "HTR",
+    "HS", "AS", "HST", "AST", "HF", "AF", "HC", "AC",
+    "HY", "AY", "HR", "AR", "match_id",
+]
+
+def schema_version(tools: list) -> str:
+    raw = json.dumps(tools, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()[:16]
+
+@timed("list_tools")
 def handler(event, context):
     """
-    MCP list_tools: 返回所有可用工具的 schema
+    MCP list_tools: 返回所有可用工具的 schema 及其版本
+    请求里带上客户端缓存的 version 且未变化时只返回 not_modified
     """
     tools = [
         {
@@ -35,6 +52,34 @@ def handler(event, context):
                     "team": {
                         "type": "string",
                         "description": "The name of the football team"
+                    },
+                    "fields": {
+                        "type": "array",
+                        "items": {
+                            "type": "string",
+                            "enum": MATCH_FIELDS
+                        },
+                        "description": (
+                            "Only return these columns, e.g. ['Date', 'HomeTeam', 'AwayTeam', 'FTHG', 'FTAG']. "
+                            "Include 'Div' and 'match_id' (plus 'HomeTeam' and 'Date' for a faster lookup) if the matches will be changed or deleted later. Default: all columns"
+                        )
+                    },
+                    "compact": {
+                        "type": "boolean",
+                        "description": "Return {fields, rows} with the column names listed once instead of one object per match"
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Page size (1-1000). When given, matches are sorted by date and a next_cursor is returned"
+                    },
+                    "cursor": {
+                        "type": "string",
+                        "description": "The next_cursor from the previous page"
+                    },
+                    "order": {
+                        "type": "string",
+                        "enum": ["asc", "desc"],
+                        "description": "Date order of paged results, default asc"
                     }
                 },
                 "required": ["league", "team"]
@@ -42,16 +87,24 @@ def handler(event, context):
         },
         {
             "name": "query_matches",
-            "description": "Filter matches according to date, result, and whether the team is home or away.",
+            "description": (
+                "Filter matches according to date, result, and whether the team is home or away. "
+                "Prefer passing league instead of matches: the team's matches are then loaded and "
+                "filtered on the server, so load_team_matches is not needed."
+            ),
             "parameters": {
                 "type": "object",
                 "properties": {
+                    "league": {
+                        "type": "string",
+                        "description": "League code such as 'E0', 'D1'; query the stored matches of the team in this league"
+                    },
                     "matches": {
                         "type": "array",
                         "items": {
                             "type": "object"
                         },
-                        "description": "A list of matches returned by load_team_matches"
+                        "description": "A list of matches returned by load_team_matches; only needed when league is not given"
                     },
                     "team": {
                         "type": "string",
@@ -70,7 +123,58 @@ def handler(event, context):
                         "description": "Whether the team played at home or away: home or away"
                     }
                 },
-                "required": ["matches", "team"]
+                "required": ["team"]
+            }
+        },
+        {
+            "name": "league_table",
+            "description": (
+                "Return the league standings (position, played, won, drawn, lost, goals, "
+                "goal difference, points and recent form) for a season. "
+                "Use this for table / ranking / points questions instead of loading matches."
+            ),
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "league": {
+                        "type": "string",
+                        "description": "League code such as 'E0', 'D1'"
+                    },
+                    "season": {
+                        "type": "string",
+                        "description": "Season such as '2024-2025' (seasons start in July); defaults to the latest season"
+                    },
+                    "team": {
+                        "type": "string",
+                        "description": "Only return this team's row, with its position in the table"
+                    }
+                },
+                "required": ["league"]
+            }
+        },
+        {
+            "name": "head_to_head",
+            "description": (
+                "Return every match between two teams, oldest first, with a summary of "
+                "wins, draws and goals for each side. Searches every league unless one is given."
+            ),
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "team_a": {
+                        "type": "string",
+                        "description": "The name of the first football team"
+                    },
+                    "team_b": {
+                        "type": "string",
+                        "description": "The name of the second football team"
+                    },
+                    "league": {
+                        "type": "string",
+                        "description": "League code such as 'E0', 'D1'; defaults to every league"
+                    }
+                },
+                "required": ["team_a", "team_b"]
             }
         },
         {
@@ -152,15 +256,61 @@ def handler(event, context):
                 },
                 "required": ["matches"]
             }
+        },
+        {
+            "name": "import_matches",
+            "description": (
+                "Import a football-data.co.uk season CSV (content or URL). "
+                "Matches already stored (same date, home and away team) are skipped."
+            ),
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "csv_text": {
+                        "type": "string",
+                        "description": "Content of a football-data.co.uk season CSV"
+                    },
+                    "url": {
+                        "type": "string",
+                        "description": "URL of a football-data.co.uk season CSV (other hosts are rejected), e.g. https://www.football-data.co.uk/mmz4281/2324/E0.csv"
+                    },
+                    "league": {
+                        "type": "string",
+                        "description": "League code such as 'E0'; overrides the Div column of the CSV"
+                    }
+                },
+                "required": []
+            }
         }
     ]
 
-    return {
-        "statusCode": 200,
-        "body": json.dumps(
+    try:
+        if isinstance(event, (bytes, bytearray)):
+            event = event.decode("utf-8")
+        body = json.loads(event) if isinstance(event, str) and event else event
+        known = body.get("version") if isinstance(body, dict) else None
+    except ValueError:
+        body, known = None, None
+    enable_timing(body)
+
+    with span("version"):
+        version = schema_version(tools)
+
+    if known == version:
+        return {
+            "statusCode": 200,
+            "body": json.dumps({"version": version, "not_modified": True})
+        }
+
+    with span("serialize"):
+        payload = json.dumps(
             {
-                "tools": tools
+                "tools": tools,
+                "version": version
             },
             ensure_ascii=False
         )
+    return {
+        "statusCode": 200,
+        "body": payload
     }
@@ -1,82 +1,176 @@
-import os
+import base64
+import bisect
 import json
 
-from common.utils.Ch2En import TEAM_NAME_MAP
+from league_store import (
+    MATCH_FIELDS, date_key, is_partitioned, iter_team_matches, season_of, team_matches,
+)
+from team_alias import resolve_team
+from timing import enable_timing, span, timed
 
-DATA_DIR = os.environ.get("DATA_DIR", "./test_data")
+PAGE_ORDERS = ("asc", "desc")
+DEFAULT_PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = 1000
+
+
+def _check_fields(fields):
+    if not fields:
+        return MATCH_FIELDS
+    unknown = [f for f in fields if f not in MATCH_FIELDS]
+    if unknown:
+        raise ValueError(f"unknown fields: {unknown}")
+    return fields
+
+
+def _table(matches, fields, compact):
+    if compact:
+        return {
+            "fields": list(fields),
+            "rows": [[m.get(f) for f in fields] for m in matches],
+        }
+    if fields is not MATCH_FIELDS:
+        matches = [{f: m.get(f) for f in fields} for m in matches]
+    return matches
 
 
 def load_team_matches(
     league: str,
-    team: str
-) -> list[dict]:
-    if team in TEAM_NAME_MAP:
-        team_en = TEAM_NAME_MAP[team]
-    else:
-        team_en = team
+    team: str,
+    fields: list[str] = None,
+    compact: bool = False
+) -> list[dict] | dict:
+    """
+    fields：只返回这些列，默认全部 MATCH_FIELDS
+    compact：返回 {"fields": [...], "rows": [[...], ...]}，列名只出现一次
+    """
+    fields = _check_fields(fields)
+    with span("resolve"):
+        team_en = resolve_team(team) or team
+    with span("load"):
+        matches = team_matches(league, team_en)
+    with span("project"):
+        return _table(matches, fields, compact)
 
-    json_path = os.path.join(DATA_DIR, f"{league}.json")
 
-    if not os.path.exists(json_path):
-        raise FileNotFoundError(f"league data not found: {league}")
+# ---------- 分页 ----------
+# 按 (日期, match_id) 排序，游标是上一页最后一条的排序键，FC 实例之间不需要共享状态
 
-    with open(json_path, "r", encoding="utf-8") as f:
-        matches = json.load(f)
+def _sort_key(m: dict) -> tuple:
+    return (date_key(m.get("Date")), str(m.get("match_id")))
 
-    result = []
 
-    for m in matches:
-        home = m.get("HomeTeam")
-        away = m.get("AwayTeam")
+def encode_cursor(order: str, key: tuple) -> str:
+    raw = json.dumps([order, *key], ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
 
-        if home in TEAM_NAME_MAP:
-            home_norm = TEAM_NAME_MAP[home]
-        else:
-            home_norm = home
 
-        if away in TEAM_NAME_MAP:
-            away_norm = TEAM_NAME_MAP[away]
-        else:
-            away_norm = away
-
-        if home_norm == team_en or away_norm == team_en:
-            result.append({
-                "Div": m.get("Div"),
-                "Date": m.get("Date"),
-                "Time": m.get("Time"),
-                "HomeTeam": home_norm,
-                "AwayTeam": away_norm,
-                "FTHG": m.get("FTHG"),
-                "FTAG": m.get("FTAG"),
-                "FTR": m.get("FTR"),
-                "HTHG": m.get("HTHG"),
-                "HTAG": m.get("HTAG"),
-                "HTR": m.get("HTR"),
-                "HS": m.get("HS"),
-                "AS": m.get("AS"),
-                "HST": m.get("HST"),
-                "AST": m.get("AST"),
-                "HF": m.get("HF"),
-                "AF": m.get("AF"),
-                "HC": m.get("HC"),
-                "AC": m.get("AC"),
-                "HY": m.get("HY"),
-                "AY": m.get("AY"),
-                "HR": m.get("HR"),
-                "AR": m.get("AR"),
-                "match_id": m.get("match_id")
-            })
-
-    return result
+def decode_cursor(cursor: str, order: str) -> tuple:
+    try:
+        cursor_order, date, match_id = json.loads(base64.urlsafe_b64decode(cursor))
+    except (ValueError, TypeError):
+        raise ValueError("invalid cursor")
+    if cursor_order != order:
+        raise ValueError(f"cursor was issued for order={cursor_order}")
+    return (date, match_id)
+
+
+def page_matches(rows, limit: int, cursor: str = None, order: str = "asc", by_season: bool = False):
+    """
+    从逐行产出的记录里取游标之后的一页，只保留 limit + 1 条
+    by_season：rows 按赛季顺序产出（分区联赛），凑满一页后读到下一个赛季就停止
+    返回 (page, next_cursor)
+    """
+    desc = order == "desc"
+    after = decode_cursor(cursor, order) if cursor else None
+
+    best = []  # [(key, seq, row)]，升序
+    for seq, m in enumerate(rows):
+        key = _sort_key(m)
+        if after is not None and (key >= after if desc else key <= after):
+            continue
+        if by_season and len(best) > limit:
+            # "unknown" 赛季的记录与各赛季没有先后关系（iter_team_matches 最先产出它们），不据此停止
+            worst = best[0][0] if desc else best[-1][0]
+            season, worst_season = season_of(key[0]), season_of(worst[0])
+            if "unknown" not in (season, worst_season) and (
+                season < worst_season if desc else season > worst_season
+            ):
+                break
+        bisect.insort(best, (key, seq, m))
+        if len(best) > limit + 1:
+            best.pop(0 if desc else -1)
+
+    ordered = best[::-1] if desc else best
+    page = ordered[:limit]
+    next_cursor = encode_cursor(order, page[-1][0]) if len(ordered) > limit else None
+    return [m for _, _, m in page], next_cursor
 
 
+def load_team_page(
+    league: str,
+    team: str,
+    fields: list[str] = None,
+    compact: bool = False,
+    limit: int = None,
+    cursor: str = None,
+    order: str = "asc"
+) -> dict:
+    """
+    分页读取：{"matches": [...] 或 {"fields", "rows"}, "next_cursor": ... | None}
+    把 next_cursor 原样传回即可取下一页，为 None 时已是最后一页
+    """
+    fields = _check_fields(fields)
+    if order not in PAGE_ORDERS:
+        raise ValueError(f"order must be one of {PAGE_ORDERS}")
+    limit = int(limit or DEFAULT_PAGE_LIMIT)
+    if not 0 < limit <= MAX_PAGE_LIMIT:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_LIMIT}")
+
+    with span("resolve"):
+        team_en = resolve_team(team) or team
+    # 分页时读取与排序交织在一起，记为一个阶段
+    with span("scan"):
+        rows = iter_team_matches(league, team_en, descending=order == "desc")
+        try:
+            page, next_cursor = page_matches(
+                rows, limit, cursor, order, by_season=is_partitioned(league)
+            )
+        finally:
+            rows.close()
+    with span("project"):
+        return {"matches": _table(page, fields, compact), "next_cursor": next_cursor}
+
+
+# ---------- NDJSON 流式输出 ----------
+
+def ndjson_lines(league: str, team: str, fields: list[str] = None, compact: bool = False):
+    """
+    逐行产出 NDJSON，内存与首行延迟不随数据量增长
+    compact 时第一行是 {"fields": [...]}，之后每行是一个数组
+    """
+    fields = _check_fields(fields)
+    team_en = resolve_team(team) or team
+    rows = iter_team_matches(league, team_en)
+
+    if compact:
+        yield (json.dumps({"fields": list(fields)}, ensure_ascii=False) + "\n").encode("utf-8")
+    for m in rows:
+        row = [m.get(f) for f in fields] if compact else {f: m.get(f) for f in fields}
+        yield (json.dumps(row, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _read_body(event) -> dict:
+    # event 是 bytes
+    if isinstance(event, (bytes, bytearray)):
+        return json.loads(event.decode("utf-8") or "{}")
+    return event or {}
+
+
+@timed("load_team_matches")
 def handler(event, context):
     try:
-        # event 是 bytes
-        if isinstance(event, (bytes, bytearray)):
-            body = json.loads(event.decode("utf-8") or "{}")
-        else:
-            body = event or {}
+        body = _read_body(event)
+        enable_timing(body)
 
         league = body.get("league")
         team = body.get("team")
@@ -90,14 +184,40 @@ def handler(event, context):
                 )
             }
 
-        matches = load_team_matches(league, team)
+        if body.get("stream"):
+            return {
+                "statusCode": 400,
+                "body": json.dumps(
+                    {"error": "stream is only available through the HTTP trigger (http_handler)"},
+                    ensure_ascii=False
+                )
+            }
 
+        if body.get("limit") or body.get("cursor"):
+            result = load_team_page(
+                league,
+                team,
+                fields=body.get("fields"),
+                compact=bool(body.get("compact")),
+                limit=body.get("limit"),
+                cursor=body.get("cursor"),
+                order=body.get("order") or "asc",
+            )
+        else:
+            result = {
+                "matches": load_team_matches(
+                    league,
+                    team,
+                    fields=body.get("fields"),
+                    compact=bool(body.get("compact")),
+                )
+            }
+
+        with span("serialize"):
+            payload = json.dumps(result, ensure_ascii=False)
         return {
             "statusCode": 200,
-            "body": json.dumps(
-                {"matches": matches},
-                ensure_ascii=False
-            )
+            "body": payload
         }
 
     except Exception as e:
@@ -108,3 +228,42 @@ def handler(event, context):
                 ensure_ascii=False
             )
         }
+
+
+def http_handler(environ, start_response):
+    """
+    HTTP 触发器入口（WSGI），请求体与 handler 相同
+    stream 为真时返回 application/x-ndjson，边读边发；否则与 handler 返回一致
+    """
+    try:
+        length = int(environ.get("CONTENT_LENGTH") or 0)
+        body = _read_body(environ["wsgi.input"].read(length) if length else b"")
+    except ValueError as e:
+        start_response("400 Bad Request", [("Content-Type", "application/json; charset=utf-8")])
+        return [json.dumps({"error": f"invalid request body: {e}"}, ensure_ascii=False).encode("utf-8")]
+
+    if not body.get("stream"):
+        resp = handler(body, None)
+        status = {200: "200 OK", 400: "400 Bad Request"}.get(resp["statusCode"], "500 Internal Server Error")
+        start_response(status, [("Content-Type", "application/json; charset=utf-8")])
+        return [resp["body"].encode("utf-8")]
+
+    league = body.get("league")
+    team = body.get("team")
+    try:
+        if not league or not team:
+            raise ValueError("missing required params: league, team")
+        lines = ndjson_lines(league, team, body.get("fields"), bool(body.get("compact")))
+        # 先取第一行：参数错误和联赛不存在在发出 200 之前暴露
+        first = next(lines, None)
+    except Exception as e:
+        start_response("400 Bad Request", [("Content-Type", "application/json; charset=utf-8")])
+        return [json.dumps({"error": str(e)}, ensure_ascii=False).encode("utf-8")]
+
+    def stream():
+        if first is not None:
+            yield first
+        yield from lines
+
+    start_response("200 OK", [("Content-Type", "application/x-ndjson; charset=utf-8")])
+    return stream()
@@ -0,0 +1,26 @@
+import argparse
+
+from league_store import LEAGUE_CODEC, LEAGUE_CODECS, list_leagues, migrate, partition_league
+
+
+def main():
+    """
+    把 DATA_DIR 下的联赛快照转换成指定编码，变更日志一并合并
+    用法：python migrate_leagues.py [--codec gzip] [--partition] [E0 SP1 ...]
+    --partition 同时把单文件联赛按赛季拆分
+    """
+    parser = argparse.ArgumentParser(description="convert league snapshots to another codec")
+    parser.add_argument("leagues", nargs="*", help="league codes, default: all leagues in DATA_DIR")
+    parser.add_argument("--codec", choices=LEAGUE_CODECS, default=LEAGUE_CODEC)
+    parser.add_argument("--partition", action="store_true", help="split single-file leagues by season")
+    args = parser.parse_args()
+
+    for league in args.leagues or list_leagues():
+        split = args.partition and partition_league(league, args.codec)
+        if not split:
+            migrate(league, args.codec)
+        print(f"{league}: {args.codec}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,22 +2,35 @@ import json
 from typing import List, Dict, Any, Optional
 from common.utils.En2Le import TEAM_NAME_MAP1
 from common.utils.Ch2En import TEAM_NAME_MAP, LEAGUE_NAME_MAP
+from league_store import team_matches
+from team_alias import resolve_team
+from timing import enable_timing, span, timed
 
 def query_matches(
-    matches: List[Dict[str, Any]],
     team: str,
+    matches: Optional[List[Dict[str, Any]]]=None,
     date: Optional[str]=None,
     result: Optional[str]=None,
-    home_or_away: Optional[str]=None
+    home_or_away: Optional[str]=None,
+    league: Optional[str]=None
 ) -> list[dict]:
-    """核心逻辑保持不变"""
-    filtered = []
+    """
+    核心逻辑保持不变
+    不传 matches 而传 league 时，直接在服务端读取该队的比赛再过滤
+    """
+    with span("resolve"):
+        team_en = resolve_team(team) or team
+
+    if matches is None:
+        with span("load"):
+            matches = team_matches(league, team_en, date)
+
+    with span("filter"):
+        return _filter(matches, team_en, date, result, home_or_away)
 
-    if team in TEAM_NAME_MAP:
-        team_en = TEAM_NAME_MAP[team]
-    else:
-        team_en = team
 
+def _filter(matches, team_en, date, result, home_or_away) -> list[dict]:
+    filtered = []
     for m in matches:
         home = m.get("HomeTeam")
         away = m.get("AwayTeam")
@@ -59,6 +72,7 @@ def query_matches(
 
     return filtered
 
+@timed("query_matches")
 def handler(event, context):
     """FC 事件函数入口"""
     try:
@@ -66,24 +80,35 @@ def handler(event, context):
         body_bytes = event if isinstance(event, bytes) else event.get("body", b"")
         body_str = body_bytes.decode("utf-8") if isinstance(body_bytes, bytes) else body_bytes
         body = json.loads(body_str)
+        enable_timing(body)
 
         matches = body.get("matches")
+        league = body.get("league")
         team = body.get("team")
         date = body.get("date")
         result = body.get("result")
         home_or_away = body.get("home_or_away")
 
-        if matches is None or team is None:
+        if (matches is None and not league) or team is None:
             return {
                 "statusCode": 400,
-                "body": json.dumps({"error": "missing required parameters: matches and team"}, ensure_ascii=False)
+                "body": json.dumps({"error": "missing required parameters: team and one of matches / league"}, ensure_ascii=False)
             }
 
-        filtered = query_matches(matches, team, date, result, home_or_away)
-
+        filtered = query_matches(
+            team,
+            matches=matches,
+            date=date,
+            result=result,
+            home_or_away=home_or_away,
+            league=league,
+        )
+
+        with span("serialize"):
+            payload = json.dumps({"matches": filtered}, ensure_ascii=False)
         return {
             "statusCode": 200,
-            "body": json.dumps({"matches": filtered}, ensure_ascii=False)
+            "body": payload
         }
 
     except Exception as e:
@@ -0,0 +1,63 @@
+import os
+import json
+import hashlib
+import unicodedata
+
+from common.utils.Ch2En import TEAM_NAME_MAP
+from common.utils.En2Le import TEAM_NAME_MAP1
+
+try:
+    from pypinyin import lazy_pinyin
+except ImportError:
+    lazy_pinyin = None
+
+# 折叠、建索引、查找与 auto 共用一份源码（exec 注入式），这里只负责冻结索引文件的读写
+ALIAS_SOURCE = os.environ.get(
+    "TEAM_ALIAS_SOURCE",
+    os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "..", "..", "auto", "utils", "team_alias.py"
+    ),
+)
+
+# build_alias_index.py 生成的冻结索引，不存在或与映射表不一致时启动时现建
+INDEX_PATH = os.environ.get(
+    "TEAM_ALIAS_INDEX",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "team_alias_index.json"),
+)
+
+
+def _read_index(path: str):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+_shared = {
+    "json": json,
+    "hashlib": hashlib,
+    "unicodedata": unicodedata,
+    "lazy_pinyin": lazy_pinyin,
+    "TEAM_NAME_MAP": TEAM_NAME_MAP,
+    "TEAM_NAME_MAP1": TEAM_NAME_MAP1,
+    "TEAM_ALIAS_PREBUILT": _read_index(INDEX_PATH),
+}
+with open(ALIAS_SOURCE, "r", encoding="utf-8") as _f:
+    exec(compile(_f.read(), ALIAS_SOURCE, "exec"), _shared)
+
+INDEX_VERSION = _shared["ALIAS_INDEX_VERSION"]
+fold = _shared["fold"]
+build_index = _shared["build_index"]
+canonical_team = _shared["canonical_team"]
+resolve_team = _shared["resolve_team"]
+team_league = _shared["team_league"]
+
+
+def write_index(path: str = INDEX_PATH) -> dict:
+    index = build_index(TEAM_NAME_MAP, TEAM_NAME_MAP1)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+    return index
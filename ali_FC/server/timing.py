@@ -0,0 +1,82 @@
+import os
+import json
+import time
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# 所有请求都记录分段耗时；也可以由请求体里的 "_timing": true 单次打开
+TOOL_TIMING = os.environ.get("TOOL_TIMING", "").lower() in ("1", "true", "yes")
+
+_current = ContextVar("tool_timer", default=None)
+
+
+class Timer:
+    """一次 handler 调用的分段计时：{阶段名: 累计毫秒}，同名阶段累加"""
+
+    def __init__(self, function_name: str, context=None):
+        self.function_name = function_name
+        self.request_id = getattr(context, "request_id", None)
+        self.start = time.perf_counter()
+        self.enabled = False
+        self.spans = {}
+
+    def enable(self, body) -> None:
+        """请求解析完之后调用，解析本身记为 decode 阶段"""
+        if self.enabled:
+            return
+        if TOOL_TIMING or (isinstance(body, dict) and body.get("_timing")):
+            self.enabled = True
+            self.spans["decode"] = (time.perf_counter() - self.start) * 1000
+
+    def report(self) -> dict:
+        return {
+            "function": self.function_name,
+            "request_id": self.request_id,
+            "total_ms": round((time.perf_counter() - self.start) * 1000, 3),
+            "spans": {name: round(ms, 3) for name, ms in self.spans.items()},
+        }
+
+    def finish(self, resp):
+        """打开时把耗时放进返回的 timing 字段，并打一行结构化日志"""
+        if not self.enabled or not isinstance(resp, dict):
+            return resp
+        timing = self.report()
+        print(json.dumps({"timing": timing}, ensure_ascii=False))
+        return {**resp, "timing": timing}
+
+
+def timed(function_name: str):
+    """handler 装饰器：本次调用内的 span() 记到同一个 Timer 上"""
+    def decorate(handler):
+        @functools.wraps(handler)
+        def wrapper(event, context):
+            timer = Timer(function_name, context)
+            token = _current.set(timer)
+            try:
+                resp = handler(event, context)
+            finally:
+                _current.reset(token)
+            return timer.finish(resp)
+        return wrapper
+    return decorate
+
+
+def enable_timing(body) -> None:
+    timer = _current.get()
+    if timer is not None:
+        timer.enable(body)
+
+
+@contextmanager
+def span(name: str):
+    """记录一个阶段；不在 timed handler 里或没有打开时不做任何事"""
+    timer = _current.get()
+    if timer is None or not timer.enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.spans[name] = timer.spans.get(name, 0.0) + (time.perf_counter() - start) * 1000
@@ -0,0 +1,70 @@
+import os
+import sys
+import importlib
+
+from config.settings import TOOL_EXEC_POLICY
+
+# FC 部署的就是这个目录，本地执行直接 import 同一份源码
+SERVER_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "server"
+)
+
+# 纯函数工具：结果只取决于参数和静态映射表
+# 值判断某次调用是否纯，不纯的调用（要读联赛数据）仍然走 FC
+PURE_TOOLS = {
+    "detect_league": lambda args: True,
+    "query_matches": lambda args: args.get("matches") is not None,
+}
+
+DEFAULT_POLICY = {name: "auto" for name in PURE_TOOLS}
+
+_LOCAL_FUNCS = {}
+
+
+def tool_policy(tool_name: str) -> str:
+    return TOOL_EXEC_POLICY.get(tool_name, DEFAULT_POLICY.get(tool_name, "remote"))
+
+
+def load_local_tool(tool_name: str):
+    """导入 server/ 下的工具函数；本地缺依赖（如 common 包）时返回 None"""
+    if tool_name not in _LOCAL_FUNCS:
+        if SERVER_DIR not in sys.path:
+            sys.path.append(SERVER_DIR)
+        try:
+            module = importlib.import_module(tool_name)
+            _LOCAL_FUNCS[tool_name] = getattr(module, tool_name)
+        except ImportError as e:
+            print(f"[local_exec] {tool_name} unavailable locally, using FC: {e}")
+            _LOCAL_FUNCS[tool_name] = None
+    return _LOCAL_FUNCS[tool_name]
+
+
+def local_tool(tool_name: str, args: dict):
+    """
+    按策略返回本次调用要在本进程执行的函数，返回 None 表示走 FC
+    - remote：总是走 FC
+    - local：总是本地执行，导入失败直接报错
+    - auto：纯调用且本地能导入时本地执行
+    """
+    policy = tool_policy(tool_name)
+    if policy == "remote":
+        return None
+
+    if policy == "local":
+        fn = load_local_tool(tool_name)
+        if fn is None:
+            raise RuntimeError(f"tool {tool_name} is configured local but cannot be imported")
+        return fn
+
+    is_pure = PURE_TOOLS.get(tool_name)
+    if is_pure is None or not is_pure(args):
+        return None
+    return load_local_tool(tool_name)
+
+
+def run_local(fn, args: dict):
+    """与 batch 返回一致：成功返回函数结果，失败返回 {"error": ...}"""
+    try:
+        return fn(**args)
+    except Exception as e:
+        return {"error": str(e)}
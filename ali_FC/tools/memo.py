@@ -0,0 +1,134 @@
+import copy
+import json
+import threading
+import time
+from collections import OrderedDict
+
+# 只依赖标准库：auto/tool_memo.py 按路径加载这份实现，缓存实例由两边各自按配置创建
+
+# 只读工具：结果可以按参数缓存
+MEMO_TOOLS = {"detect_league", "load_team_matches", "query_matches", "league_table", "head_to_head"}
+
+# 写工具：调用后该联赛的版本号加一，缓存里该联赛的结果全部失效
+MUTATING_TOOLS = {"add_match", "change_score", "delete_matches", "import_matches"}
+
+# 依赖所有联赛数据的读调用（不传联赛的 head_to_head），任一联赛有写入都失效
+ALL_LEAGUES = "*"
+
+
+def _canonical(args: dict) -> str:
+    """参数规范化：键排序，去掉值为 None 的参数（与不传等价）"""
+    return json.dumps(
+        {k: v for k, v in args.items() if v is not None},
+        ensure_ascii=False,
+        sort_keys=True,
+        default=str,
+    )
+
+
+def _read_league(args: dict):
+    """读工具依赖的联赛；detect_league 和传入 matches 的 query_matches 不依赖联赛数据"""
+    if "team_b" in args and not args.get("league"):
+        return ALL_LEAGUES
+    return args.get("league")
+
+
+def _write_league(tool_name: str, args: dict):
+    """写工具改动的联赛，取不到时返回 None（按全部联赛失效处理）"""
+    if tool_name in ("add_match", "import_matches"):
+        return args.get("league")
+    matches = args.get("match") if tool_name == "change_score" else args.get("matches")
+    if isinstance(matches, list) and matches and isinstance(matches[0], dict):
+        return matches[0].get("Div")
+    return None
+
+
+class ToolMemo:
+    """
+    工具结果缓存：键为 工具名 + 规范化参数，LRU 限制条数，TTL 过期
+    每个联赛一个版本号，写工具调用后加一；条目记下写入时的版本，版本变了即失效
+    同一进程内的所有 agent 会话共用
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (expires_at, league, version, result)
+        self._versions = {}
+        # 不知道改了哪个联赛时加一，所有联赛一起失效
+        self._epoch = 0
+        # 所有联赛的写入次数之和，ALL_LEAGUES 的版本号
+        self._writes = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl > 0
+
+    def league_version(self, league: str) -> tuple:
+        if league == ALL_LEAGUES:
+            return (self._epoch, self._writes)
+        return (self._epoch, self._versions.get(league, 0))
+
+    def version_for(self, args: dict) -> tuple:
+        """调用前取版本，结果写入缓存时用它；调用期间有写入的话结果直接作废"""
+        return self.league_version(_read_league(args))
+
+    def get(self, tool_name: str, args: dict):
+        """命中返回 (True, 结果)，否则 (False, None)"""
+        if not self.enabled or tool_name not in MEMO_TOOLS:
+            return False, None
+
+        key = (tool_name, _canonical(args))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, league, version, result = entry
+            if time.monotonic() >= expires_at or (
+                league is not None and version != self.league_version(league)
+            ):
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+        return True, copy.deepcopy(result)
+
+    def put(self, tool_name: str, args: dict, result, version: tuple = None) -> None:
+        if not self.enabled or tool_name not in MEMO_TOOLS:
+            return
+        # 出错的结果不缓存
+        if isinstance(result, dict) and "error" in result:
+            return
+
+        league = _read_league(args)
+        key = (tool_name, _canonical(args))
+        with self._lock:
+            if version is None:
+                version = self.league_version(league)
+            elif league is not None and version != self.league_version(league):
+                return
+            self._entries[key] = (
+                time.monotonic() + self.ttl,
+                league,
+                version,
+                copy.deepcopy(result),
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def bump(self, league: str = None) -> None:
+        """联赛版本号加一；league 为 None 时所有依赖联赛数据的条目失效"""
+        with self._lock:
+            if league is None:
+                self._epoch += 1
+            else:
+                self._versions[league] = self._versions.get(league, 0) + 1
+                self._writes += 1
+
+    def record(self, tool_name: str, args: dict, result, version: tuple = None) -> None:
+        """工具调用完成后调用：读工具写入缓存，写工具使对应联赛失效"""
+        if tool_name in MUTATING_TOOLS:
+            self.bump(_write_league(tool_name, args))
+        else:
+            self.put(tool_name, args, result, version)
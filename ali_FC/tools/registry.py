@@ -5,8 +5,11 @@ from models.query_matches import QueryMatchesInput
 from models.change_score import ChangeScoreInput
 from models.add_match import AddMatchInput
 from models.delete_matches import DeleteMatchesInput
-from fc.invoke import list_tools
-from .wrappers import make_tool_func
+from models.league_table import LeagueTableInput
+from models.head_to_head import HeadToHeadInput
+from models.import_matches import ImportMatchesInput
+from .schema_cache import cached_tool_schemas
+from .wrappers import make_tool_func, make_tool_coroutine
 
 SCHEMA_MAP = {
     "detect_league": DetectLeagueInput,
@@ -15,12 +18,15 @@ SCHEMA_MAP = {
     "change_score": ChangeScoreInput,
     "add_match": AddMatchInput,
     "delete_matches": DeleteMatchesInput,
+    "league_table": LeagueTableInput,
+    "head_to_head": HeadToHeadInput,
+    "import_matches": ImportMatchesInput,
 }
 
 def build_tools():
     tools = []
 
-    for t in list_tools():
+    for t in cached_tool_schemas():
         name = t["name"]
         args_schema = SCHEMA_MAP.get(name)
 
@@ -29,6 +35,7 @@ def build_tools():
                 name=name,
                 description=t.get("description", ""),
                 func=make_tool_func(name),
+                coroutine=make_tool_coroutine(name),
                 args_schema=args_schema  
             )
         )
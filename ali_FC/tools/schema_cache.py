@@ -0,0 +1,88 @@
+import os
+import json
+import hashlib
+import threading
+
+from config.settings import TOOL_SCHEMA_CACHE
+from fc.invoke import fetch_tool_schemas
+
+_refresh_lock = threading.Lock()
+_refresh_started = False
+
+
+def _schema_hash(tools: list) -> str:
+    raw = json.dumps(tools, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()[:16]
+
+
+def _read_cache():
+    try:
+        with open(TOOL_SCHEMA_CACHE, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cache, dict) or not cache.get("tools"):
+        return None
+    return cache
+
+
+def _write_cache(version: str, tools: list) -> None:
+    tmp = f"{TOOL_SCHEMA_CACHE}.{os.getpid()}"
+    try:
+        os.makedirs(os.path.dirname(TOOL_SCHEMA_CACHE), exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": version, "tools": tools}, f, ensure_ascii=False)
+        os.replace(tmp, TOOL_SCHEMA_CACHE)
+    except OSError:
+        # 缓存只是加速手段
+        pass
+
+
+def _fetch(version: str = None):
+    """
+    返回最新的 tools；与 version 一致时返回 None
+    响应里没有 tools（FC 报错、超时等）时抛 RuntimeError，不写缓存
+    """
+    raw = fetch_tool_schemas(version)
+    if isinstance(raw, dict) and raw.get("not_modified"):
+        return None
+    if not isinstance(raw, dict) or not isinstance(raw.get("tools"), list) or not raw["tools"]:
+        error = raw.get("error", raw) if isinstance(raw, dict) else raw
+        raise RuntimeError(f"list_tools returned no tools: {error}")
+
+    tools = raw["tools"]
+    # 旧版 list_tools 不返回 version，本地算
+    latest = raw.get("version") or _schema_hash(tools)
+    if latest == version:
+        return None
+    _write_cache(latest, tools)
+    return tools
+
+
+def _revalidate(version: str) -> None:
+    try:
+        if _fetch(version) is not None:
+            print("[schema_cache] tool schemas changed, used from next agent start")
+    except Exception as e:
+        print(f"[schema_cache] revalidate failed: {e}")
+
+
+def cached_tool_schemas() -> list[dict]:
+    """
+    工具 schema：有本地缓存就直接返回，后台线程向 FC 校验一次（每个进程一次）
+    没有缓存时同步调用 list_tools 并写入缓存，拿不到时直接报错，不用空的工具列表启动
+    """
+    global _refresh_started
+
+    cache = _read_cache()
+    if cache is None:
+        return _fetch()
+
+    with _refresh_lock:
+        start = not _refresh_started
+        _refresh_started = True
+    if start:
+        threading.Thread(
+            target=_revalidate, args=(cache.get("version"),), daemon=True
+        ).start()
+    return cache["tools"]
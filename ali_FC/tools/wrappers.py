@@ -1,7 +1,72 @@
-from fc.invoke import call_fc_function
+from fc.invoke import call_fc_tool
+from fc.async_invoke import acall_fc_tool
+from .local_exec import local_tool, run_local
+from config.settings import TOOL_MEMO_SIZE, TOOL_MEMO_TTL
+from .memo import ToolMemo
+
+# 工具结果缓存，同一进程内的所有 agent 会话共用
+tool_memo = ToolMemo(TOOL_MEMO_SIZE, TOOL_MEMO_TTL)
+
+# 接收比赛记录的参数：LLM 可能把 compact 表格原样传过来，执行前展开成记录
+MATCH_ARGS = {
+    "query_matches": "matches",
+    "change_score": "match",
+    "delete_matches": "matches",
+}
+
+def expand_matches(value):
+    """
+    {"fields": [...], "rows": [[...], ...]} -> [{...}, ...]，单条记录包成列表，其它原样返回
+    auto 的 {"result": ...} 信封和分页的 {"matches": ..., "next_cursor": ...} 先拆开
+    """
+    if isinstance(value, dict) and "result" in value:
+        value = value["result"]
+    if isinstance(value, dict) and "matches" in value:
+        value = value["matches"]
+    if isinstance(value, dict) and "fields" in value and "rows" in value:
+        return [dict(zip(value["fields"], row)) for row in value["rows"]]
+    if isinstance(value, dict):
+        return [value]
+    return value
+
+def _expand_args(tool_name, kwargs):
+    key = MATCH_ARGS.get(tool_name)
+    if key is None or kwargs.get(key) is None:
+        return kwargs
+    return {**kwargs, key: expand_matches(kwargs[key])}
 
 def make_tool_func(tool_name):
     def tool_func(**kwargs):
+        kwargs = _expand_args(tool_name, kwargs)
+        # 相同参数的读调用直接用缓存，写调用之后对应联赛的缓存失效
+        hit, result = tool_memo.get(tool_name, kwargs)
+        if hit:
+            return result
+        version = tool_memo.version_for(kwargs)
         # kwargs 已经是 {"team": "Liverpool"} 或 {"league": "...", "team": "..."}
-        return call_fc_function(tool_name, kwargs)
-    return tool_func
\ No newline at end of file
+        # 纯函数工具直接在本进程执行，省掉一次 FC 往返
+        fn = local_tool(tool_name, kwargs)
+        if fn is not None:
+            result = run_local(fn, kwargs)
+        else:
+            result = call_fc_tool(tool_name, kwargs)
+        tool_memo.record(tool_name, kwargs, result, version)
+        return result
+    return tool_func
+
+def make_tool_coroutine(tool_name):
+    # agent.astream 下走这个：不占线程，共享连接池
+    async def tool_coroutine(**kwargs):
+        kwargs = _expand_args(tool_name, kwargs)
+        hit, result = tool_memo.get(tool_name, kwargs)
+        if hit:
+            return result
+        version = tool_memo.version_for(kwargs)
+        fn = local_tool(tool_name, kwargs)
+        if fn is not None:
+            result = run_local(fn, kwargs)
+        else:
+            result = await acall_fc_tool(tool_name, kwargs)
+        tool_memo.record(tool_name, kwargs, result, version)
+        return result
+    return tool_coroutine
@@ -1,10 +1,12 @@
 from typing import Type
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 from pydantic import BaseModel, Field
 
 from langchain_core.tools import StructuredTool
 
-from FC_client import AliFC
+from FC_client import fc_batcher, async_fc_batcher
+from local_exec import local_tool, run_local
+from tool_memo import tool_memo
 
 class DetectLeagueInput(BaseModel):
     team: str = Field(
@@ -18,10 +20,38 @@ class LoadTeamMatchesInput(BaseModel):
     team: str = Field(
         description="Team name"
     )
+    fields: Optional[List[str]] = Field(
+        default=None,
+        description=(
+            "Only return these columns, e.g. ['Date', 'HomeTeam', 'AwayTeam', 'FTHG', 'FTAG']; "
+            "include 'Div' and 'match_id' (plus 'HomeTeam' and 'Date' for a faster lookup) if the matches will be changed or deleted later. Default: all columns"
+        )
+    )
+    compact: bool = Field(
+        default=False,
+        description="Return {fields, rows} with the column names listed once instead of one object per match"
+    )
+    limit: Optional[int] = Field(
+        default=None,
+        description="Page size (1-1000). When given, matches are sorted by date and a next_cursor is returned"
+    )
+    cursor: Optional[str] = Field(
+        default=None,
+        description="The next_cursor from the previous page"
+    )
+    order: Optional[str] = Field(
+        default=None,
+        description="Date order of paged results: asc (default) or desc"
+    )
 
 class QueryMatchesInput(BaseModel):
-    matches: List[Dict[str, Any]] = Field(
-        description="List of match records"
+    league: Optional[str] = Field(
+        default=None,
+        description="League code, e.g. E0; when given, the team's stored matches are queried on the server"
+    )
+    matches: Optional[Union[List[Dict[str, Any]], Dict[str, Any]]] = Field(
+        default=None,
+        description="Match records or a compact {fields, rows} table, only needed when league is not given"
     )
     team: str = Field(
         description="Team name to query"
@@ -40,8 +70,8 @@ class QueryMatchesInput(BaseModel):
     )
 
 class ChangeScoreInput(BaseModel):
-    match: list[dict] = Field(
-        description="List of match records"
+    match: Union[List[Dict[str, Any]], Dict[str, Any]] = Field(
+        description="List of match records, or a compact {fields, rows} table"
     )
     home_score: int = Field(
         description="The goal number of home team"
@@ -76,8 +106,47 @@ class AddMatchInput(BaseModel):
     )
 
 class DeleteMatchesInput(BaseModel):
-    matches: list[dict] = Field(
-        description="List of match records"
+    matches: Union[List[Dict[str, Any]], Dict[str, Any]] = Field(
+        description="List of match records, or a compact {fields, rows} table"
+    )
+
+class LeagueTableInput(BaseModel):
+    league: str = Field(
+        description="League code, e.g. E0"
+    )
+    season: Optional[str] = Field(
+        default=None,
+        description="Season such as 2024-2025 (seasons start in July); defaults to the latest season"
+    )
+    team: Optional[str] = Field(
+        default=None,
+        description="Only return this team's row, with its position in the table"
+    )
+
+class HeadToHeadInput(BaseModel):
+    team_a: str = Field(
+        description="The name of the first football team"
+    )
+    team_b: str = Field(
+        description="The name of the second football team"
+    )
+    league: Optional[str] = Field(
+        default=None,
+        description="League code, e.g. E0; defaults to every league"
+    )
+
+class ImportMatchesInput(BaseModel):
+    csv_text: Optional[str] = Field(
+        default=None,
+        description="Content of a football-data.co.uk season CSV"
+    )
+    url: Optional[str] = Field(
+        default=None,
+        description="URL of a football-data.co.uk season CSV (other hosts are rejected), e.g. https://www.football-data.co.uk/mmz4281/2324/E0.csv"
+    )
+    league: Optional[str] = Field(
+        default=None,
+        description="League code, e.g. E0; overrides the Div column of the CSV"
     )
 
 
@@ -88,15 +157,48 @@ TOOL_INPUT_MODELS: dict[str, Type[BaseModel]] = {
     "change_score": ChangeScoreInput,
     "add_match": AddMatchInput,
     "delete_matches": DeleteMatchesInput,
+    "league_table": LeagueTableInput,
+    "head_to_head": HeadToHeadInput,
+    "import_matches": ImportMatchesInput,
+}
+
+# 接收比赛记录的参数：LLM 可能把 compact 表格原样传过来，执行前展开成记录
+MATCH_ARGS = {
+    "query_matches": "matches",
+    "change_score": "match",
+    "delete_matches": "matches",
 }
 
 
+def expand_matches(value):
+    """
+    {"fields": [...], "rows": [[...], ...]} -> [{...}, ...]，单条记录包成列表，其它原样返回
+    auto 的 {"result": ...} 信封和分页的 {"matches": ..., "next_cursor": ...} 先拆开
+    """
+    if isinstance(value, dict) and "result" in value:
+        value = value["result"]
+    if isinstance(value, dict) and "matches" in value:
+        value = value["matches"]
+    if isinstance(value, dict) and "fields" in value and "rows" in value:
+        return [dict(zip(value["fields"], row)) for row in value["rows"]]
+    if isinstance(value, dict):
+        return [value]
+    return value
+
+
+def _expand_args(tool_name, kwargs):
+    key = MATCH_ARGS.get(tool_name)
+    if key is None or kwargs.get(key) is None:
+        return kwargs
+    return {**kwargs, key: expand_matches(kwargs[key])}
+
+
 def Ali_tool_wrapper(tool_name: str) -> StructuredTool:
     """
     LangChain Tool wrapper
     - tool_name 来自 mytools
     - schema 来自你本地定义的 Pydantic
-    - 执行走 FC
+    - 执行走 FC；纯函数工具按 local_exec 的策略在本进程执行
     """
 
     if tool_name not in TOOL_INPUT_MODELS:
@@ -104,18 +206,41 @@ def Ali_tool_wrapper(tool_name: str) -> StructuredTool:
 
     args_schema = TOOL_INPUT_MODELS[tool_name]
 
-    # lambda 里用 _tool_name 绑定，避免闭包坑
+    # 同一步里并发的工具调用由 fc_batcher 合并成一次 FC 调用
     def _call_fc(**kwargs):
-        return AliFC.call_fc_function(
-            args={
-                "tool": tool_name,
-                "args": kwargs
-            }
-        )
+        kwargs = _expand_args(tool_name, kwargs)
+        # 相同参数的读调用直接用缓存，写调用之后对应联赛的缓存失效
+        hit, result = tool_memo.get(tool_name, kwargs)
+        if hit:
+            return result
+        version = tool_memo.version_for(kwargs)
+        fn = local_tool(tool_name, kwargs)
+        if fn is not None:
+            result = run_local(fn, kwargs)
+        else:
+            result = fc_batcher.call(tool_name, kwargs)
+        tool_memo.record(tool_name, kwargs, result, version)
+        return result
+
+    # agent.astream 下走协程：不占线程，共享连接池
+    async def _acall_fc(**kwargs):
+        kwargs = _expand_args(tool_name, kwargs)
+        hit, result = tool_memo.get(tool_name, kwargs)
+        if hit:
+            return result
+        version = tool_memo.version_for(kwargs)
+        fn = local_tool(tool_name, kwargs)
+        if fn is not None:
+            result = run_local(fn, kwargs)
+        else:
+            result = await async_fc_batcher.call(tool_name, kwargs)
+        tool_memo.record(tool_name, kwargs, result, version)
+        return result
 
     return StructuredTool.from_function(
         name=tool_name,
         description=f"Call tool `{tool_name}` via Aliyun FC",
         args_schema=args_schema,
         func=_call_fc,
+        coroutine=_acall_fc,
     )
\ No newline at end of file
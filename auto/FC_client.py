@@ -1,7 +1,17 @@
 import os
 import json
+import asyncio
+import hashlib
+import importlib.util
+import time
+import weakref
+from collections import deque
 from dotenv import load_dotenv
 
+import aiohttp
+from alibabacloud_tea_openapi.utils import Utils
+from darabonba.request import DaraRequest
+
 from alibabacloud_fc20230330.client import Client as FC20230330Client
 from alibabacloud_credentials.client import Client as CredentialClient
 from alibabacloud_credentials.models import Config as CredConfig
@@ -12,11 +22,61 @@ from alibabacloud_tea_util import models as util_models
 
 load_dotenv()
 
+from local_fc import FC_LOCAL, LocalFCClient
+
+# FCBatcher / AsyncFCBatcher 只在 ali_FC/fc/batcher.py 维护一份（只依赖标准库），按路径加载
+BATCHER_SOURCE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "ali_FC", "fc", "batcher.py"
+)
+_spec = importlib.util.spec_from_file_location("ali_fc_batcher", BATCHER_SOURCE)
+_batcher_module = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_batcher_module)
+FCBatcher = _batcher_module.FCBatcher
+AsyncFCBatcher = _batcher_module.AsyncFCBatcher
+
+FC_ENDPOINT = "1064398619921513.cn-hangzhou.fc.aliyuncs.com"
+FC_FUNCTION = "oss_test"
+
+# 打开后每次调用都带上 _timing，记录服务端分段耗时和客户端往返时间
+FC_TIMING = os.environ.get("FC_TIMING", "").lower() in ("1", "true", "yes")
+# 最近的调用耗时，便于在进程内查看；同时每条打一行结构化日志
+TIMINGS = deque(maxlen=256)
+
+
+def with_timing(args: dict) -> dict:
+    return {**args, "_timing": True} if FC_TIMING else args
+
+
+def record_timing(rtt_ms: float, raw: str):
+    """
+    记录一次调用：客户端往返 rtt_ms，服务端 total_ms 与各阶段耗时
+    network_ms = rtt_ms - total_ms，即网络、排队和冷启动的时间
+    """
+    if not FC_TIMING:
+        return None
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        data = None
+    server = data.get("timing") if isinstance(data, dict) else None
+
+    entry = {"function": FC_FUNCTION, "rtt_ms": round(rtt_ms, 3)}
+    if isinstance(server, dict):
+        entry["server_ms"] = server.get("total_ms")
+        entry["network_ms"] = round(rtt_ms - (server.get("total_ms") or 0), 3)
+        entry["spans"] = server.get("spans", {})
+        entry["request_id"] = server.get("request_id")
+    TIMINGS.append(entry)
+    print(json.dumps({"fc_timing": entry}, ensure_ascii=False))
+    return entry
+
 class AliFC:
     _client = None
 
     @staticmethod
     def create_client() -> FC20230330Client:
+        if AliFC._client is None and FC_LOCAL:
+            AliFC._client = LocalFCClient()
         if AliFC._client is None:
             credential = CredentialClient(
                 CredConfig(
@@ -28,14 +88,14 @@ class AliFC:
             AliFC._client = FC20230330Client(
                 open_api_models.Config(
                     credential=credential,
-                    endpoint="1064398619921513.cn-hangzhou.fc.aliyuncs.com",
+                    endpoint=FC_ENDPOINT,
                 )
             )
         return AliFC._client
     
     def call_fc_function(args: dict) -> dict:
         client = AliFC._client or AliFC.create_client()
-        body_json_str = json.dumps(args, ensure_ascii=False)
+        body_json_str = json.dumps(with_timing(args), ensure_ascii=False)
         body_stream = StreamClient.read_from_string(body_json_str)
         headers = fc20230330_models.InvokeFunctionHeaders(
             x_fc_invocation_type='Sync',
@@ -47,28 +107,155 @@ class AliFC:
         )
         runtime = util_models.RuntimeOptions()
 
-        resp = client.invoke_function_with_options("oss_test", request, headers, runtime)
+        start = time.perf_counter()
+        resp = client.invoke_function_with_options(FC_FUNCTION, request, headers, runtime)
         raw = resp.body.read().decode("utf-8")
-        try:
-            data = json.loads(raw)
+        record_timing((time.perf_counter() - start) * 1000, raw)
+        return parse_fc_response(raw)
+
+    def call_fc_batch(calls: list) -> list:
+        """
+        一次 FC 调用执行多个工具
+        calls: [{"tool": "...", "args": {...}}, ...]
+        返回与 calls 等长的 [{"result": ...} | {"error": ...}]
+        """
+        data = AliFC.call_fc_function(args={"calls": calls})
+        if isinstance(data, dict) and "results" in data:
+            return data["results"]
+
+        error = data.get("error", data) if isinstance(data, dict) else data
+        return [{"error": str(error)} for _ in calls]
+
+
+def parse_fc_response(raw: str):
+    try:
+        data = json.loads(raw)
+
+        # FC 标准返回
+        if isinstance(data, dict) and "body" in data:
+            body = data["body"]
+
+            # body 本身是 JSON 字符串
+            if isinstance(body, str):
+                try:
+                    return json.loads(body)
+                except json.JSONDecodeError:
+                    # body 就是普通字符串，比如“比分更新成功”
+                    return body
+
+            # body 已经是 dict
+            return body
+
+        return data
+
+    except json.JSONDecodeError:
+        # FC 直接返回了纯文本
+        return raw
+
+
+# 默认不合并：打开后每次调用都要先等一个窗口
+fc_batcher = FCBatcher(
+    lambda tool_name, args: AliFC.call_fc_function(args={"tool": tool_name, "args": args}),
+    AliFC.call_fc_batch,
+    float(os.environ.get("FC_BATCH_WINDOW_MS", "0")),
+)
+
+
+class AsyncAliFC:
+    """
+    asyncio 版 FC 调用
+    SDK 自带的 *_async 方法每次调用都会新建 aiohttp session（重新握手），
+    这里每个事件循环共享一个 session：连接池 + keep-alive
+    签名沿用 SDK 的 ACS3-HMAC-SHA256 实现
+    """
+
+    def __init__(self, pool_size: int):
+        self.pool_size = pool_size
+        self._sessions = weakref.WeakKeyDictionary()
+
+    def _session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.pool_size,
+                    limit_per_host=self.pool_size,
+                    keepalive_timeout=60,
+                )
+            )
+            self._sessions[loop] = session
+        return session
+
+    def _sign(self, body: bytes) -> DaraRequest:
+        payload_hash = hashlib.sha256(body).hexdigest()
+
+        request = DaraRequest()
+        request.protocol = "https"
+        request.method = "POST"
+        request.pathname = f"/2023-03-30/functions/{FC_FUNCTION}/invocations"
+        request.query = {"qualifier": "LATEST"}
+        request.headers = {
+            "host": FC_ENDPOINT,
+            "x-acs-version": "2023-03-30",
+            "x-acs-action": "InvokeFunction",
+            "x-acs-date": Utils.get_timestamp(),
+            "x-acs-signature-nonce": Utils.get_nonce(),
+            "accept": "application/json",
+            "content-type": "application/octet-stream",
+            "x-fc-invocation-type": "Sync",
+            "x-fc-log-type": "None",
+            "x-acs-content-sha256": payload_hash,
+        }
+        request.headers["Authorization"] = Utils.get_authorization(
+            request,
+            "ACS3-HMAC-SHA256",
+            payload_hash,
+            os.environ["FC_ACCESS_KEY_ID"],
+            os.environ["FC_ACCESS_KEY_SECRET"],
+        )
+        return request
+
+    async def call_fc_function(self, args: dict):
+        body = json.dumps(with_timing(args), ensure_ascii=False).encode("utf-8")
+        start = time.perf_counter()
+        if FC_LOCAL:
+            client = AliFC._client or AliFC.create_client()
+            raw = (await client.ainvoke(FC_FUNCTION, body)).decode("utf-8")
+            record_timing((time.perf_counter() - start) * 1000, raw)
+            return parse_fc_response(raw)
+        request = self._sign(body)
+
+        async with self._session().post(
+            f"https://{FC_ENDPOINT}{request.pathname}",
+            params=request.query,
+            data=body,
+            headers=request.headers,
+        ) as resp:
+            raw = await resp.text(encoding="utf-8")
+            if resp.status >= 400:
+                raise RuntimeError(f"FC invoke failed: {resp.status} {raw}")
+
+        record_timing((time.perf_counter() - start) * 1000, raw)
+        return parse_fc_response(raw)
 
-            # FC 标准返回
-            if isinstance(data, dict) and "body" in data:
-                body = data["body"]
+    async def call_fc_batch(self, calls: list) -> list:
+        data = await self.call_fc_function({"calls": calls})
+        if isinstance(data, dict) and "results" in data:
+            return data["results"]
 
-                # body 本身是 JSON 字符串
-                if isinstance(body, str):
-                    try:
-                        return json.loads(body)
-                    except json.JSONDecodeError:
-                        # body 就是普通字符串，比如“比分更新成功”
-                        return body
+        error = data.get("error", data) if isinstance(data, dict) else data
+        return [{"error": str(error)} for _ in calls]
 
-                # body 已经是 dict
-                return body
+    async def close(self) -> None:
+        for session in list(self._sessions.values()):
+            await session.close()
+        self._sessions.clear()
 
-            return data
 
-        except json.JSONDecodeError:
-            # FC 直接返回了纯文本
-            return raw
\ No newline at end of file
+async_fc = AsyncAliFC(int(os.environ.get("FC_POOL_SIZE", "32")))
+async_fc_batcher = AsyncFCBatcher(
+    lambda tool_name, args: async_fc.call_fc_function({"tool": tool_name, "args": args}),
+    async_fc.call_fc_batch,
+    float(os.environ.get("FC_BATCH_WINDOW_MS", "0")),
+)
@@ -16,6 +16,9 @@ mytools = [
     "add_match",
     "change_score",
     "delete_matches",
+    "league_table",
+    "head_to_head",
+    "import_matches",
 ]
 
 class Agent:
@@ -38,6 +41,10 @@ class Agent:
                 "You are an AI agent designed to solve tasks by using tools. "
                 "You don't know any team information, don't guess by yourself. "
                 "When a league is needed, you MUST call detect_league. "
+                "To filter a team's matches, call query_matches with league and team "
+                "instead of passing the matches from load_team_matches. "
+                "For standings, positions or points, call league_table. "
+                "For the record between two teams, call head_to_head. "
                 "Do not answer using your own knowledge if a tool can be used."
             )
         )
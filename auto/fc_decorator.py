@@ -1,9 +1,24 @@
+import hashlib
 import json
+import os
+import time
 import inspect
 import textwrap
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
 
 import alibabacloud_oss_v2 as oss
 
+try:
+    from pypinyin import lazy_pinyin
+except ImportError:
+    lazy_pinyin = None
+
+TOOLS_BUCKET = "soccer-tools"
+
+# import 时登记的工具：{name: tool_def}，由 publish() 统一上传
+TOOL_REGISTRY = {}
+
 def strip_decorators(func):
     src = inspect.getsource(func)
     lines = src.splitlines()
@@ -11,7 +26,265 @@ def strip_decorators(func):
         lines.pop(0)
     return textwrap.dedent("\n".join(lines))
 
+TOOL_MANIFEST_KEY = "tool/manifest.json"
+
+AUTO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 本仓库维护的公共依赖：OSS key -> 源码，handler 按 COMMON_DEPS 加载
+# Ch2En / En2Le 映射表不在仓库里，另行上传
+COMMON_SOURCES = {
+    "common/storage/oss_storage.py": os.path.join(AUTO_DIR, "storage", "oss_storage.py"),
+    "common/utils/team_alias.py": os.path.join(AUTO_DIR, "utils", "team_alias.py"),
+}
+
+# 冷启动包：公共依赖 + 全部工具打成一个对象，handler 启动时一次 GET 取回
+BUNDLE_KEY = os.environ.get("BUNDLE_KEY", "bundle/bundle.json")
+
+# 与 handler.COMMON_DEPS 一致，按顺序 exec
+COMMON_DEPS = [
+    "common/utils/En2Le.py",
+    "common/utils/Ch2En.py",
+    "common/storage/oss_storage.py",
+    "common/utils/team_alias.py",
+]
+# 预编译别名索引只需要这几个，storage 不用 exec
+ALIAS_DEPS = [
+    "common/utils/En2Le.py",
+    "common/utils/Ch2En.py",
+    "common/utils/team_alias.py",
+]
+
+def create_client():
+    # 离线运行：本地目录代替 OSS，见 local_oss.py
+    if os.environ.get("OSS_LOCAL_DIR"):
+        from local_oss import LocalOSSClient
+        return LocalOSSClient(os.environ["OSS_LOCAL_DIR"])
+    cfg = oss.config.load_default()
+    cfg.region = "cn-beijing"
+    cfg.credentials_provider = oss.credentials.EnvironmentVariableCredentialsProvider()
+    return oss.Client(cfg)
+
+def tool_hash(tool_def):
+    """与 handler.tool_hash 一致"""
+    return hashlib.sha256(
+        json.dumps(tool_def, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+
+LEASE_TIMEOUT = 60
+
+
+def _read_lease(client, key):
+    try:
+        return client.get_object(oss.GetObjectRequest(bucket=TOOLS_BUCKET, key=key)).body.read()
+    except oss.exceptions.ServiceError as e:
+        if e.status_code == 404:
+            return b""
+        raise
+
+
+def _acquire_lease(client, key, retries=5):
+    """
+    OSS 的 PutObject 没有 If-Match，用 Appendable 对象 {key}.lease 做租约：
+    以读到的长度追加一行 claim，同一时刻只有一个发布者能成功（position 不符时 409）；
+    末行是未释放且未超过 LEASE_TIMEOUT 秒的 claim 时等待
+    返回追加后的长度，交给 _release_lease
+    """
+    lease_key = f"{key}.lease"
+    for attempt in range(retries):
+        raw = _read_lease(client, lease_key)
+        last = raw.rstrip(b"\n").rpartition(b"\n")[2]
+        claim = json.loads(last) if last.strip() else None
+        if claim is None or claim.get("released") or time.time() - claim["at"] >= LEASE_TIMEOUT:
+            try:
+                resp = client.append_object(
+                    oss.AppendObjectRequest(
+                        bucket=TOOLS_BUCKET,
+                        key=lease_key,
+                        position=len(raw),
+                        body=(json.dumps({"at": time.time()}) + "\n").encode("utf-8")
+                    )
+                )
+                return int(resp.next_position)
+            except oss.exceptions.ServiceError as e:
+                if e.status_code != 409:
+                    raise
+        time.sleep(0.2 * 2 ** attempt)
+    raise RuntimeError(f"{key} is locked by another publisher")
+
+
+def _release_lease(client, key, position):
+    """已超时被别的发布者接手时 409，什么也不做"""
+    try:
+        client.append_object(
+            oss.AppendObjectRequest(
+                bucket=TOOLS_BUCKET,
+                key=f"{key}.lease",
+                position=position,
+                body=(json.dumps({"released": True}) + "\n").encode("utf-8")
+            )
+        )
+    except oss.exceptions.ServiceError as e:
+        if e.status_code != 409:
+            raise
+
+
+def update_manifest(client, tool_defs, retries=5):
+    """
+    把工具登记到 tool/manifest.json，handler 轮询它热更新
+    持有租约（见 _acquire_lease）期间读-改-写，并发发布时不会互相覆盖；
+    持有者停顿超过 LEASE_TIMEOUT 秒被接手后，它的那次写入仍可能覆盖接手者的结果
+    """
+    position = _acquire_lease(client, TOOL_MANIFEST_KEY, retries)
+    try:
+        try:
+            resp = client.get_object(
+                oss.GetObjectRequest(bucket=TOOLS_BUCKET, key=TOOL_MANIFEST_KEY)
+            )
+            manifest = json.loads(resp.body.read())
+        except oss.exceptions.ServiceError as e:
+            if e.status_code != 404:
+                raise
+            manifest = {"version": 1, "tools": {}}
+
+        for tool_def in tool_defs:
+            manifest["tools"][tool_def["name"]] = {
+                "hash": tool_hash(tool_def),
+                "def": tool_def,
+            }
+
+        client.put_object(
+            oss.PutObjectRequest(
+                bucket=TOOLS_BUCKET,
+                key=TOOL_MANIFEST_KEY,
+                body=json.dumps(manifest, ensure_ascii=False).encode("utf-8")
+            )
+        )
+    finally:
+        _release_lease(client, TOOL_MANIFEST_KEY, position)
+
+def load_manifest_hashes(client):
+    """{name: hash}，清单不存在时为空"""
+    try:
+        resp = client.get_object(
+            oss.GetObjectRequest(bucket=TOOLS_BUCKET, key=TOOL_MANIFEST_KEY)
+        )
+    except oss.exceptions.ServiceError as e:
+        if e.status_code == 404:
+            return {}
+        raise
+    manifest = json.loads(resp.body.read())
+    return {name: entry["hash"] for name, entry in manifest["tools"].items()}
+
+def upload_tool(client, tool_def):
+    client.put_object(
+        oss.PutObjectRequest(
+            bucket=TOOLS_BUCKET,
+            key=f"tool/{tool_def['name']}.json",
+            body=json.dumps(tool_def, ensure_ascii=False).encode("utf-8")
+        )
+    )
+
+def publish_common(client=None):
+    """上传 COMMON_SOURCES，与 OSS 上内容（ETag 即 MD5）一致的跳过；返回上传了的 key"""
+    if client is None:
+        client = create_client()
+
+    changed = []
+    for key, path in COMMON_SOURCES.items():
+        with open(path, "rb") as f:
+            raw = f.read()
+        try:
+            etag = client.head_object(oss.HeadObjectRequest(bucket=TOOLS_BUCKET, key=key)).etag
+        except oss.exceptions.ServiceError as e:
+            if e.status_code != 404:
+                raise
+            etag = None
+        if etag and etag.strip('"').lower() == hashlib.md5(raw).hexdigest():
+            continue
+        client.put_object(oss.PutObjectRequest(bucket=TOOLS_BUCKET, key=key, body=raw))
+        changed.append(key)
+    return changed
+
+def _load_text(client, key):
+    obj = client.get_object(oss.GetObjectRequest(bucket=TOOLS_BUCKET, key=key))
+    return obj.body.read().decode("utf-8")
+
+def publish_bundle(client=None, max_workers=8):
+    """
+    把 TOOLS_BUCKET 里当前的公共依赖和全部工具打成冷启动包，返回版本号
+    publish() 有改动时会自动调用
+    """
+    if client is None:
+        client = create_client()
+
+    tool_keys = []
+    paginator = client.list_objects_v2_paginator()
+    for page in paginator.iter_page(
+        oss.ListObjectsV2Request(bucket=TOOLS_BUCKET, prefix="tool/")
+    ):
+        tool_keys.extend(
+            obj.key for obj in page.contents or []
+            if obj.key.endswith(".json") and obj.key != TOOL_MANIFEST_KEY
+        )
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        modules = dict(zip(COMMON_DEPS, pool.map(lambda k: _load_text(client, k), COMMON_DEPS)))
+        tool_defs = [json.loads(src) for src in pool.map(lambda k: _load_text(client, k), tool_keys)]
+
+    # 别名索引在这里预编译好，冷启动时校验 source_hash 后直接用
+    scratch = {
+        "json": json,
+        "hashlib": hashlib,
+        "unicodedata": unicodedata,
+        "lazy_pinyin": lazy_pinyin,
+        "TEAM_ALIAS_PREBUILT": None,
+    }
+    for key in ALIAS_DEPS:
+        exec(compile(modules[key], key, "exec"), scratch)
+
+    content = {
+        "modules": modules,
+        "tools": {d["name"]: d for d in tool_defs},
+        "alias_index": scratch["TEAM_ALIAS_INDEX"],
+    }
+    raw = json.dumps(content, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    content["version"] = hashlib.sha256(raw).hexdigest()[:16]
+
+    client.put_object(
+        oss.PutObjectRequest(
+            bucket=TOOLS_BUCKET,
+            key=BUNDLE_KEY,
+            body=json.dumps(content, ensure_ascii=False).encode("utf-8")
+        )
+    )
+    return content["version"]
+
+def publish(tool_defs=None, client=None, max_workers=8, rebuild_bundle=False):
+    """
+    显式发布工具：按 hash 与清单比较，只并行上传变了的，再更新清单并重打冷启动包
+    tool_defs 默认为所有已 import 的 @fc 工具；返回上传了的工具名
+    rebuild_bundle 为 True 时工具没变也重打（比如公共依赖刚更新过）
+    """
+    if tool_defs is None:
+        tool_defs = list(TOOL_REGISTRY.values())
+    if client is None:
+        client = create_client()
+
+    published = load_manifest_hashes(client)
+    changed = [
+        d for d in tool_defs
+        if published.get(d["name"]) != tool_hash(d)
+    ]
+    if changed:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            list(pool.map(lambda d: upload_tool(client, d), changed))
+        update_manifest(client, changed)
+    if changed or rebuild_bundle:
+        publish_bundle(client, max_workers)
+    return [d["name"] for d in changed]
+
 def fc(func):
+    """只登记工具定义，不访问网络；上传见 publish()"""
     def wrapper(*args, **kwargs):
         return func(*args, **kwargs)
 
@@ -24,17 +297,6 @@ def fc(func):
         "runtime": "python3.10"
     }
 
-    cfg = oss.config.load_default()
-    cfg.region = "cn-beijing"
-    cfg.credentials_provider = oss.credentials.EnvironmentVariableCredentialsProvider()
-    client = oss.Client(cfg)
-
-    client.put_object(
-        oss.PutObjectRequest(
-            bucket="soccer-tools",
-            key=f"tool/{func.__name__}.json",
-            body=json.dumps(tool_def, ensure_ascii=False).encode("utf-8")
-        )
-    )
+    TOOL_REGISTRY[func.__name__] = tool_def
 
     return wrapper
\ No newline at end of file
@@ -1,16 +1,74 @@
+import base64
+import csv
+import gzip
+import hashlib
+import io
 import json
+import marshal
 import os
+import sys
+import threading
+import time
+import unicodedata
+import urllib.request
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional, Protocol
 
 import alibabacloud_oss_v2 as oss
 
+try:
+    import zstandard as zstd
+except ImportError:
+    zstd = None
+
+try:
+    from pypinyin import lazy_pinyin
+except ImportError:
+    lazy_pinyin = None
+
+# timing.py 由 ali_FC/server/timing.py 生成（sync_shared.py），与 ali_FC 的分段计时共用一份实现
+from timing import timed, span, enable_timing
+
 OSS_REGION = os.environ.get("OSS_REGION", "cn-beijing")
 OSS_ENDPOINT = os.environ.get("OSS_ENDPOINT")
 TOOLS_BUCKET = os.environ.get("TOOLS_BUCKET", "soccer-tools")
 DATA_BUCKET = os.environ.get("DATA_BUCKET", "soccer-data")
+LOG_COMPACT_BYTES = int(os.environ.get("LOG_COMPACT_BYTES", 1024 * 1024))
+LEAGUE_CACHE_SIZE = int(os.environ.get("LEAGUE_CACHE_SIZE", 16))
+# 缓存新鲜期（秒），0 表示每次都用 If-None-Match 重新验证
+LEAGUE_CACHE_TTL = float(os.environ.get("LEAGUE_CACHE_TTL", 0))
+# 未分区联赛的"分区元数据不存在"缓存多久（秒），期间不再为它请求 OSS
+PARTITIONS_MISS_TTL = float(os.environ.get("PARTITIONS_MISS_TTL", 30))
+# 乐观并发写入冲突时的重试次数与初始退避（秒）
+WRITE_MAX_RETRIES = int(os.environ.get("WRITE_MAX_RETRIES", 5))
+WRITE_RETRY_BACKOFF = float(os.environ.get("WRITE_RETRY_BACKOFF", 0.05))
+# 联赛快照写入编码：json / gzip / zstd，读取时自动识别
+# 默认 json：压缩快照没有字节区间索引，单队查询要下载整份快照；迁移见 migrate_leagues.py
+LEAGUE_CODEC = os.environ.get("LEAGUE_CODEC", "json")
+# 冷启动包：公共依赖 + 全部工具打成一个对象，一次 GET 取回，由 publish_tools.py 生成
+BUNDLE_KEY = os.environ.get("BUNDLE_KEY", "bundle/bundle.json")
+# 编译结果按源码哈希缓存在这里，实例内重启时跳过下载和编译
+CODE_CACHE_DIR = os.environ.get("CODE_CACHE_DIR", "/tmp/fc_code_cache")
+
+# 工具清单：{"tools": {name: {"hash": ..., "def": tool_def}}}，由 fc_decorator 维护
+TOOL_MANIFEST_KEY = "tool/manifest.json"
+# 后台轮询工具清单的间隔（秒），0 表示不轮询
+TOOL_MANIFEST_POLL = float(os.environ.get("TOOL_MANIFEST_POLL", 30))
+
+# 按顺序 exec，后面的依赖前面注入的名字
+COMMON_DEPS = [
+    "common/utils/En2Le.py",
+    "common/utils/Ch2En.py",
+    "common/storage/oss_storage.py",
+    "common/utils/team_alias.py",
+]
 
 def create_oss_client():
+    # 离线运行：本地目录代替 OSS，见 local_oss.py
+    if os.environ.get("OSS_LOCAL_DIR"):
+        from local_oss import LocalOSSClient
+        return LocalOSSClient(os.environ["OSS_LOCAL_DIR"])
     cfg = oss.config.load_default()
     cfg.credentials_provider = oss.credentials.EnvironmentVariableCredentialsProvider()
     cfg.region = OSS_REGION
@@ -29,62 +87,250 @@ RUNTIME_GLOBALS = {
     "Dict": Dict,
     "Any": Any,
     "Optional": Optional,
-    "uuid": uuid
+    "uuid": uuid,
+    "io": io,
+    "csv": csv,
+    "urllib": urllib
 }
 
-def preload_common_deps():
-    dep_globals = {
+def compile_cached(source: str, filename: str):
+    """
+    编译源码，code object 按 (Python 版本, 源码) 哈希缓存在 CODE_CACHE_DIR
+    缓存读写失败只影响速度
+    """
+    digest = hashlib.sha256(
+        (sys.version + "\0" + source).encode("utf-8")
+    ).hexdigest()
+    path = os.path.join(CODE_CACHE_DIR, f"{digest}.code")
+
+    try:
+        with open(path, "rb") as f:
+            return marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    code = compile(source, filename, "exec")
+    try:
+        os.makedirs(CODE_CACHE_DIR, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}"
+        with open(tmp, "wb") as f:
+            marshal.dump(code, f)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+    return code
+
+def load_py(key: str) -> str:
+    obj = client.get_object(
+        oss.GetObjectRequest(bucket=TOOLS_BUCKET, key=key)
+    )
+    return obj.body.read().decode("utf-8")
+
+def load_bundle() -> Optional[Dict[str, Any]]:
+    """
+    取冷启动包，/tmp 里有上次的副本时带 If-None-Match，304 直接用本地副本
+    包不存在时返回 None，退回逐个读取
+    """
+    local = os.path.join(CODE_CACHE_DIR, "bundle.json")
+    cached = None
+    try:
+        with open(local, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    req = oss.GetObjectRequest(bucket=TOOLS_BUCKET, key=BUNDLE_KEY)
+    if cached is not None:
+        req.if_none_match = cached["etag"]
+    try:
+        resp = client.get_object(req)
+    except oss.exceptions.ServiceError as e:
+        if e.status_code == 304 and cached is not None:
+            return cached["bundle"]
+        if e.status_code == 404:
+            return None
+        raise
+
+    bundle = json.loads(resp.body.read())
+    try:
+        os.makedirs(CODE_CACHE_DIR, exist_ok=True)
+        with open(local + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"etag": resp.etag, "bundle": bundle}, f, ensure_ascii=False)
+        os.replace(local + ".tmp", local)
+    except OSError:
+        pass
+    return bundle
+
+# 冷启动包里的工具定义：{tool_name: tool_def}
+_BUNDLED_TOOLS = {}
+
+def _dep_globals(alias_index) -> Dict[str, Any]:
+    return {
         "Protocol": Protocol,
         "List": List,
         "Dict": Dict,
         "Any": Any,
+        "Optional": Optional,
         "json": json,
+        "time": time,
+        "gzip": gzip,
+        "zstd": zstd,
+        "hashlib": hashlib,
+        "base64": base64,
+        "uuid": uuid,
+        "unicodedata": unicodedata,
+        "lazy_pinyin": lazy_pinyin,
+        "TEAM_ALIAS_PREBUILT": alias_index,
         "oss": oss
     }
 
-    def load_py(key: str):
-        obj = client.get_object(
-            oss.GetObjectRequest(bucket=TOOLS_BUCKET, key=key)
-        )
-        return obj.body.read().decode("utf-8")
+def preload_common_deps():
+    bundle = load_bundle()
+    dep_globals = _dep_globals(bundle.get("alias_index") if bundle else None)
+
+    if bundle is not None:
+        sources = bundle["modules"]
+        _BUNDLED_TOOLS.update(bundle["tools"])
+    else:
+        # 没有冷启动包：公共依赖并行下载，再按顺序 exec
+        with ThreadPoolExecutor(max_workers=len(COMMON_DEPS)) as pool:
+            sources = dict(zip(COMMON_DEPS, pool.map(load_py, COMMON_DEPS)))
 
-    exec(load_py("common/utils/En2Le.py"), dep_globals)
-    exec(load_py("common/utils/Ch2En.py"), dep_globals)
-    exec(load_py("common/storage/oss_storage.py"), dep_globals)
+    for key in COMMON_DEPS:
+        exec(compile_cached(sources[key], key), dep_globals)
 
     RUNTIME_GLOBALS["TEAM_NAME_MAP"] = dep_globals["TEAM_NAME_MAP"]
     RUNTIME_GLOBALS["TEAM_NAME_MAP1"] = dep_globals["TEAM_NAME_MAP1"]
+    RUNTIME_GLOBALS["resolve_team"] = dep_globals["resolve_team"]
+    RUNTIME_GLOBALS["canonical_team"] = dep_globals["canonical_team"]
+    RUNTIME_GLOBALS["team_league"] = dep_globals["team_league"]
     
     OSSLeagueStorage = dep_globals["OSSLeagueStorage"]
     storage = OSSLeagueStorage(
         client=client,
         bucket=DATA_BUCKET,
+        log_compact_bytes=LOG_COMPACT_BYTES,
+        cache_size=LEAGUE_CACHE_SIZE,
+        cache_ttl=LEAGUE_CACHE_TTL,
+        max_retries=WRITE_MAX_RETRIES,
+        retry_backoff=WRITE_RETRY_BACKOFF,
+        codec=LEAGUE_CODEC,
+        partitions_miss_ttl=PARTITIONS_MISS_TTL,
     )
     RUNTIME_GLOBALS["storage"] = storage
 
 preload_common_deps()
 
+def tool_hash(tool_def: Dict[str, Any]) -> str:
+    """与 fc_decorator.tool_hash 一致"""
+    return hashlib.sha256(
+        json.dumps(tool_def, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+
+def build_tool(tool_def: Dict[str, Any]):
+    locals_dict = {}
+    exec(
+        compile_cached(tool_def["source"], f"tool/{tool_def['name']}.py"),
+        RUNTIME_GLOBALS,
+        locals_dict
+    )
+    return locals_dict[tool_def["name"]]
+
+# {tool_name: (hash, fn)}
+# 只整体替换、不原地修改：正在执行的调用拿着旧函数跑完，新调用拿到新函数
 _TOOL_CACHE = {}
+_TOOL_LOCK = threading.Lock()
+_manifest_etag = None
 
-def load_tool(tool_name: str):
-    if tool_name in _TOOL_CACHE:
-        return _TOOL_CACHE[tool_name]
+def _swap_tools(changes: Dict[str, Any]) -> None:
+    global _TOOL_CACHE
+    with _TOOL_LOCK:
+        _TOOL_CACHE = {**_TOOL_CACHE, **changes}
 
-    obj = client.get_object(
-        oss.GetObjectRequest(
-            bucket=TOOLS_BUCKET,
-            key=f"tool/{tool_name}.json"
-        )
-    )
-    tool_def = json.loads(obj.body.read())
+def refresh_tools() -> bool:
+    """
+    带 If-None-Match 读取工具清单，只重新编译 hash 变了的工具，再整体换入
+    返回是否有工具更新
+    """
+    global _manifest_etag
 
-    locals_dict = {}
-    exec(tool_def["source"], RUNTIME_GLOBALS, locals_dict)
+    req = oss.GetObjectRequest(bucket=TOOLS_BUCKET, key=TOOL_MANIFEST_KEY)
+    if _manifest_etag:
+        req.if_none_match = _manifest_etag
+    try:
+        resp = client.get_object(req)
+    except oss.exceptions.ServiceError as e:
+        if e.status_code in (304, 404):
+            return False
+        raise
+
+    manifest = json.loads(resp.body.read())
+    current = _TOOL_CACHE
+    changes = {
+        name: (entry["hash"], build_tool(entry["def"]))
+        for name, entry in manifest["tools"].items()
+        if current.get(name, (None,))[0] != entry["hash"]
+    }
+    _swap_tools(changes)
+    _manifest_etag = resp.etag
+    return bool(changes)
+
+def _poll_tools() -> None:
+    while True:
+        time.sleep(TOOL_MANIFEST_POLL)
+        try:
+            refresh_tools()
+        except Exception as e:
+            print(f"refresh tool manifest failed: {e}")
+
+def preload_tools() -> None:
+    """
+    冷启动包里有工具时先用包里的，清单在后台线程里校验；
+    否则同步读一次清单，一次取回全部工具
+    """
+    if _BUNDLED_TOOLS:
+        _swap_tools({
+            name: (tool_hash(d), build_tool(d))
+            for name, d in _BUNDLED_TOOLS.items()
+        })
+    else:
+        refresh_tools()
 
-    fn = locals_dict[tool_name]
-    _TOOL_CACHE[tool_name] = fn
+    if TOOL_MANIFEST_POLL > 0:
+        if _BUNDLED_TOOLS:
+            threading.Thread(target=refresh_tools, daemon=True).start()
+        threading.Thread(target=_poll_tools, daemon=True).start()
+
+preload_tools()
+
+def load_tool(tool_name: str):
+    cached = _TOOL_CACHE.get(tool_name)
+    if cached is not None:
+        return cached[1]
+
+    # 清单里还没有的工具（清单之前发布的）单独读取
+    tool_def = json.loads(load_py(f"tool/{tool_name}.json"))
+    fn = build_tool(tool_def)
+    _swap_tools({tool_name: (tool_hash(tool_def), fn)})
     return fn
 
+def run_batch(calls: list) -> list:
+    """
+    按顺序执行一批工具调用
+    每一项返回 {"result": ...} 或 {"error": ...}，单项失败不影响其它项
+    """
+    results = []
+    for call in calls:
+        try:
+            with span("load_tool"):
+                fn = load_tool(call["tool"])
+            with span(f"call.{call['tool']}"):
+                results.append({"result": fn(**call.get("args", {}))})
+        except Exception as e:
+            results.append({"error": str(e)})
+    return results
+
+@timed("handler")
 def handler(event, context):
     try:
         if isinstance(event, (bytes, bytearray)):
@@ -95,6 +341,16 @@ def handler(event, context):
         body = event.get("body") if "body" in event else event
         if isinstance(body, str):
             body = json.loads(body)
+        enable_timing(body)
+
+        # batch 信封与 ali_FC/server/batch.py 一致：{"calls": [{"tool": "...", "args": {...}}, ...]}
+        if "calls" in body:
+            if not isinstance(body["calls"], list):
+                return {"statusCode": 400, "body": json.dumps({"error": "calls must be a list"})}
+            results = run_batch(body["calls"])
+            with span("serialize"):
+                payload = json.dumps({"results": results}, ensure_ascii=False)
+            return {"statusCode": 200, "body": payload}
 
         tool_name = body.get("tool")
         args = body.get("args", {})
@@ -102,11 +358,13 @@ def handler(event, context):
         if not tool_name:
             return {"statusCode": 400, "body": json.dumps({"error": "missing tool name"})}
 
-        args = body.get("args", {})
-
-        fn = load_tool(tool_name)
-        result = fn(**args)
+        with span("load_tool"):
+            fn = load_tool(tool_name)
+        with span("execute"):
+            result = fn(**args)
 
-        return {"statusCode": 200, "body": json.dumps({"result": result}, ensure_ascii=False)}
+        with span("serialize"):
+            payload = json.dumps({"result": result}, ensure_ascii=False)
+        return {"statusCode": 200, "body": payload}
     except Exception as e:
         return {"statusCode": 500, "body": json.dumps({"error": str(e)})}
\ No newline at end of file
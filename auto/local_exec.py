@@ -0,0 +1,117 @@
+import os
+import json
+import hashlib
+import importlib
+import unicodedata
+from typing import List, Dict, Any, Optional
+
+import alibabacloud_oss_v2 as oss
+
+from fc_decorator import TOOL_REGISTRY, TOOLS_BUCKET, create_client
+
+try:
+    from pypinyin import lazy_pinyin
+except ImportError:
+    lazy_pinyin = None
+
+# 工具执行策略：local / remote / auto，例如 "detect_league=local,query_matches=auto"
+# 没写的工具用 DEFAULT_POLICY
+TOOL_EXEC_POLICY = dict(
+    item.split("=", 1)
+    for item in os.getenv("TOOL_EXEC_POLICY", "").replace(" ", "").split(",")
+    if "=" in item
+)
+
+# 纯函数工具：结果只取决于参数和静态映射表
+# 值判断某次调用是否纯，不纯的调用（要读联赛数据）仍然走 FC
+PURE_TOOLS = {
+    "detect_league": lambda args: True,
+    "query_matches": lambda args: args.get("matches") is not None,
+}
+
+DEFAULT_POLICY = {name: "auto" for name in PURE_TOOLS}
+
+# 纯工具用到的公共依赖：映射表和别名索引
+LOCAL_DEPS = [
+    "common/utils/En2Le.py",
+    "common/utils/Ch2En.py",
+    "common/utils/team_alias.py",
+]
+
+_local_globals = None
+_LOCAL_FUNCS = {}
+
+
+def tool_policy(tool_name: str) -> str:
+    return TOOL_EXEC_POLICY.get(tool_name, DEFAULT_POLICY.get(tool_name, "remote"))
+
+
+def _load_globals() -> Dict[str, Any]:
+    """与 handler 注入的名字一致，公共依赖从 OSS 读一次"""
+    global _local_globals
+    if _local_globals is None:
+        client = create_client()
+        g = {
+            "json": json,
+            "List": List,
+            "Dict": Dict,
+            "Any": Any,
+            "Optional": Optional,
+            "hashlib": hashlib,
+            "unicodedata": unicodedata,
+            "lazy_pinyin": lazy_pinyin,
+            "TEAM_ALIAS_PREBUILT": None,
+        }
+        for key in LOCAL_DEPS:
+            obj = client.get_object(oss.GetObjectRequest(bucket=TOOLS_BUCKET, key=key))
+            exec(obj.body.read().decode("utf-8"), g)
+        _local_globals = g
+    return _local_globals
+
+
+def load_local_tool(tool_name: str):
+    """
+    执行与发布到 OSS 同一份的工具源码（tools/ 下 @fc 登记的定义）
+    本地拿不到公共依赖时返回 None
+    """
+    if tool_name not in _LOCAL_FUNCS:
+        try:
+            importlib.import_module(f"tools.{tool_name}")
+            locals_dict = {}
+            exec(TOOL_REGISTRY[tool_name]["source"], _load_globals(), locals_dict)
+            _LOCAL_FUNCS[tool_name] = locals_dict[tool_name]
+        except Exception as e:
+            print(f"[local_exec] {tool_name} unavailable locally, using FC: {e}")
+            _LOCAL_FUNCS[tool_name] = None
+    return _LOCAL_FUNCS[tool_name]
+
+
+def local_tool(tool_name: str, args: dict):
+    """
+    按策略返回本次调用要在本进程执行的函数，返回 None 表示走 FC
+    - remote：总是走 FC
+    - local：总是本地执行，加载失败直接报错
+    - auto：纯调用且本地能加载时本地执行
+    """
+    policy = tool_policy(tool_name)
+    if policy == "remote":
+        return None
+
+    if policy == "local":
+        fn = load_local_tool(tool_name)
+        if fn is None:
+            raise RuntimeError(f"tool {tool_name} is configured local but cannot be loaded")
+        return fn
+
+    is_pure = PURE_TOOLS.get(tool_name)
+    if is_pure is None or not is_pure(args):
+        return None
+    return load_local_tool(tool_name)
+
+
+def run_local(fn, args: dict):
+    """与 FC 调用的返回一致：成功返回 {"result": 函数结果}，失败返回 {"error": ...}"""
+    try:
+        return {"result": fn(**args)}
+    except Exception as e:
+        return {"error": str(e)}
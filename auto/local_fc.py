@@ -0,0 +1,70 @@
+import io
+import os
+import json
+import time
+import uuid
+import asyncio
+import importlib
+import threading
+from types import SimpleNamespace
+
+# 离线运行：FC 调用直接在本进程执行 handler.handler，配合 OSS_LOCAL_DIR 完全不走网络
+# FC_LOCAL_LATENCY_MS 给每次调用加上模拟的网络往返
+FC_LOCAL = os.environ.get("FC_LOCAL", "").lower() in ("1", "true", "yes")
+FC_LOCAL_LATENCY_MS = float(os.environ.get("FC_LOCAL_LATENCY_MS", "0"))
+
+
+def _context(function_name: str) -> SimpleNamespace:
+    """handler 的 context 参数，只带常用字段"""
+    return SimpleNamespace(
+        request_id=str(uuid.uuid4()),
+        function=SimpleNamespace(name=function_name),
+        credentials=None,
+    )
+
+
+def _encode(result) -> bytes:
+    """与 FC 一致：str / bytes 原样返回，其它序列化成 JSON"""
+    if isinstance(result, bytes):
+        return result
+    if isinstance(result, str):
+        return result.encode("utf-8")
+    return json.dumps(result, ensure_ascii=False).encode("utf-8")
+
+
+class LocalFCClient:
+    """
+    进程内的 FC 替身：不论函数名，都交给 handler.handler（auto 只部署这一个函数）
+    handler 在第一次调用时 import，import 时会从 OSS（或 OSS_LOCAL_DIR）预载依赖和工具
+    """
+
+    def __init__(self, latency_ms: float = FC_LOCAL_LATENCY_MS):
+        self.latency = latency_ms / 1000
+        self._handler = None
+        self._lock = threading.Lock()
+
+    def handler(self):
+        with self._lock:
+            if self._handler is None:
+                self._handler = importlib.import_module("handler").handler
+            return self._handler
+
+    def invoke(self, function_name: str, body: bytes) -> bytes:
+        if self.latency:
+            time.sleep(self.latency)
+        return _encode(self.handler()(body, _context(function_name)))
+
+    def invoke_function_with_options(self, function_name, request, headers, runtime):
+        body = request.body.read() if hasattr(request.body, "read") else request.body
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        raw = self.invoke(function_name, body or b"")
+        return SimpleNamespace(status_code=200, headers={}, body=io.BytesIO(raw))
+
+    async def ainvoke(self, function_name: str, body: bytes) -> bytes:
+        """协程版本：handler 在线程里执行，不阻塞事件循环"""
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        handler = await asyncio.to_thread(self.handler)
+        result = await asyncio.to_thread(handler, body, _context(function_name))
+        return _encode(result)
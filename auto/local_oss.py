@@ -0,0 +1,262 @@
+import os
+import io
+import sys
+import fcntl
+import hashlib
+import argparse
+import importlib.util
+import threading
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import alibabacloud_oss_v2 as oss
+
+# 设置 OSS_LOCAL_DIR 后 handler / fc_decorator / local_exec 都用本地目录代替 OSS：
+# {OSS_LOCAL_DIR}/{bucket}/{key}
+
+AUTO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _error(status: int, code: str, key: str) -> oss.exceptions.ServiceError:
+    return oss.exceptions.ServiceError(
+        status_code=status,
+        code=code,
+        request_id="local",
+        message=f"{code}: {key}",
+        ec="",
+        timestamp="",
+        request_target=key,
+    )
+
+
+def _etag(raw: bytes) -> str:
+    return '"%s"' % hashlib.md5(raw).hexdigest().upper()
+
+
+class LocalOSSClient:
+    """
+    文件系统版的 OSS 客户端，只实现本项目用到的接口，语义与 OSS 一致：
+    - get_object：Range、If-Match（412）、If-None-Match（304）
+    - put_object：只支持 forbid_overwrite（已存在时 409 FileAlreadyExists），
+      与 OSS 一样不理会 If-Match 之类的条件头
+    - append_object：position 与当前长度不一致时 409；对 put_object 写入的普通对象追加时
+      409 ObjectNotAppendable（Appendable 标记记在 {root}/.appendable/ 下，不在 bucket 目录里）
+    - head_object（带 object_type）/ delete_object / list_objects_v2_paginator
+    ETag 为内容的 MD5；条件写在文件锁内完成，多进程共用一个目录也安全
+    """
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        self._lock = threading.Lock()
+
+    def _path(self, bucket: str, key: str) -> str:
+        path = os.path.abspath(os.path.join(self.root, bucket, key))
+        if not path.startswith(os.path.join(self.root, bucket) + os.sep):
+            raise _error(400, "InvalidObjectName", key)
+        return path
+
+    @contextmanager
+    def _locked(self):
+        """进程内线程锁 + 跨进程文件锁"""
+        with self._lock:
+            os.makedirs(self.root, exist_ok=True)
+            with open(os.path.join(self.root, ".lock"), "a+") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _appendable_path(self, bucket: str, key: str) -> str:
+        self._path(bucket, key)
+        return os.path.join(self.root, ".appendable", bucket, key)
+
+    def _read(self, bucket: str, key: str) -> bytes:
+        try:
+            with open(self._path(bucket, key), "rb") as f:
+                return f.read()
+        except (FileNotFoundError, IsADirectoryError):
+            raise _error(404, "NoSuchKey", key)
+
+    def _write(self, bucket: str, key: str, raw: bytes) -> None:
+        path = self._path(bucket, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(raw)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _body(request) -> bytes:
+        body = request.body
+        if body is None:
+            return b""
+        if hasattr(body, "read"):
+            body = body.read()
+        return body.encode("utf-8") if isinstance(body, str) else bytes(body)
+
+    def get_object(self, request):
+        raw = self._read(request.bucket, request.key)
+        etag = _etag(raw)
+        if request.if_match and request.if_match != etag:
+            raise _error(412, "PreconditionFailed", request.key)
+        if request.if_none_match and request.if_none_match in (etag, "*"):
+            raise _error(304, "NotModified", request.key)
+
+        if request.range_header:
+            start, _, end = request.range_header[len("bytes="):].partition("-")
+            start = int(start)
+            end = int(end) if end else len(raw) - 1
+            if start >= len(raw):
+                raise _error(416, "InvalidRange", request.key)
+            raw = raw[start:end + 1]
+
+        return SimpleNamespace(
+            status_code=200, body=io.BytesIO(raw), etag=etag, content_length=len(raw)
+        )
+
+    def head_object(self, request):
+        raw = self._read(request.bucket, request.key)
+        etag = _etag(raw)
+        if getattr(request, "if_none_match", None) and request.if_none_match == etag:
+            raise _error(304, "NotModified", request.key)
+        appendable = os.path.exists(self._appendable_path(request.bucket, request.key))
+        return SimpleNamespace(
+            status_code=200, etag=etag, content_length=len(raw),
+            object_type="Appendable" if appendable else "Normal"
+        )
+
+    def put_object(self, request):
+        raw = self._body(request)
+        with self._locked():
+            if request.forbid_overwrite and os.path.exists(self._path(request.bucket, request.key)):
+                raise _error(409, "FileAlreadyExists", request.key)
+            self._write(request.bucket, request.key, raw)
+            self._unmark(request.bucket, request.key)
+        return SimpleNamespace(status_code=200, etag=_etag(raw))
+
+    def _unmark(self, bucket: str, key: str) -> None:
+        try:
+            os.remove(self._appendable_path(bucket, key))
+        except FileNotFoundError:
+            pass
+
+    def append_object(self, request):
+        raw = self._body(request)
+        path = self._path(request.bucket, request.key)
+        marker = self._appendable_path(request.bucket, request.key)
+        with self._locked():
+            exists = os.path.exists(path)
+            if exists and not os.path.exists(marker):
+                raise _error(409, "ObjectNotAppendable", request.key)
+            size = os.path.getsize(path) if exists else 0
+            if int(request.position) != size:
+                raise _error(409, "PositionNotEqualToLength", request.key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.makedirs(os.path.dirname(marker), exist_ok=True)
+            open(marker, "a").close()
+            with open(path, "ab") as f:
+                f.write(raw)
+        return SimpleNamespace(status_code=200, next_position=size + len(raw))
+
+    def delete_object(self, request):
+        with self._locked():
+            try:
+                os.remove(self._path(request.bucket, request.key))
+            except FileNotFoundError:
+                pass
+            self._unmark(request.bucket, request.key)
+        return SimpleNamespace(status_code=204)
+
+    def list_objects_v2_paginator(self, **kwargs):
+        client = self
+
+        class _Paginator:
+            def iter_page(self, request, **kw):
+                base = os.path.join(client.root, request.bucket)
+                keys = []
+                for dirpath, _, filenames in os.walk(base):
+                    for name in filenames:
+                        if name.endswith(".tmp"):
+                            continue
+                        key = os.path.relpath(os.path.join(dirpath, name), base).replace(os.sep, "/")
+                        if key.startswith(request.prefix or ""):
+                            keys.append(key)
+                yield SimpleNamespace(contents=[SimpleNamespace(key=k) for k in sorted(keys)])
+
+        return _Paginator()
+
+
+# ---------- 初始化本地目录 ----------
+
+# 映射表不在仓库里，从可 import 的 common.utils 包复制；本仓库的公共依赖见 fc_decorator.COMMON_SOURCES
+COMMON_MODULES = {
+    "common/utils/Ch2En.py": "common.utils.Ch2En",
+    "common/utils/En2Le.py": "common.utils.En2Le",
+}
+
+
+def seed(client: LocalOSSClient, tools_bucket: str, data_bucket: str, data_dir: str = None) -> None:
+    """
+    把公共依赖和工具写入本地 TOOLS_BUCKET；data_dir 为 ali_FC 的 DATA_DIR 时，
+    联赛快照、分区元数据和变更日志一并复制到 DATA_BUCKET/leagues/（sidecar 索引和积分榜格式不同，不复制）
+    变更日志以 append_object 写入，与线上一样是 Appendable 对象
+    """
+    from fc_decorator import TOOL_REGISTRY, publish, publish_common
+    publish_common(client)
+    for key, module in COMMON_MODULES.items():
+        spec = importlib.util.find_spec(module)
+        if spec is None or not spec.origin:
+            raise RuntimeError(f"{module} is not importable, cannot seed {key}")
+        with open(spec.origin, "rb") as f:
+            client.put_object(oss.PutObjectRequest(bucket=tools_bucket, key=key, body=f.read()))
+
+    for filename in sorted(os.listdir(os.path.join(AUTO_DIR, "tools"))):
+        if filename.endswith(".py") and filename != "__init__.py":
+            importlib.import_module(f"tools.{filename[:-3]}")
+    publish(list(TOOL_REGISTRY.values()), client=client)
+
+    if data_dir:
+        seed_data(client, data_bucket, data_dir)
+
+
+def seed_data(client: LocalOSSClient, data_bucket: str, data_dir: str) -> None:
+    """只复制 ali_FC DATA_DIR 里的联赛数据，规则同 seed"""
+    for dirpath, _, filenames in os.walk(data_dir):
+        for name in filenames:
+            if name.endswith((".index.json", ".standings.json", ".pairs.json", ".tmp", ".compacting")):
+                continue
+            if not name.endswith((".json", ".json.gz", ".json.zst", ".log.jsonl")):
+                continue
+            path = os.path.join(dirpath, name)
+            key = "leagues/" + os.path.relpath(path, data_dir).replace(os.sep, "/")
+            with open(path, "rb") as f:
+                raw = f.read()
+            if name.endswith(".log.jsonl"):
+                client.delete_object(oss.DeleteObjectRequest(bucket=data_bucket, key=key))
+                client.append_object(
+                    oss.AppendObjectRequest(bucket=data_bucket, key=key, position=0, body=raw)
+                )
+            else:
+                client.put_object(oss.PutObjectRequest(bucket=data_bucket, key=key, body=raw))
+
+
+def main():
+    """
+    初始化本地 OSS 目录，之后设置 OSS_LOCAL_DIR 即可离线运行 handler
+    用法：python local_oss.py /tmp/oss [--data-dir ali_FC 的 DATA_DIR]
+    """
+    parser = argparse.ArgumentParser(description="seed a local OSS directory")
+    parser.add_argument("root")
+    parser.add_argument("--data-dir", default=None, help="copy leagues from an ali_FC DATA_DIR")
+    parser.add_argument("--tools-bucket", default=os.environ.get("TOOLS_BUCKET", "soccer-tools"))
+    parser.add_argument("--data-bucket", default=os.environ.get("DATA_BUCKET", "soccer-data"))
+    args = parser.parse_args()
+
+    sys.path.insert(0, AUTO_DIR)
+    seed(LocalOSSClient(args.root), args.tools_bucket, args.data_bucket, args.data_dir)
+    print(f"seeded {args.root}")
+
+
+if __name__ == "__main__":
+    main()
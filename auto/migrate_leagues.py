@@ -0,0 +1,28 @@
+import argparse
+
+from handler import LEAGUE_CODEC, RUNTIME_GLOBALS
+
+
+def main():
+    """
+    把 DATA_BUCKET 里的联赛快照转换成指定编码，变更日志一并合并
+    存储配置与 handler 相同（同样的环境变量），本地调试时设置 OSS_LOCAL_DIR
+    用法：python migrate_leagues.py [--codec gzip] [--partition] [E0 SP1 ...]
+    --partition 同时把单文件联赛按赛季拆分
+    """
+    parser = argparse.ArgumentParser(description="convert league snapshots to another codec")
+    parser.add_argument("leagues", nargs="*", help="league codes, default: all leagues in DATA_BUCKET")
+    parser.add_argument("--codec", choices=("json", "gzip", "zstd"), default=LEAGUE_CODEC)
+    parser.add_argument("--partition", action="store_true", help="split single-file leagues by season")
+    args = parser.parse_args()
+
+    storage = RUNTIME_GLOBALS["storage"]
+    for league in args.leagues or storage.list_leagues():
+        split = args.partition and storage.partition_league(league, args.codec)
+        if not split:
+            storage.migrate(league, args.codec)
+        print(f"{league}: {args.codec}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+import importlib
+import os
+import sys
+
+from fc_decorator import TOOL_REGISTRY, create_client, publish, publish_common
+
+TOOLS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tools")
+
+
+def main():
+    """
+    上传本仓库维护的公共依赖（COMMON_SOURCES，handler 启动时要用），
+    再 import tools/ 下全部工具，只上传源码或签名变了的，并更新 tool/manifest.json
+    有任何改动时重打冷启动包
+    用法：python publish_tools.py [tool_name ...]
+    """
+    client = create_client()
+    common = publish_common(client)
+    print(f"common {len(common)}: {', '.join(common) or '-'}")
+
+    for filename in sorted(os.listdir(TOOLS_DIR)):
+        if filename.endswith(".py") and filename != "__init__.py":
+            importlib.import_module(f"tools.{filename[:-3]}")
+
+    names = sys.argv[1:] or sorted(TOOL_REGISTRY)
+    changed = publish([TOOL_REGISTRY[name] for name in names], client=client, rebuild_bundle=bool(common))
+    print(f"published {len(changed)}/{len(names)}: {', '.join(changed) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,475 @@ class LeagueStorage(Protocol):
     def save_league(self, league: str, data: List[Dict[str, Any]]) -> None:
         ...
 
+    def load_team(
+        self,
+        league: str,
+        team: str,
+        date: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        ...
+
+    def load_team_page(
+        self,
+        league: str,
+        team: str,
+        limit: int,
+        cursor: Optional[str] = None,
+        order: str = "asc"
+    ):
+        ...
+
+    def append_log(
+        self,
+        league: str,
+        op: str,
+        match_id: str,
+        match: Optional[Dict[str, Any]] = None,
+        check=None
+    ) -> Optional[str]:
+        ...
+
+    def add_matches(self, league: str, matches: List[Dict[str, Any]]) -> None:
+        ...
+
+    def create_league(self, league: str, data: List[Dict[str, Any]]) -> bool:
+        ...
+
+    def league_standings(
+        self,
+        league: str,
+        season: Optional[str] = None
+    ):
+        ...
+
+    def pair_matches(
+        self,
+        league: str,
+        team_a: str,
+        team_b: str
+    ) -> List[Dict[str, Any]]:
+        ...
+
+
+class LeagueConflict(Exception):
+    """乐观并发写入在重试次数内仍然冲突"""
+
+
+def _dump_records(data: List[Dict[str, Any]]):
+    """
+    与 json.dumps(indent=2) 输出一致，同时记录每条记录的字节区间
+    """
+    if not data:
+        return b"[]", []
+
+    chunks = [b"[\n"]
+    offsets = []
+    pos = 2
+    for i, m in enumerate(data):
+        text = json.dumps(m, ensure_ascii=False, indent=2)
+        chunk = "\n".join("  " + line for line in text.split("\n")).encode("utf-8")
+        if i:
+            chunks.append(b",\n")
+            pos += 2
+        offsets.append([pos + 2, pos + len(chunk)])
+        chunks.append(chunk)
+        pos += len(chunk)
+    chunks.append(b"\n]")
+    return b"".join(chunks), offsets
+
+
+def _scan_records(text: str):
+    """
+    逐条解析 JSON 数组，顺带算出每条记录的字节区间
+    """
+    decoder = json.JSONDecoder()
+    data = []
+    offsets = []
+
+    i = text.index("[") + 1
+    char_pos = 0
+    byte_pos = 0
+    n = len(text)
+    while True:
+        while i < n and text[i] in " \t\r\n,":
+            i += 1
+        if i >= n or text[i] == "]":
+            break
+        m, end = decoder.raw_decode(text, i)
+
+        byte_pos += len(text[char_pos:i].encode("utf-8"))
+        start_byte = byte_pos
+        byte_pos += len(text[i:end].encode("utf-8"))
+        char_pos = end
+
+        data.append(m)
+        offsets.append([start_byte, byte_pos])
+        i = end
+    return data, offsets
+
+
+# ---------- 快照编码 ----------
+# json：indent=2 的记录数组（旧格式），可以按字节区间只读单条记录
+# gzip / zstd：{"fields": [...], "rows": [[...], ...]} 紧凑列式 JSON 再压缩
+# 读取时按文件头自动识别，不依赖 codec 配置
+
+LEAGUE_CODECS = ("json", "gzip", "zstd")
+# 各编码的快照后缀，压缩快照不用 .json
+LEAGUE_SUFFIXES = {"json": ".json", "gzip": ".json.gz", "zstd": ".json.zst"}
+
+# 单队 Range GET：相邻区间的间隔小于这么多字节时并成一次请求，多传几 KB 比多一次往返便宜
+RANGE_MERGE_GAP = 16 * 1024
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def _league_codec(raw: bytes) -> str:
+    if raw[:2] == _GZIP_MAGIC:
+        return "gzip"
+    if raw[:4] == _ZSTD_MAGIC:
+        return "zstd"
+    return "json"
+
+
+def _require_zstd():
+    if zstd is None:
+        raise RuntimeError("zstd codec requires the zstandard package")
+    return zstd
+
+
+def _encode_league(data: List[Dict[str, Any]], codec: str):
+    """返回 (字节, 每条记录的字节区间)；压缩格式没有区间"""
+    if codec == "json":
+        return _dump_records(data)
+    if codec not in LEAGUE_CODECS:
+        raise ValueError(f"unknown league codec: {codec}")
+
+    fields = []
+    for m in data:
+        for k in m:
+            if k not in fields:
+                fields.append(k)
+    doc = {"fields": fields, "rows": [[m.get(k) for k in fields] for m in data]}
+    raw = json.dumps(doc, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    if codec == "gzip":
+        return gzip.compress(raw), None
+    return _require_zstd().ZstdCompressor().compress(raw), None
+
+
+def _decode_league(raw: bytes) -> List[Dict[str, Any]]:
+    codec = _league_codec(raw)
+    if codec == "json":
+        return json.loads(raw.decode("utf-8"))
+
+    if codec == "gzip":
+        raw = gzip.decompress(raw)
+    else:
+        raw = _require_zstd().ZstdDecompressor().decompress(raw)
+    doc = json.loads(raw.decode("utf-8"))
+    fields = doc["fields"]
+    return [dict(zip(fields, row)) for row in doc["rows"]]
+
+
+def _parse_log(raw: bytes) -> List[Dict[str, Any]]:
+    entries = []
+    for line in raw.decode("utf-8").splitlines():
+        if line.strip():
+            e = json.loads(line)
+            if e.get("op") != "seal":
+                entries.append(e)
+    return entries
+
+
+def _log_digest(raw: bytes) -> str:
+    return hashlib.md5(raw).hexdigest()
+
+
+def _log_seal(raw: bytes) -> Optional[Dict[str, Any]]:
+    """日志末行是 seal 标记时返回它：日志已被封住（见 OSSLeagueStorage._seal_log）"""
+    last = raw.rstrip(b"\n").rpartition(b"\n")[2]
+    if not last.strip():
+        return None
+    e = json.loads(last.decode("utf-8"))
+    return e if e.get("op") == "seal" else None
+
+
+def _involves(m: Dict[str, Any], team: str) -> bool:
+    return team in (
+        TEAM_NAME_MAP.get(m.get("HomeTeam"), m.get("HomeTeam")),
+        TEAM_NAME_MAP.get(m.get("AwayTeam"), m.get("AwayTeam")),
+    )
+
+
+def _apply_log(
+    data: List[Dict[str, Any]],
+    entries: List[Dict[str, Any]],
+    team: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    把变更日志重放到记录列表上，重放是幂等的
+    team 不为空时 data 只是该队的记录，日志也只取与该队相关的部分
+    """
+    if not entries:
+        return data
+
+    data = list(data)
+    pos = {str(m.get("match_id")): i for i, m in enumerate(data)}
+
+    for e in entries:
+        op = e.get("op")
+        match_id = str(e.get("match_id"))
+        m = e.get("match")
+        i = pos.get(match_id)
+
+        if op != "delete" and team is not None and not _involves(m, team):
+            op = "delete"
+
+        if op == "delete":
+            if i is not None:
+                data[i] = None
+                del pos[match_id]
+        elif i is not None:
+            data[i] = m
+        elif op == "add":
+            pos[match_id] = len(data)
+            data.append(m)
+
+    return [m for m in data if m is not None]
+
+
+def _copy_rows(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """记录都是扁平的 dict，逐条浅拷贝即可与缓存隔离"""
+    return [dict(m) for m in rows]
+
+
+def _span_groups(spans, gap: int):
+    """把按偏移排好的 [start, end) 区间并成若干组，组内相邻区间的间隔不超过 gap"""
+    groups = []
+    for span in spans:
+        if groups and span[0] - groups[-1][-1][1] <= gap:
+            groups[-1].append(span)
+        else:
+            groups.append([span])
+    return groups
+
+
+def _build_index(data: List[Dict[str, Any]], offsets) -> Dict[str, Any]:
+    teams = {}
+    for m, span in zip(data, offsets):
+        home = TEAM_NAME_MAP.get(m.get("HomeTeam"), m.get("HomeTeam"))
+        away = TEAM_NAME_MAP.get(m.get("AwayTeam"), m.get("AwayTeam"))
+        teams.setdefault(home, []).append(span)
+        if away != home:
+            teams.setdefault(away, []).append(span)
+    return teams
+
+
+def season_of(date) -> str:
+    """
+    赛季从 7 月开始：2024-08-10 -> "2024-2025"，2025-03-01 -> "2024-2025"
+    支持 YYYY-MM-DD 与 dd/mm/yy(yy)，无法识别的归到 "unknown"
+    """
+    try:
+        date = str(date)
+        if "/" in date:
+            _, month, year = date.split("/")
+            year = int(year)
+            if year < 100:
+                year += 2000
+        else:
+            year, month = date.split("-")[:2]
+            year = int(year)
+        month = int(month)
+    except ValueError:
+        return "unknown"
+
+    start = year if month >= 7 else year - 1
+    return f"{start}-{start + 1}"
+
+
+def partition_name(league: str, season: str) -> str:
+    """分区可以直接当作联赛名使用，对应 leagues/{league}/{season}.json"""
+    return f"{league}/{season}"
+
+
+def _team_set(data: List[Dict[str, Any]]) -> List[str]:
+    teams = set()
+    for m in data:
+        teams.add(TEAM_NAME_MAP.get(m.get("HomeTeam"), m.get("HomeTeam")))
+        teams.add(TEAM_NAME_MAP.get(m.get("AwayTeam"), m.get("AwayTeam")))
+    teams.discard(None)
+    return sorted(teams)
+
+
+# ---------- 物化视图 ----------
+# leagues/{league}.{view}.json，与快照（分区联赛为每个赛季分区）一一对应，
+# stamp 为 [快照 ETag, 已计入的日志长度]
+
+VIEW_VERSION = 1
+
+
+# ---------- 积分榜 ----------
+#   matches：{match_id: [赛季, 日期, 主队, 客队, 主队进球, 客队进球]}，没有比分的比赛为 null
+#   tables：{赛季: {球队: [场次, 胜, 平, 负, 进球, 失球, 积分]}}
+#   form：{赛季: {球队: [[日期, match_id, "W" / "D" / "L"], ...]}}，按日期排序
+
+STANDING_FIELDS = ["played", "won", "drawn", "lost", "goals_for", "goals_against", "points"]
+
+_POINTS = {"W": 3, "D": 1, "L": 0}
+
+
+def _date_key(date) -> str:
+    """dd/mm/yy(yy) 转成 YYYY-MM-DD，按字符串排序即按日期排序"""
+    date = "" if date is None else str(date)
+    if "/" in date:
+        try:
+            day, month, year = date.split("/")
+            year = int(year)
+            if year < 100:
+                year += 2000
+            return f"{year:04d}-{int(month):02d}-{int(day):02d}"
+        except ValueError:
+            pass
+    return date
+
+
+def _encode_cursor(order: str, key) -> str:
+    raw = json.dumps([order, *key], ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def _decode_cursor(cursor: str, order: str):
+    try:
+        cursor_order, date, match_id = json.loads(base64.urlsafe_b64decode(cursor))
+    except (ValueError, TypeError):
+        raise ValueError("invalid cursor")
+    if cursor_order != order:
+        raise ValueError(f"cursor was issued for order={cursor_order}")
+    return (date, match_id)
+
+
+def _standing_row(m: Dict[str, Any]):
+    """一场比赛对积分榜的贡献；没有比分（未开赛）时返回 None"""
+    try:
+        home_goals, away_goals = int(m.get("FTHG")), int(m.get("FTAG"))
+    except (TypeError, ValueError):
+        return None
+    return [
+        season_of(m.get("Date")), _date_key(m.get("Date")),
+        TEAM_NAME_MAP.get(m.get("HomeTeam"), m.get("HomeTeam")),
+        TEAM_NAME_MAP.get(m.get("AwayTeam"), m.get("AwayTeam")),
+        home_goals, away_goals,
+    ]
+
+
+def _count_row(state: Dict[str, Any], match_id: str, row: list, sign: int) -> None:
+    """sign 为 1 时计入一场比赛，为 -1 时撤销"""
+    season, date, home, away, home_goals, away_goals = row
+    table = state["tables"].setdefault(season, {})
+    form = state["form"].setdefault(season, {})
+
+    for team, goals_for, goals_against in ((home, home_goals, away_goals), (away, away_goals, home_goals)):
+        if goals_for > goals_against:
+            outcome = "W"
+        else:
+            outcome = "D" if goals_for == goals_against else "L"
+        delta = [1, outcome == "W", outcome == "D", outcome == "L", goals_for, goals_against, _POINTS[outcome]]
+        stats = [a + sign * int(b) for a, b in zip(table.get(team, [0] * 7), delta)]
+
+        results = form.setdefault(team, [])
+        if sign > 0:
+            results.append([date, match_id, outcome])
+            results.sort()
+        else:
+            results.remove([date, match_id, outcome])
+
+        if stats[0]:
+            table[team] = stats
+        else:
+            table.pop(team, None)
+            form.pop(team, None)
+
+    if not table:
+        del state["tables"][season]
+        del state["form"][season]
+
+
+def _apply_standings(state: Dict[str, Any], entry: Dict[str, Any]) -> None:
+    """按 _apply_log 的语义重放一条变更：add 新增或覆盖，update 只改已有的比赛，delete 幂等"""
+    op = entry.get("op")
+    match_id = str(entry.get("match_id"))
+    if op == "update" and match_id not in state["matches"]:
+        return
+
+    old = state["matches"].pop(match_id, None)
+    if old is not None:
+        _count_row(state, match_id, old, -1)
+    if op == "delete":
+        return
+
+    row = _standing_row(entry.get("match") or {})
+    state["matches"][match_id] = row
+    if row is not None:
+        _count_row(state, match_id, row, 1)
+
+
+def _empty_standings() -> Dict[str, Any]:
+    return {"matches": {}, "tables": {}, "form": {}}
+
+
+# ---------- 对阵索引 ----------
+#   pairs：{"队A|队B": [match_id, ...]}，两队按名字排序，不分主客
+#   matches：{match_id: 对阵键}，删除 / 修改时据此找到原来的对阵
+
+def pair_key(team_a: str, team_b: str) -> str:
+    return "|".join(sorted((str(team_a), str(team_b))))
+
+
+def _apply_pairs(state: Dict[str, Any], entry: Dict[str, Any]) -> None:
+    """按 _apply_log 的语义重放一条变更"""
+    op = entry.get("op")
+    match_id = str(entry.get("match_id"))
+    if op == "update" and match_id not in state["matches"]:
+        return
+
+    old = state["matches"].pop(match_id, None)
+    if old is not None:
+        ids = state["pairs"][old]
+        ids.remove(match_id)
+        if not ids:
+            del state["pairs"][old]
+    if op == "delete":
+        return
+
+    m = entry.get("match") or {}
+    key = pair_key(
+        TEAM_NAME_MAP.get(m.get("HomeTeam"), m.get("HomeTeam")),
+        TEAM_NAME_MAP.get(m.get("AwayTeam"), m.get("AwayTeam")),
+    )
+    state["matches"][match_id] = key
+    state["pairs"].setdefault(key, []).append(match_id)
+
+
+def _empty_pairs() -> Dict[str, Any]:
+    return {"pairs": {}, "matches": {}}
+
+
+# 视图名 -> (空状态, 重放一条变更)
+VIEWS = {
+    "standings": (_empty_standings, _apply_standings),
+    "pairs": (_empty_pairs, _apply_pairs),
+}
+
+
+def _build_view(view: str, data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    empty, apply = VIEWS[view]
+    state = empty()
+    for m in data:
+        apply(state, {"op": "add", "match_id": m.get("match_id"), "match": m})
+    return state
+
 
 class OSSLeagueStorage:
     """
@@ -17,34 +486,1101 @@ class OSSLeagueStorage:
       - client
       - oss
       - json
+      - time
+      - gzip
+      - zstd（可为 None）
+      - base64
+      - uuid
+      - hashlib
+      - TEAM_NAME_MAP
     由 handler 注入
+
+    快照按 codec 编码写入（见 LEAGUE_CODECS），读取时自动识别；
+    默认 json，压缩快照的 key 带 .json.gz / .json.zst 后缀（见 _key）
+
+    每个 leagues/{league}.json 旁边有一个 leagues/{league}.index.json，
+    记录 队名 -> 字节区间 以及对应数据对象的 ETag；压缩快照没有字节区间，teams 为 null
+
+    单场比赛的增删改只追加到 leagues/{league}.log.jsonl（Appendable 对象），
+    读取时叠加到基础快照上，超过 log_compact_bytes 后合并回快照
+    改写快照前先在日志末尾追加一行 seal 标记把它封住，之后的追加看到标记就等待，
+    日志里的条目全部写进快照后才删除日志；封住的实例超过 log_seal_timeout 秒未释放时由别的实例接手
+
+    解析后的对象按 ETag 缓存在进程内（LRU，最多 cache_size 个）：
+    cache_ttl 秒内直接用缓存，过期后带 If-None-Match 重新验证，304 时不再下载
+
+    联赛也可以按赛季分区：leagues/{league}/{season}.json，每个分区有自己的索引和日志，
+    leagues/{league}/_partitions.json 记录每个赛季出场的球队，单队 / 按日期查询只读相关分区；
+    load_league 仍返回拼接好的完整列表
+
+    写入是乐观并发的，冲突时重新读取、重新校验，指数退避后重试，最多 max_retries 次
+    OSS 的 PutObject 没有 If-Match，只有 forbid_overwrite（只在不存在时创建）；
+    能当作比较条件的只有 AppendObject 的 position，所以：
+      - 日志按读到的长度作为 position 追加，seal 标记同样靠追加写入，与别的追加互斥
+      - 快照只有封住日志的实例才会改写：封住之后 HEAD 比较 ETag 再覆盖
+      - 分区元数据用租约对象 {key}.lease 互斥（见 _acquire），持有者 HEAD 比较后再覆盖
+      - 新建快照 / 元数据 / 视图用 forbid_overwrite
+    剩下的竞态：封住日志或持有租约的实例停顿超过 log_seal_timeout 秒后被别的实例接手，
+    它醒来后的那次覆盖仍会写入（last-writer-wins）；视图是 (状态, stamp) 一致的整体，
+    被覆盖只会让读取时多补一段日志
+
+    每个快照旁边还有物化视图 leagues/{league}.{view}.json（积分榜、对阵索引，见 VIEWS），
+    记录它对应的 (快照 ETag, 日志长度)：追加一条变更时在原结果上增减，读取时补上之后的日志，
+    快照被整表改写后才全量重算
     """
 
-    def __init__(self, client, bucket: str):
+    def __init__(
+        self,
+        client,
+        bucket: str,
+        log_compact_bytes: int = 1024 * 1024,
+        cache_size: int = 16,
+        cache_ttl: float = 0.0,
+        max_retries: int = 5,
+        retry_backoff: float = 0.05,
+        codec: str = "json",
+        partitions_miss_ttl: float = 30.0,
+        log_seal_timeout: float = 60.0
+    ):
         self.client = client
         self.bucket = bucket
+        self.log_compact_bytes = log_compact_bytes
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.partitions_miss_ttl = partitions_miss_ttl
+        self.log_seal_timeout = log_seal_timeout
+        if codec not in LEAGUE_CODECS:
+            raise ValueError(f"unknown league codec: {codec}")
+        self.codec = codec
+        # {key: (etag, 校验时间, 解析结果)}，dict 的插入顺序即 LRU 顺序
+        self._cache = {}
+        # {league: 实际存在的快照 key}，见 _key
+        self._base_keys = {}
+
+    def _base_key(self, league: str, codec: str) -> str:
+        return f"leagues/{league}{LEAGUE_SUFFIXES[codec]}"
 
     def _key(self, league: str) -> str:
-        return f"leagues/{league}.json"
+        """
+        快照 key，后缀随编码
+        已确定过的用记下的 key，否则先按 self.codec 猜，读到 404 时再列一次前缀确定（见 _on_base）
+        """
+        return self._base_keys.get(league) or self._base_key(league, self.codec)
+
+    def _resolve_key(self, league: str) -> str:
+        """列出 leagues/{league}.json* 确定快照实际的 key；还没有快照时按 self.codec"""
+        found = set()
+        paginator = self.client.list_objects_v2_paginator()
+        for page in paginator.iter_page(
+            oss.ListObjectsV2Request(bucket=self.bucket, prefix=self._base_key(league, "json"))
+        ):
+            found.update(obj.key for obj in page.contents or [])
+        for codec in (self.codec, *LEAGUE_CODECS):
+            if self._base_key(league, codec) in found:
+                self._base_keys[league] = self._base_key(league, codec)
+                return self._base_keys[league]
+        self._base_keys.pop(league, None)
+        return self._base_key(league, self.codec)
+
+    def _on_base(self, league: str, read):
+        """read() 读快照遇到 404 时重新确定快照 key（可能被别的实例换了编码），换了就再读一次"""
+        key = self._key(league)
+        try:
+            return read()
+        except oss.exceptions.ServiceError as e:
+            if e.status_code != 404 or self._resolve_key(league) == key:
+                raise
+        return read()
+
+    def _index_key(self, league: str) -> str:
+        return f"leagues/{league}.index.json"
+
+    def _log_key(self, league: str) -> str:
+        return f"leagues/{league}.log.jsonl"
+
+    def _manifest_key(self, league: str) -> str:
+        return f"leagues/{league}/_partitions.json"
+
+    def _view_key(self, league: str, view: str) -> str:
+        return f"leagues/{league}.{view}.json"
+
+    # ---------- ETag 缓存 ----------
+
+    def _remember(self, key: str, etag: str, value) -> None:
+        self._cache.pop(key, None)
+        self._cache[key] = (etag, time.monotonic(), value)
+        while len(self._cache) > self.cache_size:
+            self._cache.pop(next(iter(self._cache)))
+
+    def _cached(self, key: str):
+        """返回缓存的 (etag, 解析结果)，不做校验"""
+        cached = self._cache.get(key)
+        return None if cached is None else (cached[0], cached[2])
+
+    def _get_cached(self, key: str, parse):
+        return self._get_versioned(key, parse)[1]
+
+    def _get_versioned(self, key: str, parse):
+        """返回 (ETag, 解析结果)；ETag 随结果一起返回，cache_size 为 0 或已被挤出缓存时也拿得到"""
+        cached = self._cache.get(key)
+        if cached is not None and time.monotonic() - cached[1] < self.cache_ttl:
+            self._remember(key, cached[0], cached[2])
+            return cached[0], cached[2]
+
+        req = oss.GetObjectRequest(bucket=self.bucket, key=key)
+        if cached is not None:
+            req.if_none_match = cached[0]
+        try:
+            resp = self.client.get_object(req)
+        except oss.exceptions.ServiceError as e:
+            if e.status_code == 304 and cached is not None:
+                self._remember(key, cached[0], cached[2])
+                return cached[0], cached[2]
+            self._cache.pop(key, None)
+            raise
+
+        value = parse(resp.body.read())
+        self._remember(key, resp.etag, value)
+        return resp.etag, value
+
+    def _load_base(self, league: str) -> List[Dict[str, Any]]:
+        return self._load_base_versioned(league)[1]
+
+    def _load_base_versioned(self, league: str):
+        """返回 (快照 ETag, 记录)，记录是缓存里的对象，不能修改"""
+        return self._on_base(league, lambda: self._get_versioned(self._key(league), _decode_league))
+
+    def load_league_versioned(self, league: str):
+        """
+        返回 (完整记录, 版本)
+        版本 = {分区: (快照 ETag, 已读日志长度, 已读日志的摘要)}，交给 save_league 做写前校验
+        """
+        data = []
+        version = {}
+        for part in self._parts(league):
+            entries, length, _, digest = self._log_parsed(part)
+            etag, base = self._load_base_versioned(part)
+            version[part] = (etag, length, digest)
+            data.extend(_apply_log(base, entries))
+        # 缓存里的记录不能交给调用方修改
+        return _copy_rows(data), version
 
     def load_league(self, league: str) -> List[Dict[str, Any]]:
+        return self.load_league_versioned(league)[0]
+
+    def save_league(
+        self,
+        league: str,
+        data: List[Dict[str, Any]],
+        version=None,
+        codec: Optional[str] = None
+    ) -> None:
+        """
+        整表写回，data 已包含读取时的日志，分区联赛按赛季重新分区
+        带上 load_league_versioned 的 version 时每个快照先比较 ETag 再写入，
+        期间被别处改写过就抛 LeagueConflict；读取之后别处追加的日志会保留下来
+        """
+        manifest_etag, partitions = self._load_partitions_versioned(league)
+        if partitions is None:
+            self._save_part(league, data, version, codec)
+        else:
+            self._save_partitioned(league, data, version, codec, partitions, manifest_etag)
+
+    def _save_part(self, part: str, data, version, codec) -> None:
+        """
+        先封住日志再写快照：读取之后别处追加的条目（length 之后）一并写进快照，
+        封住之后的追加要等日志删除后才能成功，不会落在要删除的日志里
+        length 为 None 表示整个日志都已包含在 data 里
+        读取之后日志被合并过（删掉后重新开始追加）时 raw[length:] 不是读取之后的条目，按冲突处理
+        """
+        etag, length, digest = (version or {}).get(part, (None, None, None))
+        raw, sealed = self._seal_log(part)
+        try:
+            if length is not None and _log_digest(raw[:length]) != digest:
+                raise LeagueConflict(f"league {part} log was compacted concurrently")
+            tail = _parse_log(raw[length:]) if length is not None else []
+            self._save_base(part, _apply_log(data, tail), if_match=etag, codec=codec)
+        except LeagueConflict:
+            # 快照或日志已被别处改写：封住的条目合并进最新快照、释放日志后再交给调用方重试
+            self._fold_log(part, raw, sealed)
+            raise
+        self._release_log(part, sealed)
+
+    def _save_partitioned(
+        self, league: str, data, version, codec, partitions, manifest_etag: Optional[str] = None
+    ) -> None:
+        """manifest_etag 为空时新建分区元数据"""
+        by_season = {}
+        for m in data:
+            by_season.setdefault(season_of(m.get("Date")), []).append(m)
+
+        for season, rows in by_season.items():
+            self._save_part(partition_name(league, season), rows, version, codec)
+        self._save_partitions(
+            league,
+            {s: _team_set(rows) for s, rows in by_season.items()},
+            if_match=manifest_etag
+        )
+        for season in partitions or {}:
+            if season not in by_season:
+                self._remove_part(partition_name(league, season))
+
+    def _remove_part(self, part: str, keep_log: bool = False) -> None:
+        self._base_keys.pop(part, None)
+        for key in (
+            *(self._base_key(part, codec) for codec in LEAGUE_CODECS), self._index_key(part),
+            *(() if keep_log else (self._log_key(part),)),
+            *(self._view_key(part, view) for view in VIEWS)
+        ):
+            self._cache.pop(key, None)
+            self.client.delete_object(oss.DeleteObjectRequest(bucket=self.bucket, key=key))
+
+    def partition_league(self, league: str, codec: Optional[str] = None) -> bool:
+        """
+        把单文件联赛按赛季拆分，变更日志一并合并；已经分区时返回 False
+        旧日志封成不会过期的墓碑（moved）留着：拆分期间和之后还按旧布局追加的变更
+        都会 409，append_log 重新读分区元数据后按日期路由
+        """
+        if self._load_partitions(league) is not None:
+            return False
+        # 先封住再读，封住之后快照和日志都不会再变
+        raw, _ = self._seal_log(league, moved=True)
+        self._cache.pop(self._key(league), None)
+        data = _apply_log(self._load_base(league), _parse_log(raw))
+        self._save_partitioned(league, data, None, codec, {})
+        self._remove_part(league, keep_log=True)
+        return True
+
+    def update_league(self, league: str, mutate, codec: Optional[str] = None):
+        """
+        乐观并发的读-改-写
+        mutate(data) 返回要写回的记录列表，返回 None 表示不写
+        冲突时重新读取、重新执行 mutate，退避后重试
+        """
+        for attempt in range(self.max_retries):
+            data, version = self.load_league_versioned(league)
+            new_data = mutate(data)
+            if new_data is None:
+                return None
+            try:
+                self.save_league(league, new_data, version=version, codec=codec)
+                return new_data
+            except LeagueConflict:
+                self._backoff(attempt)
+        raise LeagueConflict(f"league {league} is being modified concurrently, gave up")
+
+    def list_leagues(self) -> List[str]:
+        leagues = []
+        paginator = self.client.list_objects_v2_paginator()
+        for page in paginator.iter_page(
+            oss.ListObjectsV2Request(bucket=self.bucket, prefix="leagues/")
+        ):
+            for obj in page.contents or []:
+                name = obj.key[len("leagues/"):]
+                if "/" in name:
+                    if name.endswith("/_partitions.json"):
+                        leagues.append(name.split("/")[0])
+                elif name.endswith(tuple(LEAGUE_SUFFIXES.values())) and not name.endswith(
+                    (".index.json", *(f".{view}.json" for view in VIEWS))
+                ):
+                    leagues.append(name[:name.rindex(".json")])
+        # 换编码期间新旧两个 key 可能同时存在
+        return list(dict.fromkeys(leagues))
+
+    def migrate(self, league: str, codec: Optional[str] = None) -> None:
+        """把快照改写成 codec（默认 self.codec）编码，变更日志一并合并"""
+        self.update_league(league, lambda data: data, codec=codec or self.codec)
+
+    def _backoff(self, attempt: int) -> None:
+        time.sleep(self.retry_backoff * (2 ** attempt))
+
+    def _save_base(
+        self,
+        league: str,
+        data: List[Dict[str, Any]],
+        if_match: Optional[str] = None,
+        codec: Optional[str] = None,
+        create: bool = False
+    ) -> str:
+        """
+        返回新快照的 ETag
+        if_match：只覆盖该版本（调用方封住日志后 HEAD 比较）；create：只在对象不存在时创建（forbid_overwrite）
+        不指定 codec 时沿用现有快照的编码；编码变了就写到新后缀的 key 再删掉旧 key，调用方都先封住了日志，期间不会有别的快照写入
+        """
+        old = self._base_keys.get(league) or self._resolve_key(league)
+        if codec is None:
+            # 不指定时沿用现有快照的编码，只有 migrate 会换编码
+            codec = next(c for c in (self.codec, *LEAGUE_CODECS) if self._base_key(league, c) == old)
+        raw, offsets = _encode_league(data, codec)
+        key = self._base_key(league, codec)
+        switch = old != key and league in self._base_keys
+        if create and switch:
+            raise LeagueConflict(f"league {league} already exists")
+        # 覆盖快照的调用方都先封住了日志，HEAD 比较与覆盖之间不会有别的快照写入
+        if if_match and self._base_etag(league) != if_match:
+            self._cache.pop(old, None)
+            raise LeagueConflict(f"league {league} was modified concurrently")
+
+        req = oss.PutObjectRequest(
+            bucket=self.bucket,
+            key=key,
+            body=raw,
+            forbid_overwrite=True if create else None
+        )
+        try:
+            resp = self.client.put_object(req)
+        except oss.exceptions.ServiceError as e:
+            if e.status_code == 409 and create:
+                self._cache.pop(key, None)
+                raise LeagueConflict(f"league {league} already exists")
+            raise
+        self._base_keys[league] = key
+        if switch:
+            self._cache.pop(old, None)
+            self.client.delete_object(oss.DeleteObjectRequest(bucket=self.bucket, key=old))
+        self._remember(key, resp.etag, _copy_rows(data))
+        self._save_index(
+            league,
+            resp.etag,
+            None if offsets is None else _build_index(data, offsets)
+        )
+        return resp.etag
+
+    def _save_index(self, league: str, etag: str, teams: Optional[Dict[str, Any]]) -> None:
+        index = {"etag": etag, "teams": teams}
+        resp = self.client.put_object(
+            oss.PutObjectRequest(
+                bucket=self.bucket,
+                key=self._index_key(league),
+                body=json.dumps(index, ensure_ascii=False).encode("utf-8")
+            )
+        )
+        self._remember(self._index_key(league), resp.etag, index)
+
+    def _load_index(self, league: str) -> Optional[Dict[str, Any]]:
+        try:
+            return self._get_cached(
+                self._index_key(league),
+                lambda raw: json.loads(raw.decode("utf-8"))
+            )
+        except oss.exceptions.ServiceError as e:
+            if e.status_code == 404:
+                return None
+            raise
+
+    # ---------- 赛季分区 ----------
+
+    def _load_partitions(self, league: str) -> Optional[Dict[str, List[str]]]:
+        """
+        {season: [球队...]}，未分区的联赛返回 None
+        不存在也记进缓存（ETag 为 None），partitions_miss_ttl 秒内不再请求；
+        别的实例在这期间把联赛分区了，最多晚这么久才看到
+        """
+        return self._load_partitions_versioned(league)[1]
+
+    def _load_partitions_versioned(self, league: str):
+        """返回 (元数据 ETag, 分区)，未分区时为 (None, None)"""
+        key = self._manifest_key(league)
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] is None:
+            if time.monotonic() - cached[1] < self.partitions_miss_ttl:
+                return None, None
+            self._cache.pop(key, None)
+
+        try:
+            return self._get_versioned(
+                key,
+                lambda raw: json.loads(raw.decode("utf-8"))["partitions"]
+            )
+        except oss.exceptions.ServiceError as e:
+            if e.status_code == 404:
+                self._remember(key, None, None)
+                return None, None
+            raise
+
+    def _save_partitions(self, league: str, partitions, if_match: Optional[str] = None) -> None:
+        """
+        if_match 为空时只在元数据不存在时创建（forbid_overwrite）；
+        否则持有租约时 HEAD 比较 ETag，一致才覆盖
+        """
+        key = self._manifest_key(league)
+        req = oss.PutObjectRequest(
+            bucket=self.bucket,
+            key=key,
+            body=json.dumps(
+                {"version": 1, "partitions": partitions}, ensure_ascii=False
+            ).encode("utf-8"),
+            forbid_overwrite=None if if_match else True
+        )
+        lease = self._acquire(key) if if_match else None
+        try:
+            if lease is not None and self._head_etag(key) != if_match:
+                raise LeagueConflict(f"league {league} partitions were modified concurrently")
+            resp = self.client.put_object(req)
+        except oss.exceptions.ServiceError as e:
+            if e.status_code != 409:
+                raise
+            raise LeagueConflict(f"league {league} partitions were modified concurrently")
+        except LeagueConflict:
+            self._cache.pop(key, None)
+            raise
+        finally:
+            if lease is not None:
+                self._release(key, lease)
+        self._remember(key, resp.etag, partitions)
+
+    def _parts(
+        self,
+        league: str,
+        team: Optional[str] = None,
+        date: Optional[str] = None,
+        partitions=None
+    ) -> List[str]:
+        """需要读取的分区；传入 team / date 时跳过不可能包含结果的赛季"""
+        if partitions is None:
+            partitions = self._load_partitions(league)
+        if partitions is None:
+            return [league]
+
+        seasons = sorted(partitions)
+        if date:
+            seasons = [s for s in seasons if s == season_of(date)]
+        if team is not None:
+            seasons = [s for s in seasons if team in partitions[s]]
+        return [partition_name(league, s) for s in seasons]
+
+    def _route(self, league: str, match: Dict[str, Any]) -> str:
+        """
+        单场比赛写入所属赛季的分区
+        新赛季或新球队先登记到分区元数据（持有租约时比较 ETag 后写入），保证剪枝时不会漏掉
+        """
+        season = season_of(match.get("Date"))
+        part = partition_name(league, season)
+        match_teams = {
+            TEAM_NAME_MAP.get(match.get("HomeTeam"), match.get("HomeTeam")),
+            TEAM_NAME_MAP.get(match.get("AwayTeam"), match.get("AwayTeam")),
+        }
+
+        for attempt in range(self.max_retries):
+            manifest_etag, partitions = self._load_partitions_versioned(league)
+            teams = set(partitions.get(season, []))
+            if season in partitions and match_teams <= teams:
+                return part
+
+            if season not in partitions:
+                try:
+                    self._save_base(part, [], create=True)
+                except LeagueConflict:
+                    # 别的实例已经建好了
+                    pass
+            try:
+                self._save_partitions(
+                    league,
+                    dict(partitions, **{season: sorted(teams | match_teams)}),
+                    if_match=manifest_etag
+                )
+                return part
+            except LeagueConflict:
+                self._backoff(attempt)
+
+        raise LeagueConflict(f"league {league} partitions are being modified concurrently, gave up")
+
+    def load_team(
+        self,
+        league: str,
+        team: str,
+        date: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        只取某支球队（规范队名）的原始记录
+        分区联赛只读该队出场过的赛季，传 date 时只读该日期所在的赛季
+        """
+        rows = []
+        for part in self._parts(league, team, date):
+            rows.extend(self._on_base(part, lambda: self._load_team_part(part, team)))
+        return _copy_rows(rows)
+
+    def load_team_page(
+        self,
+        league: str,
+        team: str,
+        limit: int,
+        cursor: Optional[str] = None,
+        order: str = "asc"
+    ):
+        """
+        按 (日期, match_id) 排序分页读取某队的记录，返回 (本页记录, next_cursor)
+        游标是上一页最后一条的排序键，实例之间不需要共享状态；next_cursor 为 None 时已是最后一页
+        分区联赛按赛季顺序读取（"unknown" 分区总是最先读）：跳过游标之前的赛季，
+        凑满一页后不再读之后的赛季
+        """
+        if order not in ("asc", "desc"):
+            raise ValueError("order must be one of ('asc', 'desc')")
+        desc = order == "desc"
+        after = _decode_cursor(cursor, order) if cursor else None
+
+        parts = self._parts(league, team)
+        unknown = partition_name(league, "unknown")
+        if parts != [league]:
+            if after is not None and season_of(after[0]) != "unknown":
+                start = partition_name(league, season_of(after[0]))
+                parts = [p for p in parts if p == unknown or (p <= start if desc else p >= start)]
+            if desc:
+                parts.reverse()
+            # "unknown" 分区的日期归不进赛季，排序键与各赛季没有先后关系：最先读，提前停止时不会漏掉
+            if unknown in parts:
+                parts.remove(unknown)
+                parts.insert(0, unknown)
+
+        keyed = []
+        for part in parts:
+            # 排第 limit + 1 的记录所在赛季已经在这个赛季之前：之后赛季的记录都排在它后面
+            if len(keyed) > limit and part != unknown:
+                keyed.sort(key=lambda km: km[0], reverse=desc)
+                worst = season_of(keyed[limit][0][0])
+                season = part[len(league) + 1:]
+                if worst != "unknown" and (season < worst if desc else season > worst):
+                    break
+            for m in self._on_base(part, lambda: self._load_team_part(part, team)):
+                key = (_date_key(m.get("Date")), str(m.get("match_id")))
+                if after is None or (key < after if desc else key > after):
+                    keyed.append((key, m))
+
+        keyed.sort(key=lambda km: km[0], reverse=desc)
+        page = keyed[:limit]
+        next_cursor = _encode_cursor(order, page[-1][0]) if len(keyed) > limit else None
+        return _copy_rows([m for _, m in page]), next_cursor
+
+    def _load_team_part(self, league: str, team: str) -> List[Dict[str, Any]]:
+        """
+        单个快照内的单队查询
+        - 本地缓存的快照与索引 ETag 一致：直接在内存里过滤
+        - 有索引且快照是 json：按 Range GET 取该队记录所在的区间（相近的区间并成一次请求），只解析该队的记录
+        - 其余情况：全量读取，顺带重建索引
+        """
+        index = self._load_index(league)
+        cached = self._cached(self._key(league))
+
+        if index is not None and cached is not None and cached[0] == index["etag"]:
+            rows = [m for m in cached[1] if _involves(m, team)]
+            entries, _ = self._load_log(league)
+            return _apply_log(rows, entries, team)
+
+        if index is not None and index.get("teams") is not None:
+            spans = index["teams"].get(team, [])
+            if not spans:
+                entries, _ = self._load_log(league)
+                return _apply_log([], entries, team)
+            rows = []
+            try:
+                for group in _span_groups(spans, RANGE_MERGE_GAP):
+                    start = group[0][0]
+                    resp = self.client.get_object(
+                        oss.GetObjectRequest(
+                            bucket=self.bucket,
+                            key=self._key(league),
+                            range_header=f"bytes={start}-{group[-1][1] - 1}",
+                            if_match=index["etag"]
+                        )
+                    )
+                    buf = resp.body.read()
+                    rows.extend(json.loads(buf[s - start:e - start]) for s, e in group)
+            except oss.exceptions.ServiceError as e:
+                # 412：数据对象已被别处改写，索引过期
+                if e.status_code != 412:
+                    raise
+            else:
+                entries, _ = self._load_log(league)
+                return _apply_log(rows, entries, team)
+
         resp = self.client.get_object(
             oss.GetObjectRequest(
                 bucket=self.bucket,
                 key=self._key(league)
             )
         )
-        return json.loads(resp.body.read().decode("utf-8"))
+        raw = resp.body.read()
+        if _league_codec(raw) == "json":
+            data, offsets = _scan_records(raw.decode("utf-8"))
+            teams = _build_index(data, offsets)
+        else:
+            data, teams = _decode_league(raw), None
+        self._remember(self._key(league), resp.etag, data)
+        if index is None or index["etag"] != resp.etag:
+            self._save_index(league, resp.etag, teams)
 
-    def save_league(self, league: str, data: List[Dict[str, Any]]) -> None:
-        self.client.put_object(
-            oss.PutObjectRequest(
+        rows = [m for m in data if _involves(m, team)]
+        entries, _ = self._load_log(league)
+        return _apply_log(rows, entries, team)
+
+    # ---------- 追加式变更日志 ----------
+
+    def _log_parsed(self, league: str):
+        """返回 (日志条目, 日志长度, 末尾的 seal 标记, 内容摘要)"""
+        try:
+            return self._get_cached(
+                self._log_key(league),
+                lambda raw: (_parse_log(raw), len(raw), _log_seal(raw), _log_digest(raw))
+            )
+        except oss.exceptions.ServiceError as e:
+            if e.status_code == 404:
+                return [], 0, None, _log_digest(b"")
+            raise
+
+    def _log_state(self, league: str):
+        """返回 (日志条目, 日志长度, 末尾的 seal 标记)"""
+        return self._log_parsed(league)[:3]
+
+    def _load_log(self, league: str, start: int = 0):
+        """返回 (日志条目, 已读到的字节位置)"""
+        if not start:
+            return self._log_state(league)[:2]
+
+        req = oss.GetObjectRequest(
+            bucket=self.bucket,
+            key=self._log_key(league),
+            range_header=f"bytes={start}-",
+            range_behavior="standard"
+        )
+        try:
+            resp = self.client.get_object(req)
+        except oss.exceptions.ServiceError as e:
+            # 404：还没有日志；416：start 之后没有新内容
+            if e.status_code in (404, 416):
+                return [], start
+            raise
+        raw = resp.body.read()
+        return _parse_log(raw), start + len(raw)
+
+    def _read_log(self, league: str) -> bytes:
+        """不走缓存读取整个日志；没有日志时为 b"""""
+        return self._read_object(self._log_key(league))
+
+    def _read_object(self, key: str) -> bytes:
+        try:
+            resp = self.client.get_object(oss.GetObjectRequest(bucket=self.bucket, key=key))
+        except oss.exceptions.ServiceError as e:
+            if e.status_code == 404:
+                return b""
+            raise
+        return resp.body.read()
+
+    def _append_line(self, key: str, position: int, *lines: Dict[str, Any]) -> int:
+        """
+        多行在同一次 AppendObject 里写入，要么全部成功要么都不写
+        position 与对象当前长度不一致时 OSS 返回 409，这是 OSS 上唯一的比较后写入
+        """
+        resp = self.client.append_object(
+            oss.AppendObjectRequest(
                 bucket=self.bucket,
-                key=self._key(league),
-                body=json.dumps(
-                    data,
-                    ensure_ascii=False,
-                    indent=2
-                ).encode("utf-8")
+                key=key,
+                position=position,
+                body="".join(json.dumps(line, ensure_ascii=False) + "\n" for line in lines).encode("utf-8")
             )
         )
+        self._cache.pop(key, None)
+        return int(resp.next_position)
+
+    def _sealed(self, seal: Optional[Dict[str, Any]]) -> bool:
+        """seal 标记是否仍然有效：moved 永不过期，其余超过 log_seal_timeout 秒视为封住的实例已崩溃"""
+        if seal is None:
+            return False
+        return bool(seal.get("moved")) or time.time() - seal.get("at", 0) < self.log_seal_timeout
+
+    def _append_at(self, league: str, position: int, *entries: Dict[str, Any]) -> int:
+        return self._append_line(self._log_key(league), position, *entries)
+
+    def _seal_log(self, league: str, wait: bool = True, moved: bool = False):
+        """
+        封住日志：以读到的长度作为 position 追加一行 seal 标记，与别的追加互斥，
+        之后的追加读到末行的标记就会等待（见 _append_part），相当于 ali_FC compact 的先改名；
+        末行是过期的标记（封住的实例多半已崩溃）时同样追加新标记接手
+        返回 (封住前的日志内容, 标记 id)
+        已被别处封住时 wait 为真就退避等待，等不到或 wait 为假时抛 LeagueConflict
+        """
+        for attempt in range(self.max_retries):
+            raw = self._read_log(league)
+            if self._sealed(_log_seal(raw)):
+                if not wait:
+                    break
+                self._backoff(attempt)
+                continue
+
+            seal = {"op": "seal", "id": str(uuid.uuid4()), "at": time.time()}
+            if moved:
+                seal["moved"] = True
+            try:
+                self._append_at(league, len(raw), seal)
+            except oss.exceptions.ServiceError as e:
+                if e.status_code != 409:
+                    raise
+                self._backoff(attempt)
+                continue
+            return raw, seal["id"]
+
+        raise LeagueConflict(f"league {league} log is sealed by another writer, gave up")
+
+    def _release_log(self, league: str, sealed: str) -> None:
+        """
+        快照已包含封住的条目，删掉日志；末行不再是自己的标记说明已被别的实例接手，留给它处理
+        读取与删除之间被接手的窗口只在停顿超过 log_seal_timeout 时出现
+        """
+        self._cache.pop(self._log_key(league), None)
+        seal = _log_seal(self._read_log(league))
+        if seal is not None and seal.get("id") == sealed:
+            self.client.delete_object(
+                oss.DeleteObjectRequest(bucket=self.bucket, key=self._log_key(league))
+            )
+
+    def _fold_log(self, league: str, raw: bytes, sealed: str):
+        """
+        把封住的日志合并进最新快照后释放日志，返回 (被覆盖的快照 ETag, 新快照 ETag)
+        重放是幂等的，条目已经在快照里也没关系；重试用尽时抛 LeagueConflict，日志保持封住
+        """
+        entries = _parse_log(raw)
+        for attempt in range(self.max_retries):
+            etag, data = self._load_base_versioned(league)
+            new_etag = etag
+            if entries:
+                try:
+                    new_etag = self._save_base(league, _apply_log(data, entries), if_match=etag)
+                except LeagueConflict:
+                    self._backoff(attempt)
+                    continue
+            self._release_log(league, sealed)
+            return etag, new_etag
+        raise LeagueConflict(f"league {league} is being modified concurrently, gave up")
+
+    def _take_over_log(self, league: str) -> None:
+        """追加遇到过期的 seal 标记时调用：封住它的实例超时未释放（多半已崩溃），接手合并"""
+        try:
+            raw, sealed = self._seal_log(league, wait=False)
+            self._fold_log(league, raw, sealed)
+        except LeagueConflict:
+            pass
+
+    # ---------- 租约：靠追加写互斥 ----------
+
+    def _lease_key(self, key: str) -> str:
+        return f"{key}.lease"
+
+    def _acquire(self, key: str) -> int:
+        """
+        抢占 key 的租约：在 {key}.lease 末尾以读到的长度追加一行 claim，同一时刻只有一个实例能成功；
+        末行是未释放且未过期（log_seal_timeout）的 claim 时退避等待
+        返回追加后的长度，交给 _release
+        """
+        lease_key = self._lease_key(key)
+        for attempt in range(self.max_retries):
+            raw = self._read_object(lease_key)
+            last = raw.rstrip(b"\n").rpartition(b"\n")[2]
+            claim = json.loads(last.decode("utf-8")) if last.strip() else None
+            if claim is not None and not claim.get("released") and \
+                    time.time() - claim.get("at", 0) < self.log_seal_timeout:
+                self._backoff(attempt)
+                continue
+            try:
+                return self._append_line(lease_key, len(raw), {"op": "claim", "at": time.time()})
+            except oss.exceptions.ServiceError as e:
+                if e.status_code != 409:
+                    raise
+                self._backoff(attempt)
+        raise LeagueConflict(f"{key} is locked by another writer, gave up")
+
+    def _release(self, key: str, position: int) -> None:
+        """在自己的 claim 之后追加 released；已被别的实例接手时 409，什么也不做"""
+        try:
+            self._append_line(self._lease_key(key), position, {"op": "claim", "released": True})
+        except oss.exceptions.ServiceError as e:
+            if e.status_code != 409:
+                raise
+
+    def _head_etag(self, key: str) -> Optional[str]:
+        try:
+            return self.client.head_object(oss.HeadObjectRequest(bucket=self.bucket, key=key)).etag
+        except oss.exceptions.ServiceError as e:
+            if e.status_code == 404:
+                return None
+            raise
+
+    def append_log(
+        self,
+        league: str,
+        op: str,
+        match_id: str,
+        match: Optional[Dict[str, Any]] = None,
+        check=None
+    ) -> Optional[str]:
+        """
+        写入一条单场变更
+        分区联赛按 match 的日期路由；删除时不带 match 就写到每个分区（删除是幂等的）
+        """
+        partitions = self._load_partitions(league)
+        if partitions is None:
+            try:
+                return self._append_part(league, op, match_id, match, check)
+            except LeagueConflict:
+                # 期间可能被 partition_league 拆成了分区，重新读分区元数据
+                self._cache.pop(self._manifest_key(league), None)
+                if self._load_partitions(league) is None:
+                    raise
+                return self.append_log(league, op, match_id, match, check)
+        if match is not None:
+            return self._append_part(self._route(league, match), op, match_id, match, check)
+
+        for part in self._parts(league, partitions=partitions):
+            reason = self._append_part(part, op, match_id, None, check)
+            if reason:
+                return reason
+        return None
+
+    def add_matches(self, league: str, matches: List[Dict[str, Any]]) -> None:
+        """
+        批量新增比赛（已带 match_id）：按日期路由后每个分区一次追加到变更日志
+        不整表写回，期间别处追加的变更不会被覆盖
+        """
+        partitions = self._load_partitions(league)
+        by_part = {}
+        for m in matches:
+            part = league if partitions is None else self._route(league, m)
+            by_part.setdefault(part, []).append({"op": "add", "match_id": str(m["match_id"]), "match": m})
+        for part, entries in by_part.items():
+            try:
+                self._append_entries(part, entries)
+            except LeagueConflict:
+                # 未分区时只有这一个分区，还没写入任何条目；期间被拆成了分区就重新路由
+                if partitions is not None:
+                    raise
+                self._cache.pop(self._manifest_key(league), None)
+                if self._load_partitions(league) is None:
+                    raise
+                return self.add_matches(league, matches)
+
+    def create_league(self, league: str, data: List[Dict[str, Any]]) -> bool:
+        """只在联赛不存在时创建（forbid_overwrite），已存在时返回 False"""
+        if self._load_partitions(league) is not None:
+            return False
+        try:
+            self._save_base(league, data, create=True)
+        except LeagueConflict:
+            return False
+        return True
+
+    def _append_part(
+        self,
+        league: str,
+        op: str,
+        match_id: str,
+        match: Optional[Dict[str, Any]] = None,
+        check=None
+    ) -> Optional[str]:
+        """O(1) 写入一条变更，超过阈值时触发合并"""
+        entry = {"op": op, "match_id": str(match_id)}
+        if match is not None and op != "delete":
+            entry["match"] = match
+        return self._append_entries(league, [entry], check)
+
+    def _append_entries(self, league: str, entries: List[Dict[str, Any]], check=None) -> Optional[str]:
+        """
+        一次追加写入若干条变更
+        check() 在最新数据上做前置校验（如判重），返回错误信息则放弃写入并返回该信息
+        以读到的日志长度作为 position 追加，别处先追加了（409）就重新读取、重新校验、退避重试；
+        日志末行是 seal 标记（合并中）时同样退避重试，标记过期就接手合并，
+        被 partition_league 封成墓碑时直接抛 LeagueConflict
+        """
+        for attempt in range(self.max_retries):
+            _, position, seal = self._log_state(league)
+            if seal is not None:
+                if seal.get("moved"):
+                    break
+                if not self._sealed(seal):
+                    self._take_over_log(league)
+                self._cache.pop(self._log_key(league), None)
+                self._backoff(attempt)
+                continue
+            if check is not None:
+                reason = check()
+                if reason:
+                    return reason
+            try:
+                next_position = self._append_at(league, position, *entries)
+            except oss.exceptions.ServiceError as e:
+                if e.status_code != 409:
+                    raise
+                # 别处先追加了或刚封住：丢掉缓存的长度，重新读
+                self._cache.pop(self._log_key(league), None)
+                self._backoff(attempt)
+                continue
+
+            self._advance_views(league, position, next_position, entries)
+            if next_position >= self.log_compact_bytes:
+                self.compact(league)
+            return None
+
+        raise LeagueConflict(f"league {league} log is being appended concurrently, gave up")
+
+    def compact(self, league: str) -> None:
+        """
+        把变更日志合并回基础快照
+        先封住日志（见 _seal_log），全部条目写进快照后才删除，合并期间的追加会重试而不会丢；
+        别的实例正在合并时放弃
+        """
+        entries, _ = self._load_log(league)
+        if not entries:
+            return
+
+        views = {view: self._load_view_versioned(league, view) for view in VIEWS}
+        try:
+            raw, sealed = self._seal_log(league, wait=False)
+            etag, new_etag = self._fold_log(league, raw, sealed)
+        except LeagueConflict:
+            return
+
+        # 合并不改变内容：与封住时一致的视图换成新快照
+        for view, (view_etag, state) in views.items():
+            if state is not None and state.get("stamp") == [etag, len(raw)]:
+                self._save_view(league, view, dict(state, stamp=[new_etag, 0]), if_match=view_etag)
+
+    # ---------- 物化视图 ----------
+
+    def _base_etag(self, league: str) -> Optional[str]:
+        return self._head_etag(self._key(league))
+
+    def _load_view(self, league: str, view: str) -> Optional[Dict[str, Any]]:
+        return self._load_view_versioned(league, view)[1]
+
+    def _load_view_versioned(self, league: str, view: str):
+        """返回 (视图对象 ETag, 状态)；视图不存在时 ETag 为 None，版本不符时状态为 None"""
+        try:
+            etag, state = self._get_versioned(
+                self._view_key(league, view),
+                lambda raw: json.loads(raw.decode("utf-8"))
+            )
+        except oss.exceptions.ServiceError as e:
+            if e.status_code == 404:
+                return None, None
+            raise
+        return etag, (state if state.get("version") == VIEW_VERSION else None)
+
+    def _save_view(
+        self,
+        league: str,
+        view: str,
+        state: Dict[str, Any],
+        if_match: Optional[str] = None
+    ) -> bool:
+        """
+        if_match 为空时只在不存在时创建（forbid_overwrite），否则 HEAD 比较 ETag 后覆盖
+        别的实例先写了返回 False，视图只是加速手段，下次读取时会补上；
+        比较与覆盖之间的竞态只会让视图回到一个较早但自洽的 stamp
+        """
+        key = self._view_key(league, view)
+        state = dict(state, version=VIEW_VERSION)
+        if if_match and self._head_etag(key) != if_match:
+            self._cache.pop(key, None)
+            return False
+        req = oss.PutObjectRequest(
+            bucket=self.bucket,
+            key=key,
+            body=json.dumps(state, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+            forbid_overwrite=None if if_match else True
+        )
+        try:
+            resp = self.client.put_object(req)
+        except oss.exceptions.ServiceError as e:
+            if e.status_code == 409:
+                self._cache.pop(key, None)
+                return False
+            raise
+        self._remember(self._view_key(league, view), resp.etag, state)
+        return True
+
+    def _advance_views(self, league: str, position: int, next_position: int, entries) -> None:
+        """
+        日志从 position 追加到 next_position 之后增量更新各个视图
+        写入前就已过期的视图不动，留给读取时处理；失败不影响已写入的变更
+        """
+        etag = None
+        for view, (_, apply) in VIEWS.items():
+            try:
+                view_etag, state = self._load_view_versioned(league, view)
+                if state is None or state["stamp"][1] != position:
+                    continue
+                if etag is None:
+                    etag = self._base_etag(league)
+                if state["stamp"][0] != etag:
+                    continue
+                state = json.loads(json.dumps(state))
+                for entry in entries:
+                    apply(state, entry)
+                state["stamp"] = [etag, next_position]
+                self._save_view(league, view, state, if_match=view_etag)
+            except oss.exceptions.ServiceError:
+                self._cache.pop(self._view_key(league, view), None)
+
+    def load_view(self, league: str, view: str) -> Dict[str, Any]:
+        """
+        与当前数据一致的视图状态（单个快照 / 分区）
+        快照 ETag 一致时只补上 stamp 之后追加的日志，否则全量重算
+        """
+        view_etag, state = self._load_view_versioned(league, view)
+        etag = self._base_etag(league)
+
+        if state is not None and state["stamp"][0] == etag and etag is not None:
+            tail, length = self._load_log(league, start=state["stamp"][1])
+            if length == state["stamp"][1]:
+                return state
+            state = json.loads(json.dumps(state))
+            for e in tail:
+                VIEWS[view][1](state, e)
+        else:
+            entries, length = self._load_log(league)
+            etag, base = self._load_base_versioned(league)
+            state = _build_view(view, _apply_log(base, entries))
+
+        state["stamp"] = [etag, length]
+        self._save_view(league, view, state, if_match=view_etag)
+        return state
+
+    def league_standings(self, league: str, season: Optional[str] = None):
+        """
+        返回 (赛季, {球队: [场次, 胜, 平, 负, 进球, 失球, 积分]}, {球队: 按日期排序的结果})
+        season 为空时取有比分的最近一个赛季；分区联赛只读该赛季的分区
+        """
+        partitions = self._load_partitions(league)
+        if partitions is None:
+            state = self.load_view(league, "standings")
+            if season is None:
+                known = sorted(s for s in state["tables"] if s != "unknown")
+                season = known[-1] if known else None
+            return season, state["tables"].get(season, {}), state["form"].get(season, {})
+
+        # 只有未来赛程的赛季（分区里还没有比分）不算最近的赛季
+        seasons = [season] if season else sorted((s for s in partitions if s != "unknown"), reverse=True)
+        for s in seasons:
+            if s not in partitions:
+                break
+            state = self.load_view(partition_name(league, s), "standings")
+            if season or state["tables"].get(s):
+                return s, state["tables"].get(s, {}), state["form"].get(s, {})
+        return season, {}, {}
+
+    def pair_matches(self, league: str, team_a: str, team_b: str) -> List[Dict[str, Any]]:
+        """
+        两队之间的全部原始记录（按规范队名，不分主客），按日期排序
+        分区联赛只读两队都出场过、且对阵索引里有这组对阵的赛季
+        """
+        key = pair_key(team_a, team_b)
+        parts = set(self._parts(league, team_b))
+        rows = []
+        for part in self._parts(league, team_a):
+            if part not in parts:
+                continue
+            ids = set(self.load_view(part, "pairs")["pairs"].get(key, []))
+            if ids:
+                rows.extend(m for m in self._load_team_part(part, team_a) if str(m.get("match_id")) in ids)
+
+        rows.sort(key=lambda m: (_date_key(m.get("Date")), str(m.get("match_id"))))
+        return rows
@@ -0,0 +1,55 @@
+import os
+import sys
+import argparse
+
+AUTO_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(AUTO_DIR)
+
+# 随 handler 一起部署到 FC 的共用模块：auto 里的副本 -> 唯一的源码（相对仓库根目录）
+# 客户端那边的共用模块（tool_memo / FC_client 的批处理）直接按路径加载，不需要副本
+SHARED = {
+    "timing.py": "ali_FC/server/timing.py",
+}
+
+HEADER = "# 由 {source} 生成（python auto/sync_shared.py），不要手改\n"
+
+
+def render(source: str) -> str:
+    with open(os.path.join(REPO_DIR, source), "r", encoding="utf-8") as f:
+        return HEADER.format(source=source) + f.read()
+
+
+def main():
+    """
+    把 SHARED 里的源码复制到 auto，改了源码后重新运行
+    用法：python sync_shared.py [--check]
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--check", action="store_true", help="只检查副本是否与源码一致")
+    args = parser.parse_args()
+
+    stale = []
+    for copy_name, source in SHARED.items():
+        path = os.path.join(AUTO_DIR, copy_name)
+        content = render(source)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                current = f.read()
+        except FileNotFoundError:
+            current = None
+        if current == content:
+            continue
+        if args.check:
+            stale.append(copy_name)
+            continue
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        print(f"{path} <- {source}")
+
+    if stale:
+        print(f"out of date, run python auto/sync_shared.py: {', '.join(stale)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
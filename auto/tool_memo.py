@@ -0,0 +1,17 @@
+import os
+import importlib.util
+
+# ToolMemo 只在 ali_FC/tools/memo.py 维护一份（只依赖标准库），按路径加载，这里只按 auto 的配置创建实例
+MEMO_SOURCE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "ali_FC", "tools", "memo.py"
+)
+_spec = importlib.util.spec_from_file_location("ali_fc_memo", MEMO_SOURCE)
+_memo = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_memo)
+ToolMemo = _memo.ToolMemo
+
+# 工具结果缓存：最多缓存多少条、每条保留多少秒，任一为 0 表示关闭
+TOOL_MEMO_SIZE = int(os.getenv("TOOL_MEMO_SIZE", "256"))
+TOOL_MEMO_TTL = float(os.getenv("TOOL_MEMO_TTL", "300"))
+
+tool_memo = ToolMemo(TOOL_MEMO_SIZE, TOOL_MEMO_TTL)
@@ -23,8 +23,8 @@ def add_match(
     if missing:
         return f"缺少必要字段：{', '.join(missing)}。请补全后重试。"
 
-    home_norm = TEAM_NAME_MAP.get(home, home)
-    away_norm = TEAM_NAME_MAP.get(away, away)
+    home_norm = canonical_team(home) or home
+    away_norm = canonical_team(away) or away
 
     fthg = int(home_score or 0)
     ftag = int(away_score or 0)
@@ -63,24 +63,28 @@ def add_match(
         "match_id": str(uuid.uuid4()),
     }
 
-    try:
-        all_data = storage.load_league(league)
-    except Exception as e:
-        return f"读取联赛数据失败: {e}"
+    # 只需查主队的比赛即可判重；写入冲突时会在最新数据上重新判重
+    def check():
+        try:
+            home_matches = storage.load_team(league, home_norm, date)
+        except Exception as e:
+            return f"读取联赛数据失败: {e}"
 
-    exists = any(
-        m["Date"] == date and m["Time"] == time
-        and m["HomeTeam"] == home_norm and m["AwayTeam"] == away_norm
-        for m in all_data
-    )
-    if exists:
-        return "比赛已存在，未重复添加"
-
-    all_data.append(new_match)
+        exists = any(
+            m["Date"] == date and m["Time"] == time
+            and m["HomeTeam"] == home_norm and m["AwayTeam"] == away_norm
+            for m in home_matches
+        )
+        if exists:
+            return "比赛已存在，未重复添加"
+        return None
 
     try:
-        storage.save_league(league, all_data)
+        reason = storage.append_log(league, "add", new_match["match_id"], new_match, check=check)
     except Exception as e:
         return f"写回 OSS 失败: {e}"
 
+    if reason:
+        return reason
+
     return "添加比赛成功"
\ No newline at end of file
@@ -11,41 +11,62 @@ def change_score(
 
     m = match[0]
 
-    fthg = int(home_score)
-    ftag = int(away_score)
-
-    m["FTHG"] = fthg
-    m["FTAG"] = ftag
-    m["FTR"] = (
-        "H" if fthg > ftag else
-        "A" if fthg < ftag else
-        "D"
-    )
-
     league = m.get("Div")
     match_id = m.get("match_id")
 
     if not league or not match_id:
         return "比赛数据不完整，缺少 Div 或 match_id"
 
+    fthg = int(home_score)
+    ftag = int(away_score)
+    scores = {
+        "FTHG": fthg,
+        "FTAG": ftag,
+        "FTR": "H" if fthg > ftag else "A" if fthg < ftag else "D",
+    }
+
+    home = m.get("HomeTeam")
+    home_norm = TEAM_NAME_MAP.get(home, home)
+
+    def stored_match():
+        # 传入的可能是只带部分列的投影：按 match_id 取库里的完整记录
+        if home:
+            rows = storage.load_team(league, home_norm, m.get("Date"))
+        else:
+            rows = storage.load_league(league)
+        for row in rows:
+            if str(row.get("match_id")) == str(match_id):
+                return row
+        return None
+
     try:
-        all_data = storage.load_league(league)
+        stored = stored_match()
     except Exception as e:
         return f"读取联赛数据失败: {e}"
+    if stored is None:
+        return "更改失败，未在联赛数据中找到对应比赛"
 
-    updated = False
-    for i, mm in enumerate(all_data):
-        if str(mm.get("match_id")) == str(match_id):
-            all_data[i] = m
-            updated = True
-            break
+    # 只改比分，其余列保持库里的值；分区联赛按库里的日期路由
+    updated = dict(stored, **scores)
 
-    if not updated:
-        return "更改失败，未在联赛数据中找到对应比赛"
+    # 写入冲突时会在最新数据上重新确认比赛仍然存在，并以最新记录为底
+    def check():
+        try:
+            current = stored_match()
+        except Exception as e:
+            return f"读取联赛数据失败: {e}"
+        if current is None:
+            return "更改失败，未在联赛数据中找到对应比赛"
+        updated.clear()
+        updated.update(current, **scores)
+        return None
 
     try:
-        storage.save_league(league, all_data)
+        reason = storage.append_log(league, "update", match_id, updated, check=check)
     except Exception as e:
         return f"写回 OSS 失败: {e}"
 
-    return "比分更新成功"
\ No newline at end of file
+    if reason:
+        return reason
+
+    return "比分更新成功"
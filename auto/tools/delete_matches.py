@@ -27,18 +27,20 @@ def delete_matches(
 
     original_count = len(all_data)
 
-    filtered_data = [
+    # 带上原记录，分区联赛据此定位赛季
+    found = [
         m for m in all_data
-        if str(m.get("match_id")) not in match_ids_to_delete
+        if str(m.get("match_id")) in match_ids_to_delete
     ]
 
-    deleted_count = original_count - len(filtered_data)
+    deleted_count = len(found)
 
     if deleted_count == 0:
         return "删除失败，未在数据中找到指定比赛"
 
     try:
-        storage.save_league(league, filtered_data)
+        for m in found:
+            storage.append_log(league, "delete", m.get("match_id"), m)
     except Exception as e:
         return f"写回 OSS 失败: {e}"
 
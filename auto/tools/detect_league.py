@@ -2,10 +2,7 @@ from fc_decorator import fc
 
 @fc
 def detect_league(team: str) -> str:
-    if team in TEAM_NAME_MAP:
-        team_en = TEAM_NAME_MAP[team]
-    else:
-        team_en = team
-
-    league = TEAM_NAME_MAP1[team_en]
+    league = team_league(team)
+    if league is None:
+        return f"未找到球队：{team}，请确认球队名称"
     return league
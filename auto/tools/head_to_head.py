@@ -0,0 +1,52 @@
+from typing import Optional
+
+from fc_decorator import fc
+
+@fc
+def head_to_head(
+    team_a: str,
+    team_b: str,
+    league: Optional[str] = None,
+):
+    """
+    两队的历史交锋：比赛按日期排序，附带胜平负与进球汇总（没有比分的比赛不计入）
+    不传 league 时在所有联赛里找，分区联赛只读两队都出场过的赛季
+    """
+    a_en = resolve_team(team_a) or team_a
+    b_en = resolve_team(team_b) or team_b
+    if a_en == b_en:
+        return {"error": f"两支球队相同：{team_a}"}
+
+    matches = []
+    for lg in [league] if league else storage.list_leagues():
+        for m in storage.pair_matches(lg, a_en, b_en):
+            m = dict(m)
+            m["HomeTeam"] = TEAM_NAME_MAP.get(m.get("HomeTeam"), m.get("HomeTeam"))
+            m["AwayTeam"] = TEAM_NAME_MAP.get(m.get("AwayTeam"), m.get("AwayTeam"))
+            matches.append(m)
+
+    summary = {
+        "played": 0,
+        "wins": {a_en: 0, b_en: 0},
+        "draws": 0,
+        "goals": {a_en: 0, b_en: 0},
+    }
+    for m in matches:
+        try:
+            home_goals, away_goals = int(m.get("FTHG")), int(m.get("FTAG"))
+        except (TypeError, ValueError):
+            continue
+        a_goals, b_goals = (
+            (home_goals, away_goals) if m["HomeTeam"] == a_en else (away_goals, home_goals)
+        )
+        summary["played"] += 1
+        summary["goals"][a_en] += a_goals
+        summary["goals"][b_en] += b_goals
+        if a_goals > b_goals:
+            summary["wins"][a_en] += 1
+        elif a_goals < b_goals:
+            summary["wins"][b_en] += 1
+        else:
+            summary["draws"] += 1
+
+    return {"team_a": a_en, "team_b": b_en, "summary": summary, "matches": matches}
@@ -0,0 +1,122 @@
+from typing import Optional
+
+from fc_decorator import fc
+
+@fc
+def import_matches(
+    csv_text: Optional[str] = None,
+    url: Optional[str] = None,
+    league: Optional[str] = None,
+):
+    """
+    导入一份 football-data CSV（直接传内容，或给出 football-data.co.uk 的下载地址，边下载边解析）
+    队名经 TEAM_NAME_MAP 归一化，日期保持 CSV 原样；league 不为空时覆盖 CSV 里的 Div
+    已有的比赛按 (日期, 主队, 客队) 判重跳过；已有联赛的新比赛经变更日志追加（add_matches），
+    导入期间别处的增删改不会被整表写回覆盖，新联赛只在不存在时创建
+    io / csv / urllib 由 handler 注入
+    """
+    if not csv_text and not url:
+        return {"error": "需要 csv_text 或 url"}
+
+    aliases = {"Home": "HomeTeam", "Away": "AwayTeam", "HG": "FTHG", "AG": "FTAG", "Res": "FTR"}
+    text_fields = ["Div", "Date", "Time", "HomeTeam", "AwayTeam", "FTR", "HTR"]
+    int_fields = [
+        "FTHG", "FTAG", "HTHG", "HTAG",
+        "HS", "AS", "HST", "AST", "HF", "AF", "HC", "AC",
+        "HY", "AY", "HR", "AR",
+    ]
+    fields = ["Div", "Date", "Time", "HomeTeam", "AwayTeam", "FTHG", "FTAG", "FTR", "HTHG", "HTAG", "HTR",
+              "HS", "AS", "HST", "AST", "HF", "AF", "HC", "AC", "HY", "AY", "HR", "AR"]
+
+    # 只允许从 football-data.co.uk 下载，不能借工具访问内网地址
+    url_hosts = ("football-data.co.uk", "www.football-data.co.uk")
+
+    def date_key(date):
+        # dd/mm/yy(yy) 转成 YYYY-MM-DD，只用于判重
+        date = "" if date is None else str(date)
+        if "/" in date:
+            try:
+                day, month, year = date.split("/")
+                year = int(year)
+                if year < 100:
+                    year += 2000
+                return f"{year:04d}-{int(month):02d}-{int(day):02d}"
+            except ValueError:
+                pass
+        return date
+
+    def to_int(value):
+        try:
+            return int(float(value))
+        except (TypeError, ValueError):
+            return None
+
+    def norm(team):
+        return TEAM_NAME_MAP.get(team, team)
+
+    def match_key(m):
+        return date_key(m.get("Date")), norm(m.get("HomeTeam")), norm(m.get("AwayTeam"))
+
+    def check_url(u):
+        parts = urllib.parse.urlsplit(u)
+        if parts.scheme not in ("http", "https") or parts.hostname not in url_hosts or parts.port is not None:
+            raise ValueError(f"url must be on {', '.join(url_hosts)}")
+
+    class CheckedRedirect(urllib.request.HTTPRedirectHandler):
+        # 重定向到的地址同样要在白名单里
+        def redirect_request(self, req, fp, code, msg, headers, newurl):
+            check_url(newurl)
+            return super().redirect_request(req, fp, code, msg, headers, newurl)
+
+    if url:
+        try:
+            check_url(url)
+        except ValueError as e:
+            return {"error": str(e)}
+        opener = urllib.request.build_opener(CheckedRedirect)
+        lines = io.TextIOWrapper(opener.open(url, timeout=30), encoding="utf-8-sig", errors="replace", newline="")
+    else:
+        lines = io.StringIO(csv_text)
+
+    by_league = {}
+    with lines:
+        for raw in csv.DictReader(lines):
+            row = {aliases.get(k, k): (v or "").strip() for k, v in raw.items() if isinstance(k, str)}
+            if not (row.get("Date") and row.get("HomeTeam") and row.get("AwayTeam")):
+                continue
+            div = league or row.get("Div")
+            if not div:
+                return {"error": "CSV has no Div column, pass league"}
+
+            m = {f: row.get(f, "") if f in text_fields else to_int(row.get(f)) for f in fields}
+            m["Div"] = div
+            m["HomeTeam"] = norm(row["HomeTeam"])
+            m["AwayTeam"] = norm(row["AwayTeam"])
+            by_league.setdefault(div, []).append(m)
+
+    def new_matches(data, rows):
+        seen = {match_key(m) for m in data}
+        new = []
+        for m in rows:
+            key = match_key(m)
+            if key in seen:
+                continue
+            seen.add(key)
+            new.append({**m, "match_id": str(uuid.uuid4())})
+        return new
+
+    results = []
+    for lg, rows in sorted(by_league.items()):
+        new = []
+        created = False
+        if lg not in storage.list_leagues():
+            new = new_matches([], rows)
+            # 只在不存在时创建，别处抢先建好了就按已有联赛处理
+            created = not new or storage.create_league(lg, new)
+        if not created:
+            new = new_matches(storage.load_league(lg), rows)
+            if new:
+                storage.add_matches(lg, new)
+        results.append({"league": lg, "added": len(new), "skipped": len(rows) - len(new)})
+
+    return {"leagues": results}
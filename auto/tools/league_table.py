@@ -0,0 +1,35 @@
+from typing import Optional
+
+from fc_decorator import fc
+
+@fc
+def league_table(
+    league: str,
+    season: Optional[str] = None,
+    team: Optional[str] = None,
+):
+    """
+    联赛积分榜，读取物化好的结果，不重新扫描比赛
+    按 积分 > 净胜球 > 进球 > 队名 排名，form 为最近 5 场的 W/D/L，时间从早到晚
+    season 形如 2024-2025，默认最近的赛季；传 team 时只返回该队所在的一行
+    """
+    season, table, form = storage.league_standings(league, season)
+
+    fields = ["played", "won", "drawn", "lost", "goals_for", "goals_against", "points"]
+    rows = []
+    for name, stats in table.items():
+        row = {"team": name, **dict(zip(fields, stats))}
+        row["goal_difference"] = row["goals_for"] - row["goals_against"]
+        row["form"] = "".join(r[2] for r in form.get(name, [])[-5:])
+        rows.append(row)
+
+    rows.sort(key=lambda r: (-r["points"], -r["goal_difference"], -r["goals_for"], r["team"]))
+    rows = [{"position": i, **row} for i, row in enumerate(rows, 1)]
+
+    if team:
+        team_en = resolve_team(team) or team
+        rows = [r for r in rows if r["team"] == team_en]
+        if not rows:
+            return {"error": f"{season} 赛季 {league} 积分榜中没有球队：{team}"}
+
+    return {"league": league, "season": season, "table": rows}
@@ -1,39 +1,54 @@
+from typing import List, Any, Optional
+
 from fc_decorator import fc
 
 @fc
-def load_team_matches(league: str, team: str) -> list[dict]:
-    team_en = TEAM_NAME_MAP.get(team, team)
-    matches = storage.load_league(league)
+def load_team_matches(
+    league: str,
+    team: str,
+    fields: Optional[List[str]] = None,
+    compact: bool = False,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    order: Optional[str] = None
+) -> Any:
+    """
+    fields：只返回这些列，默认全部
+    compact：返回 {"fields": [...], "rows": [[...], ...]}，列名只出现一次
+    limit / cursor / order：分页，由 storage.load_team_page 按 (Date, match_id) 排序
+    返回 {"matches": ..., "next_cursor": ...}，游标是上一页最后一条的排序键
+    """
+    all_fields = [
+        "Div", "Date", "Time", "HomeTeam", "AwayTeam",
+        "FTHG", "FTAG", "FTR", "HTHG", "HTAG", "HTR",
+        "HS", "AS", "HST", "AST", "HF", "AF", "HC", "AC",
+        "HY", "AY", "HR", "AR", "match_id",
+    ]
+    if fields:
+        unknown = [f for f in fields if f not in all_fields]
+        if unknown:
+            raise ValueError(f"unknown fields: {unknown}")
+    else:
+        fields = all_fields
+
+    def table(matches):
+        rows = []
+        for m in matches:
+            m = dict(m)
+            m["HomeTeam"] = TEAM_NAME_MAP.get(m.get("HomeTeam"), m.get("HomeTeam"))
+            m["AwayTeam"] = TEAM_NAME_MAP.get(m.get("AwayTeam"), m.get("AwayTeam"))
+            rows.append([m.get(f) for f in fields])
+        if compact:
+            return {"fields": list(fields), "rows": rows}
+        return [dict(zip(fields, row)) for row in rows]
+
+    team_en = resolve_team(team) or team
+
+    if limit or cursor:
+        limit = int(limit or 100)
+        if not 0 < limit <= 1000:
+            raise ValueError("limit must be between 1 and 1000")
+        page, next_cursor = storage.load_team_page(league, team_en, limit, cursor, order or "asc")
+        return {"matches": table(page), "next_cursor": next_cursor}
 
-    result = []
-    for m in matches:
-        home = TEAM_NAME_MAP.get(m.get("HomeTeam"), m.get("HomeTeam"))
-        away = TEAM_NAME_MAP.get(m.get("AwayTeam"), m.get("AwayTeam"))
-        if home == team_en or away == team_en:
-            result.append({
-                "Div": m.get("Div"),
-                "Date": m.get("Date"),
-                "Time": m.get("Time"),
-                "HomeTeam": home,
-                "AwayTeam": away,
-                "FTHG": m.get("FTHG"),
-                "FTAG": m.get("FTAG"),
-                "FTR": m.get("FTR"),
-                "HTHG": m.get("HTHG"),
-                "HTAG": m.get("HTAG"),
-                "HTR": m.get("HTR"),
-                "HS": m.get("HS"),
-                "AS": m.get("AS"),
-                "HST": m.get("HST"),
-                "AST": m.get("AST"),
-                "HF": m.get("HF"),
-                "AF": m.get("AF"),
-                "HC": m.get("HC"),
-                "AC": m.get("AC"),
-                "HY": m.get("HY"),
-                "AY": m.get("AY"),
-                "HR": m.get("HR"),
-                "AR": m.get("AR"),
-                "match_id": m.get("match_id")
-            })
-    return result
+    return table(storage.load_team(league, team_en))
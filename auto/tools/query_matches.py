@@ -1,20 +1,26 @@
+from typing import List, Dict, Any, Optional
+
 from fc_decorator import fc
 
 @fc
 def query_matches(
-    matches: List[Dict[str, Any]],
     team: str,
+    matches: Optional[List[Dict[str, Any]]] = None,
     date: Optional[str]=None,
     result: Optional[str]=None,
-    home_or_away: Optional[str]=None
+    home_or_away: Optional[str]=None,
+    league: Optional[str]=None
 ) -> list[dict]:
-    """核心逻辑保持不变"""
+    """
+    核心逻辑保持不变
+    不传 matches 而传 league 时，直接从 storage 读取该队的比赛再过滤
+    """
     filtered = []
 
-    if team in TEAM_NAME_MAP:
-        team_en = TEAM_NAME_MAP[team]
-    else:
-        team_en = team
+    team_en = resolve_team(team) or team
+
+    if matches is None:
+        matches = storage.load_team(league, team_en, date)
 
     for m in matches:
         home = m.get("HomeTeam")
@@ -0,0 +1,151 @@
+"""
+球队别名索引（exec 注入，不走 import）
+依赖：
+  - json
+  - hashlib
+  - unicodedata
+  - lazy_pinyin（可为 None）
+  - TEAM_NAME_MAP / TEAM_NAME_MAP1
+  - TEAM_ALIAS_PREBUILT：冷启动包里预编译的索引，可为 None
+由 handler 注入；ali_FC/server/team_alias.py 也 exec 这份源码，两边只维护这一份
+"""
+
+ALIAS_INDEX_VERSION = 1
+
+# 模糊匹配只对不短于这个长度的键做，太短的键一个字符的差别就是另一支队
+FUZZY_MIN_LEN = 4
+
+_AFFIXES = ("足球俱乐部", "俱乐部", "afc", "fc", "cf", "队")
+
+
+def fold(name) -> str:
+    """全角转半角、大小写折叠，去掉标点空白和常见的 FC / 俱乐部 前后缀"""
+    text = unicodedata.normalize("NFKC", str(name)).casefold()
+    text = "".join(ch for ch in text if unicodedata.category(ch)[0] in "LN")
+    for affix in _AFFIXES:
+        if len(text) - len(affix) >= 2:
+            if text.endswith(affix):
+                text = text[:-len(affix)]
+            elif text.startswith(affix):
+                text = text[len(affix):]
+    return text
+
+
+def _pinyin_keys(key: str) -> set:
+    """中文名的全拼和首字母，需要 pypinyin"""
+    if lazy_pinyin is None or not any("\u4e00" <= ch <= "\u9fff" for ch in key):
+        return set()
+    syllables = lazy_pinyin(key)
+    return {"".join(syllables), "".join(s[0] for s in syllables if s)}
+
+
+def _deletes(key: str) -> set:
+    return {key[:i] + key[i + 1:] for i in range(len(key))}
+
+
+def source_hash(team_map: dict, league_map: dict) -> str:
+    raw = json.dumps(
+        [team_map, league_map, lazy_pinyin is not None],
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def build_index(team_map: dict, league_map: dict) -> dict:
+    """
+    把 中文名 -> 英文名、英文名 -> 联赛 两张表编译成一个别名索引
+    - aliases：折叠后的键 -> 规范队名，歧义键为 None
+    - deletes：键删掉一个字符 -> 候选规范队名，用于编辑距离 1 的模糊匹配
+    拼音键优先级低于名字本身，只在不冲突时加入
+    """
+    canonical_of = {}
+    for team in set(team_map.values()) | set(league_map):
+        canonical_of[team] = team
+    canonical_of.update(team_map)
+
+    aliases = {}
+    for alias, team in canonical_of.items():
+        key = fold(alias)
+        if not key:
+            continue
+        aliases[key] = team if aliases.get(key, team) == team else None
+
+    pinyin = {}
+    for alias, team in canonical_of.items():
+        for key in _pinyin_keys(fold(alias)):
+            if key not in aliases:
+                pinyin[key] = team if pinyin.get(key, team) == team else None
+    aliases.update(pinyin)
+
+    deletes = {}
+    for key, team in aliases.items():
+        if team is None or len(key) < FUZZY_MIN_LEN:
+            continue
+        for d in _deletes(key):
+            candidates = deletes.setdefault(d, [])
+            if team not in candidates:
+                candidates.append(team)
+
+    return {
+        "version": ALIAS_INDEX_VERSION,
+        "source_hash": source_hash(team_map, league_map),
+        "aliases": aliases,
+        "deletes": deletes,
+        "leagues": dict(league_map),
+    }
+
+
+def _load_index(prebuilt):
+    """预编译索引与当前映射表一致就直接用，否则现建"""
+    if (
+        prebuilt is not None
+        and prebuilt.get("version") == ALIAS_INDEX_VERSION
+        and prebuilt.get("source_hash") == source_hash(TEAM_NAME_MAP, TEAM_NAME_MAP1)
+    ):
+        return prebuilt
+    return build_index(TEAM_NAME_MAP, TEAM_NAME_MAP1)
+
+
+TEAM_ALIAS_INDEX = _load_index(TEAM_ALIAS_PREBUILT)
+
+
+def canonical_team(name):
+    """
+    写入用：只认折叠后完全一致的别名（含拼音），找不到或有歧义时返回 None
+    不做模糊匹配，免得把一支新球队写成名字相近的另一支
+    """
+    if not name:
+        return None
+    return TEAM_ALIAS_INDEX["aliases"].get(fold(name))
+
+
+def resolve_team(name):
+    """
+    读取用：任意写法 -> 规范队名，找不到或有歧义时返回 None
+    先查折叠后的键，再查编辑距离 1 以内的唯一候选
+    """
+    if not name:
+        return None
+    key = fold(name)
+    aliases = TEAM_ALIAS_INDEX["aliases"]
+    if key in aliases:
+        return aliases[key]
+    if len(key) < FUZZY_MIN_LEN - 1:
+        return None
+
+    deletes = TEAM_ALIAS_INDEX["deletes"]
+    candidates = set(deletes.get(key, []))
+    for d in _deletes(key):
+        if aliases.get(d) is not None and len(d) >= FUZZY_MIN_LEN:
+            candidates.add(aliases[d])
+        candidates.update(deletes.get(d, []))
+    if len(candidates) == 1:
+        return candidates.pop()
+    return None
+
+
+def team_league(name):
+    """任意写法 -> 联赛代码，找不到时返回 None"""
+    team = resolve_team(name)
+    return None if team is None else TEAM_ALIAS_INDEX["leagues"].get(team)
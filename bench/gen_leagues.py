@@ -0,0 +1,190 @@
+import os
+import sys
+import math
+import uuid
+import random
+import argparse
+from datetime import date, timedelta
+
+# 生成的数据直接用 league_store 写入，格式（编码、分区、sidecar 索引）与线上一致
+SERVER_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ali_FC", "server"
+)
+
+_TOWNS = [
+    "Ashford", "Barrow", "Carlton", "Dunmore", "Eastleigh", "Fairfield", "Glenbrook",
+    "Harrow", "Ironbridge", "Kingsford", "Langley", "Millbrook", "Northwood", "Oakham",
+    "Portland", "Queensbury", "Redhill", "Stanmore", "Thornbury", "Upton", "Valemont",
+    "Westbury", "Yarmouth", "Ashby", "Bramley", "Coleford", "Denholm", "Elmstead",
+]
+_SUFFIXES = ["United", "City", "Town", "Rovers", "Athletic", "Albion", "Wanderers", "County"]
+
+_KICKOFFS = ["12:30", "15:00", "15:00", "15:00", "17:30", "20:00"]
+
+
+def team_names(league: str, n: int) -> list[str]:
+    """每个联赛一组稳定的队名，同一联赛多次生成结果一致"""
+    rng = random.Random(f"teams:{league}")
+    names = []
+    for i in range(n):
+        town = _TOWNS[i % len(_TOWNS)]
+        lap = i // len(_TOWNS)
+        suffix = _SUFFIXES[rng.randrange(len(_SUFFIXES))]
+        names.append(f"{town} {suffix}" + (f" {lap + 1}" if lap else ""))
+    return names
+
+
+def _poisson(rng: random.Random, lam: float) -> int:
+    # Knuth：lam 不大时足够快
+    limit, k, p = math.exp(-lam), 0, 1.0
+    while True:
+        p *= rng.random()
+        if p <= limit:
+            return k
+        k += 1
+
+
+def _result(home: int, away: int) -> str:
+    return "H" if home > away else "A" if home < away else "D"
+
+
+def _fixtures(teams: list[str], rounds: int) -> list[list[tuple[str, str]]]:
+    """圆圈法排双循环赛程：每轮每队一场，第二循环主客互换"""
+    teams = list(teams)
+    if len(teams) % 2:
+        teams.append(None)
+    n = len(teams)
+    first = []
+    for r in range(n - 1):
+        pairs = []
+        for i in range(n // 2):
+            home, away = teams[i], teams[n - 1 - i]
+            if home is not None and away is not None:
+                pairs.append((home, away) if r % 2 else (away, home))
+        first.append(pairs)
+        teams.insert(1, teams.pop())
+
+    schedule = []
+    for leg in range(rounds):
+        for pairs in first:
+            schedule.append(pairs if leg % 2 == 0 else [(a, h) for h, a in pairs])
+    return schedule
+
+
+def gen_match(rng: random.Random, league: str, day: date, home: str, away: str, strength: dict) -> dict:
+    """按实力生成一场比赛，射门、角球、犯规、黄红牌与进球大致相关"""
+    diff = strength[home] - strength[away]
+    fthg = _poisson(rng, max(0.2, 1.5 + 0.35 * diff))
+    ftag = _poisson(rng, max(0.2, 1.15 - 0.35 * diff))
+    hthg = sum(rng.random() < 0.45 for _ in range(fthg))
+    htag = sum(rng.random() < 0.45 for _ in range(ftag))
+
+    hs = fthg + _poisson(rng, 11 + 2 * diff if diff > 0 else 11)
+    as_ = ftag + _poisson(rng, 9 - 2 * diff if diff < 0 else 9)
+    hst = min(hs, fthg + _poisson(rng, 3))
+    ast = min(as_, ftag + _poisson(rng, 2.6))
+    hy, ay = _poisson(rng, 1.6), _poisson(rng, 1.9)
+
+    return {
+        "Div": league,
+        "Date": day.strftime("%d/%m/%Y"),
+        "Time": rng.choice(_KICKOFFS),
+        "HomeTeam": home,
+        "AwayTeam": away,
+        "FTHG": fthg,
+        "FTAG": ftag,
+        "FTR": _result(fthg, ftag),
+        "HTHG": hthg,
+        "HTAG": htag,
+        "HTR": _result(hthg, htag),
+        "HS": hs,
+        "AS": as_,
+        "HST": hst,
+        "AST": ast,
+        "HF": _poisson(rng, 10.5),
+        "AF": _poisson(rng, 11),
+        "HC": _poisson(rng, 5.5),
+        "AC": _poisson(rng, 4.5),
+        "HY": hy,
+        "AY": ay,
+        "HR": int(rng.random() < 0.05),
+        "AR": int(rng.random() < 0.06),
+        "match_id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+    }
+
+
+def gen_league(league: str, seasons: int, teams: int, rounds: int = 2, first_season: int = 2000, seed: int = 0):
+    """
+    按赛季产出 (season, matches)，一次只在内存里放一个赛季
+    每季末随机降级 3 队、从候补里升上 3 队，球队集合逐季变化
+    """
+    rng = random.Random(f"{seed}:{league}")
+    pool = team_names(league, teams + max(3, teams // 4))
+    strength = {t: rng.gauss(0, 1) for t in pool}
+    current = pool[:teams]
+    reserve = pool[teams:]
+
+    for s in range(seasons):
+        start = first_season + s
+        # 8 月第二个周六开赛，每周一轮
+        day = date(start, 8, 8)
+        day += timedelta(days=(5 - day.weekday()) % 7)
+
+        matches = []
+        for pairs in _fixtures(current, rounds):
+            for home, away in pairs:
+                match_day = day + timedelta(days=rng.choice((0, 0, 0, 1, 1, 2)))
+                matches.append(gen_match(rng, league, match_day, home, away, strength))
+            day += timedelta(days=7)
+        yield f"{start}-{start + 1}", matches
+
+        drop = rng.sample(range(len(current)), min(3, len(reserve)))
+        for i in drop:
+            current[i], reserve[0] = reserve[0], current[i]
+            reserve.append(reserve.pop(0))
+        for t in strength:
+            strength[t] += rng.gauss(0, 0.15)
+
+
+def main():
+    """
+    生成 football-data 格式的联赛数据，写到 DATA_DIR
+    用法：python bench/gen_leagues.py --data-dir /tmp/bench_data --leagues E0,SP1 --seasons 30 --teams 20
+    行数 ≈ 联赛数 × 赛季数 × teams × (teams - 1) × rounds / 2
+    """
+    parser = argparse.ArgumentParser(description="generate synthetic league data")
+    parser.add_argument("--data-dir", default=os.environ.get("DATA_DIR", "./bench_data"))
+    parser.add_argument("--leagues", default="E0", help="comma separated league codes")
+    parser.add_argument("--seasons", type=int, default=10)
+    parser.add_argument("--teams", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=2, help="times each pair meets per season")
+    parser.add_argument("--first-season", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--codec", choices=("json", "gzip", "zstd"), default="json")
+    parser.add_argument("--partition", action="store_true", help="write one partition per season")
+    args = parser.parse_args()
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    os.environ["DATA_DIR"] = args.data_dir
+    sys.path.insert(0, SERVER_DIR)
+    import league_store
+
+    total = 0
+    for league in args.leagues.split(","):
+        seasons = gen_league(league, args.seasons, args.teams, args.rounds, args.first_season, args.seed)
+        if args.partition:
+            count = 0
+            for season, matches in seasons:
+                league_store.save_season(league, season, matches, args.codec)
+                count += len(matches)
+        else:
+            rows = [m for _, matches in seasons for m in matches]
+            league_store.save_league(league, rows, args.codec)
+            count = len(rows)
+        total += count
+        print(f"{league}: {count} matches")
+    print(f"total: {total} matches -> {args.data_dir}")
+
+
+if __name__ == "__main__":
+    main()
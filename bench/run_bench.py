@@ -0,0 +1,382 @@
+import os
+import sys
+import json
+import time
+import uuid
+import gzip
+import hashlib
+import base64
+import argparse
+import tempfile
+import importlib
+import tracemalloc
+import unicodedata
+from typing import List, Dict, Any, Optional, Protocol
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVER_DIR = os.path.join(ROOT, "ali_FC", "server")
+AUTO_DIR = os.path.join(ROOT, "auto")
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_BUCKET = "soccer-data"
+
+# 与基线比较的指标；超过 (1 + tolerance) 倍记为退化
+COMPARE_METRICS = ("p50_ms", "p90_ms", "peak_kb", "response_bytes")
+
+
+# ---------- 统计 ----------
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """最近秩百分位"""
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, round(q / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[k]
+
+
+def summarize(latencies: list[float], peak: int, request_bytes: int, response_bytes: int, errors: int) -> dict:
+    ms = sorted(x * 1000 for x in latencies)
+    return {
+        "n": len(ms),
+        "errors": errors,
+        "mean_ms": round(sum(ms) / len(ms), 3) if ms else 0.0,
+        "p50_ms": round(percentile(ms, 50), 3),
+        "p90_ms": round(percentile(ms, 90), 3),
+        "p99_ms": round(percentile(ms, 99), 3),
+        "max_ms": round(ms[-1], 3) if ms else 0.0,
+        "peak_kb": round(peak / 1024, 1),
+        "request_bytes": request_bytes,
+        "response_bytes": response_bytes,
+    }
+
+
+def measure(call, events: list, warmup: int, before=None) -> dict:
+    """
+    events 依次执行：前 warmup 个预热，最后一个在 tracemalloc 下跑，记录单次调用的峰值内存
+    call(event) 返回 (ok, 请求字节数, 响应字节数)
+    """
+    latencies, errors = [], 0
+    request_bytes = response_bytes = 0
+    for i, event in enumerate(events[:-1]):
+        if before is not None:
+            before()
+        start = time.perf_counter()
+        ok, request_bytes, response_bytes = call(event)
+        elapsed = time.perf_counter() - start
+        if i >= warmup:
+            latencies.append(elapsed)
+            errors += not ok
+
+    if before is not None:
+        before()
+    tracemalloc.start()
+    try:
+        call(events[-1])
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return summarize(latencies, peak, request_bytes, response_bytes, errors)
+
+
+# ---------- ali_FC/server：驱动 handler(event, context) ----------
+
+def server_call(module):
+    def call(event):
+        raw = json.dumps(event, ensure_ascii=False).encode("utf-8")
+        resp = module.handler(raw, None)
+        body = resp.get("body", "")
+        if not isinstance(body, str):
+            body = json.dumps(body, ensure_ascii=False)
+        return resp.get("statusCode") == 200, len(raw), len(body.encode("utf-8"))
+    return call
+
+
+# ---------- auto/tools：OSSLeagueStorage + 本地 OSS 目录，注入的全局与 handler 一致 ----------
+
+def load_auto_tools(data_dir: str, oss_dir: str) -> dict:
+    """
+    把 DATA_DIR 的联赛复制到 oss_dir 下的本地 OSS（local_oss.LocalOSSClient），
+    工具跑在线上同一份 OSSLeagueStorage 上：区间读取、变更日志、ETag 缓存都会计入
+    """
+    from common.utils.Ch2En import TEAM_NAME_MAP
+    from common.utils.En2Le import TEAM_NAME_MAP1
+
+    try:
+        from pypinyin import lazy_pinyin
+    except ImportError:
+        lazy_pinyin = None
+
+    try:
+        import zstandard as zstd
+    except ImportError:
+        zstd = None
+
+    sys.path.insert(0, AUTO_DIR)
+    import alibabacloud_oss_v2 as oss
+    from local_oss import LocalOSSClient, seed_data
+
+    client = LocalOSSClient(oss_dir)
+    seed_data(client, DATA_BUCKET, data_dir)
+
+    dep_globals = {
+        "Protocol": Protocol, "List": List, "Dict": Dict, "Any": Any, "Optional": Optional,
+        "json": json, "time": time, "gzip": gzip, "zstd": zstd, "hashlib": hashlib,
+        "base64": base64, "uuid": uuid, "unicodedata": unicodedata, "lazy_pinyin": lazy_pinyin,
+        "oss": oss,
+        "TEAM_NAME_MAP": TEAM_NAME_MAP, "TEAM_NAME_MAP1": TEAM_NAME_MAP1,
+        "TEAM_ALIAS_PREBUILT": None,
+    }
+    for path in (os.path.join(AUTO_DIR, "storage", "oss_storage.py"),
+                 os.path.join(AUTO_DIR, "utils", "team_alias.py")):
+        with open(path, "r", encoding="utf-8") as f:
+            exec(compile(f.read(), path, "exec"), dep_globals)
+
+    runtime_globals = {
+        "json": json, "oss": oss, "client": client, "DATA_BUCKET": DATA_BUCKET,
+        "List": List, "Dict": Dict, "Any": Any, "Optional": Optional, "uuid": uuid,
+        "TEAM_NAME_MAP": TEAM_NAME_MAP, "TEAM_NAME_MAP1": TEAM_NAME_MAP1,
+        "storage": dep_globals["OSSLeagueStorage"](client=client, bucket=DATA_BUCKET),
+        "resolve_team": dep_globals["resolve_team"],
+        "canonical_team": dep_globals["canonical_team"],
+        "team_league": dep_globals["team_league"],
+    }
+
+    tools = {}
+    for name in ("detect_league", "load_team_matches", "query_matches",
+                 "add_match", "change_score", "delete_matches"):
+        path = os.path.join(AUTO_DIR, "tools", f"{name}.py")
+        g = dict(runtime_globals)
+        with open(path, "r", encoding="utf-8") as f:
+            exec(compile(f.read(), path, "exec"), g)
+        tools[name] = g[name]
+    return tools
+
+
+def auto_call(fn):
+    def call(event):
+        raw = json.dumps(event, ensure_ascii=False).encode("utf-8")
+        try:
+            result = fn(**event)
+        except Exception as e:
+            result, ok = {"error": str(e)}, False
+        else:
+            ok = not (isinstance(result, dict) and "error" in result)
+        body = json.dumps(result, ensure_ascii=False, default=str).encode("utf-8")
+        return ok, len(raw), len(body)
+    return call
+
+
+# ---------- 场景 ----------
+
+def pick_teams(league_store, league: str) -> list[str]:
+    """按出场次数从多到少排列的球队"""
+    partitions = league_store.read_partitions(league)
+    counts = {}
+    if partitions is not None:
+        for teams in partitions.values():
+            for t in teams:
+                counts[t] = counts.get(t, 0) + 1
+    else:
+        for m in league_store.load_league(league):
+            for t in (m.get("HomeTeam"), m.get("AwayTeam")):
+                counts[t] = counts.get(t, 0) + 1
+    return sorted(counts, key=lambda t: (-counts[t], str(t)))
+
+
+def build_scenarios(league_store, tools: dict, league: str, n: int) -> list[dict]:
+    """
+    每个场景：name、call、events（n 个）、before（每次调用前执行，用于模拟冷实例）
+    写场景按 add -> change -> delete 顺序，只改动自己添加的比赛，跑完数据恢复原样
+    """
+    teams = pick_teams(league_store, league)
+    star, rival = teams[0], teams[1]
+    modules = {
+        name: importlib.import_module(name)
+        for name in ("list_tools", "detect_league", "load_team_matches",
+                     "query_matches", "add_match", "change_score", "delete_matches",
+                     "league_table", "head_to_head", "batch")
+    }
+
+    def clear_caches():
+        league_store._FRAME_CACHE.clear()
+
+    # 写场景用的日期与时间：每次调用不同，避免判重
+    bench_date = "10/08/2099"
+    times = [f"{i // 60:02d}:{i % 60:02d}" for i in range(n)]
+
+    def added(home):
+        return [
+            m for m in league_store.team_matches(league, home, bench_date)
+            if m.get("Date") == bench_date
+        ]
+
+    scenarios = [
+        {"name": "server.list_tools", "call": server_call(modules["list_tools"]),
+         "events": [{}] * n},
+        {"name": "server.detect_league", "call": server_call(modules["detect_league"]),
+         "events": [{"team": star}] * n},
+        {"name": "server.load_team_matches", "call": server_call(modules["load_team_matches"]),
+         "events": [{"league": league, "team": star}] * n},
+        {"name": "server.load_team_matches.cold", "call": server_call(modules["load_team_matches"]),
+         "events": [{"league": league, "team": star}] * n, "before": clear_caches},
+        {"name": "server.load_team_matches.compact", "call": server_call(modules["load_team_matches"]),
+         "events": [{"league": league, "team": star, "compact": True}] * n},
+        {"name": "server.load_team_matches.page", "call": server_call(modules["load_team_matches"]),
+         "events": [{"league": league, "team": star, "limit": 20, "order": "desc"}] * n},
+        {"name": "server.query_matches", "call": server_call(modules["query_matches"]),
+         "events": [{"league": league, "team": star, "result": "win", "home_or_away": "home"}] * n},
+        {"name": "server.league_table", "call": server_call(modules["league_table"]),
+         "events": [{"league": league}] * n},
+        {"name": "server.head_to_head", "call": server_call(modules["head_to_head"]),
+         "events": [{"team_a": star, "team_b": rival, "league": league}] * n},
+        {"name": "server.batch", "call": server_call(modules["batch"]),
+         "events": [{"calls": [
+             {"tool": "detect_league", "args": {"team": star}},
+             {"tool": "query_matches", "args": {"league": league, "team": rival, "result": "draw"}},
+         ]}] * n},
+        {"name": "server.add_match", "call": server_call(modules["add_match"]),
+         "events": [
+             {"league": league, "date": bench_date, "time": t, "home": star, "away": rival,
+              "home_score": 1, "away_score": 0}
+             for t in times
+         ]},
+        # 依赖上一个场景写入的比赛，事件在运行时才生成
+        {"name": "server.change_score", "call": server_call(modules["change_score"]),
+         "events": lambda: [{"match": [m], "home_score": 2, "away_score": 2} for m in added(star)][:n]},
+        {"name": "server.delete_matches", "call": server_call(modules["delete_matches"]),
+         "events": lambda: [{"matches": [m]} for m in added(star)][:n]},
+    ]
+
+    if tools:
+        auto_added = lambda: [
+            m for m in tools["load_team_matches"](league, star)
+            if m.get("Date") == bench_date
+        ]
+        scenarios += [
+            {"name": "auto.detect_league", "call": auto_call(tools["detect_league"]),
+             "events": [{"team": star}] * n},
+            {"name": "auto.load_team_matches", "call": auto_call(tools["load_team_matches"]),
+             "events": [{"league": league, "team": star}] * n},
+            {"name": "auto.load_team_matches.compact", "call": auto_call(tools["load_team_matches"]),
+             "events": [{"league": league, "team": star, "compact": True}] * n},
+            {"name": "auto.load_team_matches.page", "call": auto_call(tools["load_team_matches"]),
+             "events": [{"league": league, "team": star, "limit": 20, "order": "desc"}] * n},
+            {"name": "auto.query_matches", "call": auto_call(tools["query_matches"]),
+             "events": [{"league": league, "team": star, "result": "win", "home_or_away": "home"}] * n},
+            {"name": "auto.add_match", "call": auto_call(tools["add_match"]),
+             "events": [
+                 {"league": league, "date": bench_date, "time": t, "home": star, "away": rival,
+                  "home_score": 1, "away_score": 0}
+                 for t in times
+             ]},
+            {"name": "auto.change_score", "call": auto_call(tools["change_score"]),
+             "events": lambda: [{"match": [m], "home_score": 2, "away_score": 2} for m in auto_added()][:n]},
+            {"name": "auto.delete_matches", "call": auto_call(tools["delete_matches"]),
+             "events": lambda: [{"matches": [m]} for m in auto_added()][:n]},
+        ]
+    return scenarios
+
+
+# ---------- 基线 ----------
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """逐场景逐指标比较，返回退化的描述"""
+    regressions = []
+    print(f"\n{'scenario':<36}{'metric':<16}{'baseline':>12}{'current':>12}{'change':>10}")
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for metric in COMPARE_METRICS:
+            old, new = base.get(metric), current.get(metric)
+            if not old or new is None:
+                continue
+            change = new / old - 1
+            flag = ""
+            if change > tolerance:
+                flag = "  REGRESSION"
+                regressions.append(f"{name} {metric}: {old} -> {new} ({change:+.0%})")
+            print(f"{name:<36}{metric:<16}{old:>12}{new:>12}{change:>+10.0%}{flag}")
+    return regressions
+
+
+def print_table(results: dict) -> None:
+    cols = ("n", "errors", "p50_ms", "p90_ms", "p99_ms", "max_ms", "peak_kb", "request_bytes", "response_bytes")
+    print(f"{'scenario':<36}" + "".join(f"{c:>15}" for c in cols))
+    for name, r in results.items():
+        print(f"{name:<36}" + "".join(f"{r[c]:>15}" for c in cols))
+
+
+def main():
+    """
+    在本地对 ali_FC/server 的每个 handler 和 auto/tools 的工具跑基准
+    用法：
+      python bench/gen_leagues.py --data-dir /tmp/bench_data --seasons 30
+      python bench/run_bench.py --data-dir /tmp/bench_data --save-baseline bench/baseline.json
+      python bench/run_bench.py --data-dir /tmp/bench_data --baseline bench/baseline.json
+    写场景只改动自己添加的比赛，但仍会在 DATA_DIR 留下变更日志，建议用生成的数据副本
+    auto/tools 场景先把 DATA_DIR 复制到本地 OSS 目录（--oss-dir），读写都不碰 DATA_DIR
+    """
+    parser = argparse.ArgumentParser(description="benchmark tool handlers against local data")
+    parser.add_argument("--data-dir", default=os.environ.get("DATA_DIR", "./bench_data"))
+    parser.add_argument("--league", default=None, help="default: first league in DATA_DIR")
+    parser.add_argument("-n", "--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--only", default=None, help="comma separated scenario name prefixes")
+    parser.add_argument("--no-auto", action="store_true", help="skip auto/tools scenarios")
+    parser.add_argument("--oss-dir", default=None, help="local OSS directory for auto/tools, default: a new temp dir")
+    parser.add_argument("--out", default=None, help="write results as JSON")
+    parser.add_argument("--baseline", default=None, help="compare with a stored baseline")
+    parser.add_argument("--save-baseline", default=None, help="store results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown before flagging")
+    args = parser.parse_args()
+
+    os.environ["DATA_DIR"] = args.data_dir
+    sys.path[:0] = [SERVER_DIR, BENCH_DIR]
+    import league_store
+
+    league = args.league or league_store.list_leagues()[0]
+    tools = {} if args.no_auto else load_auto_tools(args.data_dir, args.oss_dir or tempfile.mkdtemp(prefix="bench_oss_"))
+
+    # warmup + 计时 + 最后一次测内存
+    n = args.warmup + args.iterations + 1
+    prefixes = args.only.split(",") if args.only else None
+
+    results = {}
+    for scenario in build_scenarios(league_store, tools, league, n):
+        name = scenario["name"]
+        if prefixes and not any(name.startswith(p) for p in prefixes):
+            continue
+        events = scenario["events"]
+        if callable(events):
+            events = events()
+        if len(events) < 2:
+            print(f"{name}: skipped, not enough events")
+            continue
+        warmup = min(args.warmup, len(events) - 2)
+        results[name] = measure(scenario["call"], events, warmup, scenario.get("before"))
+
+    print(f"league: {league}, data: {args.data_dir}")
+    print_table(results)
+
+    report = {
+        "league": league,
+        "iterations": args.iterations,
+        "python": sys.version.split()[0],
+        "results": results,
+    }
+    for path in (args.out, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\nregressions:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+import os
+import sys
+import json
+import time
+import uuid
+import gzip
+import base64
+import hashlib
+import unicodedata
+from typing import List, Dict, Any, Optional, Protocol
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVER_DIR = os.path.join(ROOT, "ali_FC", "server")
+AUTO_DIR = os.path.join(ROOT, "auto")
+BENCH_DIR = os.path.join(ROOT, "bench")
+DATA_BUCKET = "soccer-data"
+
+# ali_FC/server 在前：两边同名的模块（timing）以 FC 部署的那份为准
+sys.path[:0] = [SERVER_DIR, BENCH_DIR]
+sys.path.append(AUTO_DIR)
+
+
+# ---------- 测试数据 ----------
+
+@pytest.fixture
+def gen_rows():
+    """bench/gen_leagues 生成的比赛，(season, matches) 列表，3 个赛季、每季 6 队双循环"""
+    from gen_leagues import gen_league
+
+    def gen(league: str = "E0", seasons: int = 3, teams: int = 6):
+        return list(gen_league(league, seasons, teams))
+    return gen
+
+
+def new_match(league: str, date: str, home: str, away: str, home_goals=None, away_goals=None) -> dict:
+    """一场新比赛；不传比分时是未开赛的赛程"""
+    m = {
+        "Div": league, "Date": date, "Time": "15:00", "HomeTeam": home, "AwayTeam": away,
+        "FTHG": home_goals, "FTAG": away_goals, "FTR": None, "match_id": str(uuid.uuid4()),
+    }
+    if home_goals is not None:
+        m["FTR"] = "H" if home_goals > away_goals else "A" if home_goals < away_goals else "D"
+    return m
+
+
+@pytest.fixture
+def make_match():
+    return new_match
+
+
+# ---------- ali_FC：league_store 指向临时 DATA_DIR ----------
+
+@pytest.fixture
+def league_store(tmp_path, monkeypatch):
+    # 映射表不在仓库里（FC 层提供），没有时跳过
+    pytest.importorskip("common.utils.Ch2En")
+    import league_store
+
+    monkeypatch.setattr(league_store, "DATA_DIR", str(tmp_path / "data"))
+    monkeypatch.setattr(league_store, "_FRAME_CACHE", {})
+    monkeypatch.setattr(league_store, "_VIEW_CACHE", {})
+    os.makedirs(league_store.DATA_DIR)
+    return league_store
+
+
+# ---------- auto：OSSLeagueStorage + 本地 OSS 目录，注入的全局与 handler 一致 ----------
+
+@pytest.fixture
+def oss_client(tmp_path):
+    pytest.importorskip("alibabacloud_oss_v2")
+    from local_oss import LocalOSSClient
+    return LocalOSSClient(str(tmp_path / "oss"))
+
+
+@pytest.fixture
+def auto_globals():
+    """exec 后的 oss_storage.py + team_alias.py，与 handler._dep_globals 注入的名字一致"""
+    ch2en = pytest.importorskip("common.utils.Ch2En")
+    en2le = pytest.importorskip("common.utils.En2Le")
+    import alibabacloud_oss_v2 as oss
+
+    try:
+        from pypinyin import lazy_pinyin
+    except ImportError:
+        lazy_pinyin = None
+
+    try:
+        import zstandard as zstd
+    except ImportError:
+        zstd = None
+
+    g = {
+        "Protocol": Protocol, "List": List, "Dict": Dict, "Any": Any, "Optional": Optional,
+        "json": json, "time": time, "gzip": gzip, "zstd": zstd, "hashlib": hashlib,
+        "base64": base64, "uuid": uuid, "unicodedata": unicodedata, "lazy_pinyin": lazy_pinyin,
+        "oss": oss,
+        "TEAM_NAME_MAP": ch2en.TEAM_NAME_MAP, "TEAM_NAME_MAP1": en2le.TEAM_NAME_MAP1,
+        "TEAM_ALIAS_PREBUILT": None,
+    }
+    for path in (os.path.join(AUTO_DIR, "storage", "oss_storage.py"),
+                 os.path.join(AUTO_DIR, "utils", "team_alias.py")):
+        with open(path, "r", encoding="utf-8") as f:
+            exec(compile(f.read(), path, "exec"), g)
+    return g
+
+
+@pytest.fixture
+def make_storage(auto_globals, oss_client):
+    """每次调用新建一个 OSSLeagueStorage，相当于另一个 FC 实例（各自的缓存）"""
+    def make(**kwargs):
+        kwargs.setdefault("retry_backoff", 0.001)
+        return auto_globals["OSSLeagueStorage"](client=oss_client, bucket=DATA_BUCKET, **kwargs)
+    return make
+
+
+@pytest.fixture
+def auto_tools(auto_globals, oss_client, make_storage):
+    """按 handler.RUNTIME_GLOBALS 注入后 exec auto/tools 下的工具，{名字: 函数}，storage 在 ["storage"]"""
+    import alibabacloud_oss_v2 as oss
+
+    storage = make_storage()
+    runtime_globals = {
+        "json": json, "oss": oss, "client": oss_client, "DATA_BUCKET": DATA_BUCKET,
+        "List": List, "Dict": Dict, "Any": Any, "Optional": Optional, "uuid": uuid,
+        "TEAM_NAME_MAP": auto_globals["TEAM_NAME_MAP"],
+        "TEAM_NAME_MAP1": auto_globals["TEAM_NAME_MAP1"],
+        "storage": storage,
+        "resolve_team": auto_globals["resolve_team"],
+        "canonical_team": auto_globals["canonical_team"],
+        "team_league": auto_globals["team_league"],
+    }
+
+    tools = {"storage": storage}
+    for name in ("load_team_matches", "add_match", "change_score", "delete_matches", "league_table"):
+        path = os.path.join(AUTO_DIR, "tools", f"{name}.py")
+        g = dict(runtime_globals)
+        with open(path, "r", encoding="utf-8") as f:
+            exec(compile(f.read(), path, "exec"), g)
+        tools[name] = g[name]
+    return tools
@@ -0,0 +1,187 @@
+import os
+import threading
+
+import pytest
+
+LEAGUE = "E0"
+WRITERS = 4
+APPENDS = 30
+
+
+def run_threads(*targets) -> None:
+    threads = [threading.Thread(target=t) for t in targets]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def writer_ids(k: int) -> list:
+    return [f"w{k}-{i}" for i in range(APPENDS)]
+
+
+def added(match_id: str, k: int, i: int) -> dict:
+    # 都落在同一个赛季，分区联赛也只写一个分区
+    return {
+        "Div": LEAGUE, "Date": "01/01/2002", "HomeTeam": f"Writer {k}", "AwayTeam": "Visitors",
+        "FTHG": i % 3, "FTAG": 1, "match_id": match_id,
+    }
+
+
+# ---------- ali_FC/server/league_store ----------
+
+def test_server_appends_survive_concurrent_compaction(league_store, gen_rows, monkeypatch):
+    monkeypatch.setattr(league_store, "LOG_COMPACT_BYTES", 3000)
+    rows = [m for _, ms in gen_rows(LEAGUE) for m in ms]
+    league_store.save_league(LEAGUE, rows)
+    league_store.league_standings(LEAGUE)
+    errors = []
+
+    def writer(k):
+        def run():
+            for i, match_id in enumerate(writer_ids(k)):
+                try:
+                    league_store.append_log(LEAGUE, "add", match_id, added(match_id, k, i))
+                except Exception as e:
+                    errors.append(e)
+        return run
+
+    def compactor():
+        for _ in range(APPENDS):
+            try:
+                league_store.compact(LEAGUE)
+            except Exception as e:
+                errors.append(e)
+
+    run_threads(*(writer(k) for k in range(WRITERS)), compactor)
+
+    assert errors == []
+    ids = {str(m["match_id"]) for m in league_store.load_league(LEAGUE)}
+    assert {i for k in range(WRITERS) for i in writer_ids(k)} <= ids
+    assert len(ids) == len(rows) + WRITERS * APPENDS
+
+    # 视图的数据戳与变更保持一致
+    rebuilt = league_store._build_standings(league_store._build_frame(league_store.load_league(LEAGUE)))
+    assert league_store.league_standings(LEAGUE, "2001-2002")[1] == rebuilt["tables"]["2001-2002"]
+
+    league_store.compact(LEAGUE)
+    assert not os.path.exists(league_store.log_path(LEAGUE))
+    assert not os.path.exists(league_store._compacting_path(LEAGUE))
+
+
+def test_server_interrupted_compaction_resumes(league_store, gen_rows, make_match):
+    """日志改名之后中断：改了名的日志仍然可读，新的追加写到新日志，下次合并两份都合进快照"""
+    rows = [m for _, ms in gen_rows(LEAGUE) for m in ms]
+    league_store.save_league(LEAGUE, rows)
+    before = make_match(LEAGUE, "01/01/2002", "A", "B", 1, 0)
+    after = make_match(LEAGUE, "02/01/2002", "A", "B", 0, 1)
+
+    league_store.append_log(LEAGUE, "add", before["match_id"], before)
+    league_store.append_log(LEAGUE, "delete", rows[0]["match_id"])
+    os.replace(league_store.log_path(LEAGUE), league_store._compacting_path(LEAGUE))
+    league_store.append_log(LEAGUE, "add", after["match_id"], after)
+
+    def ids():
+        return {str(m["match_id"]) for m in league_store.load_league(LEAGUE)}
+
+    expected = {str(m["match_id"]) for m in rows[1:]} | {before["match_id"], after["match_id"]}
+    assert ids() == expected
+
+    league_store.compact(LEAGUE)
+    assert not os.path.exists(league_store._compacting_path(LEAGUE))
+    assert ids() == expected
+
+    league_store.compact(LEAGUE)
+    assert not os.path.exists(league_store.log_path(LEAGUE))
+    assert ids() == expected
+    assert {str(m["match_id"]) for m in league_store._load_base(LEAGUE)} == expected
+
+
+# ---------- auto/storage/oss_storage ----------
+
+@pytest.fixture
+def auto_rows(make_storage, gen_rows):
+    rows = [m for _, ms in gen_rows(LEAGUE) for m in ms]
+    assert make_storage().create_league(LEAGUE, rows)
+    return rows
+
+
+@pytest.mark.parametrize("partitioned", [False, True])
+def test_auto_appends_survive_concurrent_compaction(auto_globals, auto_rows, make_storage, partitioned):
+    """每个写入方是一个独立实例；合并 / 整表写回与追加交错时日志里的条目都不会丢"""
+    if partitioned:
+        assert make_storage().partition_league(LEAGUE)
+    errors = []
+
+    def writer(k):
+        def run():
+            storage = make_storage(log_compact_bytes=3000, max_retries=12)
+            for i, match_id in enumerate(writer_ids(k)):
+                try:
+                    storage.append_log(LEAGUE, "add", match_id, added(match_id, k, i))
+                except Exception as e:
+                    errors.append(e)
+        return run
+
+    def compactor():
+        storage = make_storage()
+        parts = storage._parts(LEAGUE)
+        for _ in range(APPENDS):
+            for part in parts:
+                storage.compact(part)
+
+    def saver():
+        storage = make_storage(max_retries=12)
+        for _ in range(5):
+            try:
+                storage.update_league(LEAGUE, lambda data: data)
+            except Exception as e:
+                errors.append(e)
+
+    run_threads(*(writer(k) for k in range(WRITERS)), compactor, saver)
+
+    assert errors == []
+    storage = make_storage()
+    ids = {str(m["match_id"]) for m in storage.load_league(LEAGUE)}
+    assert {i for k in range(WRITERS) for i in writer_ids(k)} <= ids
+    assert len(ids) == len(auto_rows) + WRITERS * APPENDS
+
+    rebuilt = auto_globals["_build_view"]("standings", storage.load_league(LEAGUE))
+    assert storage.league_standings(LEAGUE, "2001-2002")[1] == rebuilt["tables"]["2001-2002"]
+
+
+def test_auto_stale_seal_is_taken_over(auto_globals, auto_rows, make_storage, make_match):
+    """封住日志的实例崩溃（seal 不释放）：过期后别的实例接手合并，封住前的条目和之后的追加都在"""
+    crashed = make_storage()
+    before = make_match(LEAGUE, "01/01/2002", "A", "B", 1, 0)
+    after = make_match(LEAGUE, "02/01/2002", "A", "B", 0, 1)
+    crashed.append_log(LEAGUE, "add", before["match_id"], before)
+    crashed._seal_log(LEAGUE)
+
+    # seal 仍然有效时追加只会等待，重试用尽后放弃，什么都不写
+    waiting = make_storage(max_retries=2)
+    with pytest.raises(auto_globals["LeagueConflict"]):
+        waiting.append_log(LEAGUE, "add", after["match_id"], after)
+
+    survivor = make_storage(log_seal_timeout=0)
+    assert survivor.append_log(LEAGUE, "add", after["match_id"], after) is None
+
+    ids = {str(m["match_id"]) for m in make_storage().load_league(LEAGUE)}
+    assert {before["match_id"], after["match_id"]} <= ids
+    assert len(ids) == len(auto_rows) + 2
+    # 封住前的条目已合并进快照
+    assert before["match_id"] in {str(m["match_id"]) for m in survivor._load_base(LEAGUE)}
+
+
+def test_auto_append_rerouted_after_partitioning(auto_rows, make_storage, make_match):
+    """还按未分区缓存写入的实例碰到拆分留下的墓碑：重新读分区元数据，按日期路由到分区"""
+    stale = make_storage(partitions_miss_ttl=100)
+    stale.load_league(LEAGUE)
+    m = make_match(LEAGUE, "01/01/2002", "A", "B", 1, 0)
+
+    assert make_storage().partition_league(LEAGUE)
+    assert stale.append_log(LEAGUE, "add", m["match_id"], m) is None
+
+    storage = make_storage()
+    assert m["match_id"] in {str(r["match_id"]) for r in storage.load_team(LEAGUE, "A")}
+    assert len(storage.load_league(LEAGUE)) == len(auto_rows) + 1
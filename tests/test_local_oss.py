@@ -0,0 +1,108 @@
+import threading
+
+import pytest
+
+oss = pytest.importorskip("alibabacloud_oss_v2")
+
+from local_oss import LocalOSSClient
+
+BUCKET = "b"
+
+
+def put(client, key, body, **kwargs):
+    return client.put_object(oss.PutObjectRequest(bucket=BUCKET, key=key, body=body, **kwargs))
+
+
+def append(client, key, position, body):
+    return client.append_object(
+        oss.AppendObjectRequest(bucket=BUCKET, key=key, position=position, body=body)
+    )
+
+
+def get(client, key, **kwargs):
+    return client.get_object(oss.GetObjectRequest(bucket=BUCKET, key=key, **kwargs))
+
+
+def head(client, key):
+    return client.head_object(oss.HeadObjectRequest(bucket=BUCKET, key=key))
+
+
+def error_of(call):
+    with pytest.raises(oss.exceptions.ServiceError) as e:
+        call()
+    return e.value.status_code, e.value.code
+
+
+def test_forbid_overwrite_only_creates(oss_client):
+    put(oss_client, "k", b"one", forbid_overwrite=True)
+    assert error_of(lambda: put(oss_client, "k", b"two", forbid_overwrite=True)) == (409, "FileAlreadyExists")
+    assert get(oss_client, "k").body.read() == b"one"
+
+    # 不带 forbid_overwrite 时直接覆盖
+    put(oss_client, "k", b"two")
+    assert get(oss_client, "k").body.read() == b"two"
+
+
+def test_append_position_must_match_length(oss_client):
+    assert append(oss_client, "log", 0, b"abc").next_position == 3
+    assert error_of(lambda: append(oss_client, "log", 0, b"x")) == (409, "PositionNotEqualToLength")
+    assert error_of(lambda: append(oss_client, "log", 4, b"x")) == (409, "PositionNotEqualToLength")
+    assert append(oss_client, "log", 3, b"de").next_position == 5
+    assert get(oss_client, "log").body.read() == b"abcde"
+    assert head(oss_client, "log").object_type == "Appendable"
+
+
+def test_append_to_normal_object_is_rejected(oss_client):
+    put(oss_client, "k", b"abc")
+    assert head(oss_client, "k").object_type == "Normal"
+    assert error_of(lambda: append(oss_client, "k", 3, b"x")) == (409, "ObjectNotAppendable")
+
+    # 删除后可以重新以 Appendable 创建；再 put 覆盖又变回普通对象
+    oss_client.delete_object(oss.DeleteObjectRequest(bucket=BUCKET, key="k"))
+    append(oss_client, "k", 0, b"x")
+    assert head(oss_client, "k").object_type == "Appendable"
+    put(oss_client, "k", b"y")
+    assert head(oss_client, "k").object_type == "Normal"
+    assert error_of(lambda: append(oss_client, "k", 1, b"z")) == (409, "ObjectNotAppendable")
+
+
+def test_conditional_and_range_get(oss_client):
+    etag = put(oss_client, "k", b"0123456789").etag
+    assert head(oss_client, "k").etag == etag
+
+    assert error_of(lambda: get(oss_client, "k", if_match='"stale"')) == (412, "PreconditionFailed")
+    assert error_of(lambda: get(oss_client, "k", if_none_match=etag)) == (304, "NotModified")
+    assert get(oss_client, "k", if_match=etag).body.read() == b"0123456789"
+    assert get(oss_client, "k", range_header="bytes=2-4").body.read() == b"234"
+    assert get(oss_client, "k", range_header="bytes=7-").body.read() == b"789"
+    assert error_of(lambda: get(oss_client, "k", range_header="bytes=10-")) == (416, "InvalidRange")
+    assert error_of(lambda: get(oss_client, "missing")) == (404, "NoSuchKey")
+
+
+@pytest.mark.parametrize("op", ["append", "create"])
+def test_concurrent_writers_exactly_one_wins(tmp_path, op):
+    """不同客户端实例共用一个目录：同一 position 的追加、同一 key 的 forbid_overwrite 只有一个成功"""
+    clients = [LocalOSSClient(str(tmp_path)) for _ in range(8)]
+    barrier = threading.Barrier(len(clients))
+    won, conflicts = [], []
+
+    def write(i, client):
+        barrier.wait()
+        try:
+            if op == "append":
+                append(client, "k", 0, f"{i}\n".encode())
+            else:
+                put(client, "k", f"{i}\n".encode(), forbid_overwrite=True)
+            won.append(i)
+        except oss.exceptions.ServiceError as e:
+            conflicts.append(e.status_code)
+
+    threads = [threading.Thread(target=write, args=(i, c)) for i, c in enumerate(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(won) == 1
+    assert conflicts == [409] * (len(clients) - 1)
+    assert get(clients[0], "k").body.read() == f"{won[0]}\n".encode()
@@ -0,0 +1,119 @@
+import pytest
+
+LEAGUE = "E0"
+LIMITS = [1, 4, 7, 1000]
+# 归不进赛季的日期：分区联赛落在 "unknown" 分区，排序键与各赛季没有先后关系
+UNKNOWN_DATES = ["", "TBD", "zz", "?"]
+
+
+def team_and_extras(seasons: list, make_match) -> tuple:
+    """分页的球队，以及给它补上的 "unknown" 日期的比赛和同一天的两场比赛（按 match_id 排先后）"""
+    first, rows = seasons[0]
+    team, other = rows[0]["HomeTeam"], rows[0]["AwayTeam"]
+    extras = [make_match(LEAGUE, date, team, other) for date in UNKNOWN_DATES]
+    extras += [make_match(LEAGUE, rows[0]["Date"], other, team, 1, 1) for _ in range(2)]
+    return team, extras
+
+
+def walk(load_page, order: str, limit: int) -> list:
+    """按 next_cursor 一页页取完，返回 match_id 序列"""
+    ids, cursor = [], None
+    while True:
+        page, cursor = load_page(limit, cursor, order)
+        assert len(page) <= limit
+        ids += [str(m["match_id"]) for m in page]
+        if cursor is None:
+            return ids
+        assert len(page) == limit
+
+
+# ---------- ali_FC/server/load_team_matches ----------
+
+@pytest.fixture(params=["flat", "partitioned"])
+def server_paging(request, league_store, gen_rows, make_match):
+    seasons = gen_rows(LEAGUE)
+    if request.param == "flat":
+        league_store.save_league(LEAGUE, [m for _, rows in seasons for m in rows])
+    else:
+        for season, rows in seasons:
+            league_store.save_season(LEAGUE, season, rows)
+
+    team, extras = team_and_extras(seasons, make_match)
+    for m in extras:
+        league_store.append_log(LEAGUE, "add", m["match_id"], m)
+    if request.param == "partitioned":
+        assert "unknown" in league_store.read_partitions(LEAGUE)
+    return team
+
+
+@pytest.mark.parametrize("order", ["asc", "desc"])
+@pytest.mark.parametrize("limit", LIMITS)
+def test_server_pages_cover_sorted_matches(league_store, server_paging, order, limit):
+    import load_team_matches as ltm
+
+    team = server_paging
+    expected = [
+        str(m["match_id"])
+        for m in sorted(league_store.team_matches(LEAGUE, team), key=ltm._sort_key, reverse=order == "desc")
+    ]
+
+    def load_page(limit, cursor, order):
+        result = ltm.load_team_page(LEAGUE, team, fields=["Date", "match_id"], limit=limit, cursor=cursor, order=order)
+        return result["matches"], result["next_cursor"]
+
+    assert walk(load_page, order, limit) == expected
+
+
+def test_server_cursor_is_bound_to_order(league_store, server_paging):
+    import load_team_matches as ltm
+
+    cursor = ltm.load_team_page(LEAGUE, server_paging, limit=2, order="asc")["next_cursor"]
+    with pytest.raises(ValueError):
+        ltm.load_team_page(LEAGUE, server_paging, limit=2, cursor=cursor, order="desc")
+    with pytest.raises(ValueError):
+        ltm.load_team_page(LEAGUE, server_paging, limit=2, cursor="not-a-cursor")
+
+
+# ---------- auto/storage/oss_storage ----------
+
+@pytest.fixture(params=["flat", "partitioned"])
+def auto_paging(request, make_storage, gen_rows, make_match):
+    seasons = gen_rows(LEAGUE)
+    storage = make_storage()
+    assert storage.create_league(LEAGUE, [m for _, rows in seasons for m in rows])
+    if request.param == "partitioned":
+        assert storage.partition_league(LEAGUE)
+
+    team, extras = team_and_extras(seasons, make_match)
+    storage.add_matches(LEAGUE, extras)
+    if request.param == "partitioned":
+        assert "unknown" in storage._load_partitions(LEAGUE)
+    return storage, team
+
+
+@pytest.mark.parametrize("order", ["asc", "desc"])
+@pytest.mark.parametrize("limit", LIMITS)
+def test_auto_pages_cover_sorted_matches(auto_globals, auto_paging, make_storage, order, limit):
+    storage, team = auto_paging
+    date_key = auto_globals["_date_key"]
+    expected = [
+        str(m["match_id"])
+        for m in sorted(
+            storage.load_team(LEAGUE, team),
+            key=lambda m: (date_key(m.get("Date")), str(m.get("match_id"))),
+            reverse=order == "desc",
+        )
+    ]
+
+    # 游标不依赖实例状态：每页换一个实例
+    def load_page(limit, cursor, order):
+        return make_storage().load_team_page(LEAGUE, team, limit, cursor, order)
+
+    assert walk(load_page, order, limit) == expected
+
+
+def test_auto_cursor_is_bound_to_order(auto_paging):
+    storage, team = auto_paging
+    _, cursor = storage.load_team_page(LEAGUE, team, 2, None, "asc")
+    with pytest.raises(ValueError):
+        storage.load_team_page(LEAGUE, team, 2, cursor, "desc")
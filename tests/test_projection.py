@@ -0,0 +1,119 @@
+import pytest
+
+LEAGUE = "E0"
+# 只带部分列的投影：没有 HomeTeam 时写工具按整个联赛查找
+PROJECTIONS = [
+    ["Div", "Date", "HomeTeam", "match_id"],
+    ["Div", "HomeTeam", "match_id"],
+    ["Div", "match_id"],
+]
+
+
+def project(result, fields: list, compact: bool) -> list:
+    """load_team_matches 的返回值还原成记录列表，compact 时按 fields 拼回字典"""
+    if compact:
+        assert result["fields"] == fields
+        return [dict(zip(fields, row)) for row in result["rows"]]
+    assert all(set(m) == set(fields) for m in result)
+    return result
+
+
+def by_id(rows: list) -> dict:
+    return {str(m["match_id"]): m for m in rows}
+
+
+def assert_round_trip(load_league, change_score, delete_matches, projected: list, original: dict) -> None:
+    """投影交回写工具：改比分只动比分列，其余列保持库里的值；删除按 match_id 删掉整条记录"""
+    target, other = projected[0], projected[1]
+    before = by_id(load_league())
+    assert before[str(target["match_id"])] == original
+
+    assert change_score([dict(target)], 4, 2) == "比分更新成功"
+    after = by_id(load_league())
+    assert after[str(target["match_id"])] == dict(original, FTHG=4, FTAG=2, FTR="H")
+    # 别的比赛不受影响
+    assert {k: v for k, v in after.items() if k != str(target["match_id"])} == \
+        {k: v for k, v in before.items() if k != str(target["match_id"])}
+
+    assert delete_matches([dict(other)]).startswith("删除成功！删除了 1/")
+    remaining = by_id(load_league())
+    assert str(other["match_id"]) not in remaining
+    assert len(remaining) == len(before) - 1
+
+
+# ---------- ali_FC/server ----------
+
+@pytest.fixture(params=["flat", "partitioned"])
+def server_rows(request, league_store, gen_rows):
+    seasons = gen_rows(LEAGUE)
+    if request.param == "flat":
+        league_store.save_league(LEAGUE, [m for _, rows in seasons for m in rows])
+    else:
+        for season, rows in seasons:
+            league_store.save_season(LEAGUE, season, rows)
+    return [m for _, rows in seasons for m in rows]
+
+
+@pytest.mark.parametrize("compact", [False, True])
+@pytest.mark.parametrize("fields", PROJECTIONS)
+def test_server_projection_round_trip(league_store, server_rows, fields, compact):
+    from load_team_matches import load_team_matches
+    from change_score import change_score
+    from delete_matches import delete_matches
+
+    team = server_rows[0]["HomeTeam"]
+    projected = project(load_team_matches(LEAGUE, team, fields=fields, compact=compact), fields, compact)
+    original = by_id(server_rows)[str(projected[0]["match_id"])]
+
+    assert_round_trip(
+        lambda: league_store.load_league(LEAGUE), change_score, delete_matches, projected, original
+    )
+
+
+def test_server_unknown_projection_field_is_rejected(league_store, server_rows):
+    from load_team_matches import load_team_matches
+
+    with pytest.raises(ValueError):
+        load_team_matches(LEAGUE, server_rows[0]["HomeTeam"], fields=["Div", "NoSuchColumn"])
+
+
+# ---------- auto/tools ----------
+
+@pytest.fixture(params=["flat", "partitioned"])
+def auto_rows(request, auto_tools, gen_rows):
+    seasons = gen_rows(LEAGUE)
+    rows = [m for _, ms in seasons for m in ms]
+    storage = auto_tools["storage"]
+    assert storage.create_league(LEAGUE, rows)
+    if request.param == "partitioned":
+        assert storage.partition_league(LEAGUE)
+    return rows
+
+
+@pytest.mark.parametrize("compact", [False, True])
+@pytest.mark.parametrize("fields", PROJECTIONS)
+def test_auto_projection_round_trip(auto_tools, auto_rows, make_storage, fields, compact):
+    team = auto_rows[0]["HomeTeam"]
+    result = auto_tools["load_team_matches"](LEAGUE, team, fields=fields, compact=compact)
+    projected = project(result, fields, compact)
+    original = by_id(auto_rows)[str(projected[0]["match_id"])]
+
+    # 另起实例读取，确认写进 OSS 的是完整记录而不只是写入实例的缓存
+    assert_round_trip(
+        lambda: make_storage().load_league(LEAGUE),
+        auto_tools["change_score"], auto_tools["delete_matches"], projected, original
+    )
+
+
+def test_auto_paged_projection_round_trip(auto_tools, auto_rows, make_storage):
+    fields = ["Div", "Date", "match_id"]
+    team = auto_rows[0]["HomeTeam"]
+    result = auto_tools["load_team_matches"](LEAGUE, team, fields=fields, limit=3, order="desc")
+    assert result["next_cursor"] is not None
+    projected = project(result["matches"], fields, False)
+    original = by_id(auto_rows)[str(projected[0]["match_id"])]
+
+    assert_round_trip(
+        lambda: make_storage().load_league(LEAGUE),
+        auto_tools["change_score"], auto_tools["delete_matches"], projected, original
+    )
@@ -0,0 +1,148 @@
+import copy
+import json
+
+import pytest
+
+LEAGUE = "E0"
+
+
+def mutations(seasons: list, make_match) -> list:
+    """
+    覆盖积分榜增量更新各个分支的一串变更 (op, match_id, match)：
+    新增有比分 / 未开赛的比赛、改比分、删掉比分、删除后重新加入、幂等的删除和找不到的更新
+    """
+    (first, first_rows), _, (last, last_rows) = seasons[0], seasons[1], seasons[-1]
+    year = int(last.split("-")[1])
+    home, away = last_rows[0]["HomeTeam"], last_rows[0]["AwayTeam"]
+
+    scored = make_match(LEAGUE, f"15/03/{year}", home, away, 2, 2)
+    fixture = make_match(LEAGUE, f"20/04/{year}", away, home)
+    played = dict(fixture, FTHG=0, FTAG=3, FTR="A")
+    rescored = dict(last_rows[1], FTHG=5, FTAG=0, FTR="H")
+    unscored = dict(last_rows[2], FTHG=None, FTAG=None, FTR=None)
+    deleted = last_rows[3]
+    old_season = make_match(LEAGUE, f"01/05/{int(first.split('-')[1])}", home, "Newcomers", 1, 0)
+
+    return [
+        ("add", scored["match_id"], scored),
+        ("add", fixture["match_id"], fixture),
+        ("update", played["match_id"], played),
+        ("update", rescored["match_id"], rescored),
+        ("update", unscored["match_id"], unscored),
+        ("delete", deleted["match_id"], deleted),
+        ("delete", deleted["match_id"], None),
+        ("update", "no-such-match", dict(scored, match_id="no-such-match")),
+        ("add", deleted["match_id"], dict(deleted, FTHG=9, FTAG=9, FTR="D")),
+        ("add", old_season["match_id"], old_season),
+        ("add", scored["match_id"], dict(scored, HomeTeam="Newcomers", FTHG=1, FTAG=0, FTR="H")),
+    ]
+
+
+def assert_same(standings, rebuilt: dict, seasons: list) -> None:
+    """每个赛季的增量结果与全量重算一致，默认赛季为有比分的最近一季"""
+    for season in seasons:
+        got_season, table, form = standings(season)
+        assert got_season == season
+        assert table == rebuilt["tables"].get(season, {}), season
+        assert form == rebuilt["form"].get(season, {}), season
+    latest = max(s for s in rebuilt["tables"] if s != "unknown")
+    assert standings(None)[0] == latest
+
+
+# ---------- ali_FC/server/league_store ----------
+
+@pytest.fixture(params=["flat", "partitioned"])
+def server_league(request, league_store, gen_rows):
+    seasons = gen_rows(LEAGUE)
+    if request.param == "flat":
+        league_store.save_league(LEAGUE, [m for _, rows in seasons for m in rows])
+    else:
+        for season, rows in seasons:
+            league_store.save_season(LEAGUE, season, rows)
+    return seasons
+
+
+@pytest.mark.parametrize("compact_bytes", [1024 * 1024, 1500])
+def test_server_incremental_standings_match_rebuild(
+    league_store, server_league, make_match, monkeypatch, compact_bytes
+):
+    # 阈值小时变更过程中会多次合并回快照，视图要跟着换数据戳
+    monkeypatch.setattr(league_store, "LOG_COMPACT_BYTES", compact_bytes)
+    season_names = [s for s, _ in server_league]
+
+    def standings(season):
+        return league_store.league_standings(LEAGUE, season)
+
+    def rebuild():
+        matches = league_store.load_league(LEAGUE)
+        return league_store._build_standings(league_store._build_frame(matches))
+
+    # 先物化视图，之后的变更走增量
+    assert_same(standings, rebuild(), season_names)
+    for op, match_id, match in mutations(server_league, make_match):
+        league_store.append_log(LEAGUE, op, match_id, copy.deepcopy(match))
+        assert_same(standings, rebuild(), season_names)
+
+    for part in league_store._parts(LEAGUE):
+        league_store.compact(part)
+    assert_same(standings, rebuild(), season_names)
+
+
+def test_server_standings_catch_up_on_foreign_log_lines(league_store, server_league, make_match):
+    """别的实例直接追加到日志（视图没跟着更新）：读取时补上 stamp 之后的日志"""
+    season_names = [s for s, _ in server_league]
+    last, rows = server_league[-1]
+    part = LEAGUE if not league_store.is_partitioned(LEAGUE) else league_store.partition_name(LEAGUE, last)
+    league_store.league_standings(LEAGUE, last)
+
+    entries = [
+        {"op": "update", "match_id": str(rows[0]["match_id"]), "match": dict(rows[0], FTHG=7, FTAG=0)},
+        {"op": "delete", "match_id": str(rows[1]["match_id"])},
+    ]
+    with open(league_store.log_path(part), "a", encoding="utf-8") as f:
+        for e in entries:
+            f.write(json.dumps(e) + "\n")
+
+    rebuilt = league_store._build_standings(league_store._build_frame(league_store.load_league(LEAGUE)))
+    assert_same(lambda s: league_store.league_standings(LEAGUE, s), rebuilt, season_names)
+
+    # 进程内缓存丢了也能从视图文件接着补
+    league_store._VIEW_CACHE.clear()
+    assert_same(lambda s: league_store.league_standings(LEAGUE, s), rebuilt, season_names)
+
+
+# ---------- auto/storage/oss_storage ----------
+
+@pytest.fixture(params=["flat", "partitioned"])
+def auto_league(request, make_storage, gen_rows):
+    seasons = gen_rows(LEAGUE)
+    storage = make_storage()
+    assert storage.create_league(LEAGUE, [m for _, rows in seasons for m in rows])
+    if request.param == "partitioned":
+        assert storage.partition_league(LEAGUE)
+    return seasons
+
+
+@pytest.mark.parametrize("compact_bytes", [1024 * 1024, 1500])
+def test_auto_incremental_standings_match_rebuild(
+    auto_globals, auto_league, make_storage, make_match, compact_bytes
+):
+    season_names = [s for s, _ in auto_league]
+    # 两个实例轮流写：各自的缓存里视图都会过期，读取时要补上对方追加的日志
+    writers = [make_storage(log_compact_bytes=compact_bytes) for _ in range(2)]
+    reader = make_storage()
+
+    def rebuild():
+        return auto_globals["_build_view"]("standings", make_storage().load_league(LEAGUE))
+
+    assert_same(lambda s: reader.league_standings(LEAGUE, s), rebuild(), season_names)
+    for i, (op, match_id, match) in enumerate(mutations(auto_league, make_match)):
+        writer = writers[i % 2]
+        assert writer.append_log(LEAGUE, op, match_id, copy.deepcopy(match)) is None
+        rebuilt = rebuild()
+        assert_same(lambda s: reader.league_standings(LEAGUE, s), rebuilt, season_names)
+        assert_same(lambda s: writer.league_standings(LEAGUE, s), rebuilt, season_names)
+
+    for part in reader._parts(LEAGUE):
+        reader.compact(part)
+    assert_same(lambda s: make_storage().league_standings(LEAGUE, s), rebuild(), season_names)